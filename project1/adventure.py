@@ -18,12 +18,29 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2025 CSC111 Teaching Team
 """
 from __future__ import annotations
-import json
-from typing import ClassVar, Dict, List, Optional
-
-from game_entities import Location, Item, StoryEvent, Puzzle, inquire
-from proj1_event_logger import Event, EventList
-
+import copy
+import os
+import sys
+import time
+from array import array
+from collections import ChainMap
+from typing import Callable, Optional
+
+from game_commands import (MENU_COMMANDS, MENU, TELEPORT, PASSWORD, BOOK_SEARCH, INQUIRE, USE, PICK_UP,
+                           DROP, ROUTE, GOTO, ITEM_VERBS, ALWAYS_ACCEPTED_VERBS, Command, parse_command)
+from game_conditions import CompiledCondition, compile_condition
+from game_entities import DEFAULT_WRAP_WIDTH, Location, Item, StoryEvent, Puzzle, inquire
+from game_flags import LocationFlags
+from game_graph import MISSING, PUZZLE, STORY
+from game_items import INVENTORY, ItemRegistry
+from game_journal import GameJournal, JournalError, read_journal
+from game_output import NullSink, OutputSink, StreamSink
+from game_routes import RouteIndex
+from game_stats import GameStats, format_profile
+from game_trace import DebugTrace
+from game_save import LOCKED, LOOKED, UNDO_KINDS, VISITED, SaveFileError, SavedGame, read_save, write_save
+from game_world import GameWorld, load_world
+from proj1_event_logger import Event, EventList, copy_event
 
 # Note: You may add in other import statements here as needed
 
@@ -45,6 +62,28 @@ class AdventureGame:
             The ID of the location where the player is currently situated.
         - ongoing:
             A Boolean indicating whether the game is still active.
+        - debug_mode:
+            Whether debug information is printed after each command (toggled with the toggledebug command).
+        - read_input:
+            The function used to prompt for and read a line of player input outside of the main command prompt
+            (passwords and book searches). Defaults to input.
+        - open_outline:
+            The function called by the inquire command. Defaults to game_entities.inquire, which opens the
+            Library of Congress outline PDF.
+        - wrap_width:
+            The width descriptions are wrapped to when shown. Wrapped descriptions are cached per world, so
+            each description is only wrapped once per width.
+        - output:
+            The sink everything the game shows the player is sent to. Defaults to a StreamSink on standard
+            output; with a NullSink the game runs silently and skips formatting its text.
+        - journal:
+            The journal every turn played through play_turn is appended to, or None to keep no journal.
+            AdventureGame.recover rebuilds a game from its journal.
+        - trace:
+            The debug trace: in debug mode, each event a command adds to the game log is shown and recorded in it.
+        - stats:
+            The timings and counters recorded for this game (see game_stats), or None if it is not instrumented.
+            Turned on with enable_stats or the stats command.
 
     Representation Invariants:
         - current_time >= 0.
@@ -56,24 +95,63 @@ class AdventureGame:
     # Private Instance Attributes (do NOT remove these two attributes):
     #   - _locations: a mapping from location id to Location object.
     #                       This represents all the locations in the game.
-    #   - _items: a list of Item objects, representing all items in the game.
+    #   - _items: a registry of Item objects, representing all items in the game, indexed by name and position.
     #   - _locations_all: a dictionary of all locations and location subclasses (Story Event and Puzzle).
     #                     Originally separated but merged to prevent Python TA error.
+    #                     This chains _location_overlay in front of the shared world's locations.
+    #   - _game_data_file: the game data file this game was loaded from.
+    #   - _world: the read-only world shared by every game loaded from the same game data file.
+    #   - _location_overlay: this game's own copies of the world locations it has changed (visited, looked or
+    #                        unlocked), by ID. World locations are copied here before their first change.
+    #   - _flags: the visited, looked and is_locked flags of every location by dense index, always equal to the
+    #             flags of the locations in _locations_all. Flags are only changed through _store_flag, which sets
+    #             both.
+    #   - _trigger_conditions, _trigger_order, _trigger_index, _unindexed_triggers: the world's compiled story
+    #                          triggers (see GameWorld).
+    #   - _active_triggers: IDs of the StoryEvents whose trigger_condition held at the last evaluation.
+    #   - _dirty_trigger_items: names of items that entered or left the inventory since triggers were last evaluated.
+    #   - _valid_commands: the exact commands accepted at the prompt at each location, computed when first needed
+    #                      and dropped when an item enters or leaves the location or the location is unlocked.
+    #   - _routes: the route index for this game's locks, or None until a route is first asked for. It is the world's
+    #              shared index until this game unlocks a location, then this game's own copy, updated on each unlock.
+    #   - _undo_journal: a stack of (kind, key, old value) entries, one for every item position and location
+    #                    visited/looked flag changed during the game, in order. Each logged event remembers the
+    #                    journal length when it was created, so undo pops and reverts only the later entries.
 
-    debug_mode: ClassVar[bool] = False
     _locations: dict[int, Location]
-    _items: list[Item]
-    _locations_all: dict[int, Location | StoryEvent | Puzzle]
+    _items: ItemRegistry
+    _locations_all: ChainMap[int, Location | StoryEvent | Puzzle]
+    _game_data_file: str
+    _world: GameWorld
+    _location_overlay: dict[int, Location | StoryEvent | Puzzle]
+    _flags: LocationFlags
+    _trigger_conditions: dict[int, CompiledCondition]
+    _trigger_order: dict[int, int]
+    _trigger_index: dict[str, list[int]]
+    _unindexed_triggers: list[int]
+    _active_triggers: set[int]
+    _dirty_trigger_items: set[str]
+    _valid_commands: dict[int, frozenset[str]]
+    _routes: Optional[RouteIndex]
+    _undo_journal: list[tuple[str, int | str, int | bool]]
     current_time: int
     score: int
     current_objective: str
     current_location_id: int
     ongoing: bool
-
-    def __init__(self, game_data_file: str, initial_location_id: int) -> None:
+    debug_mode: bool
+    read_input: Callable[[str], str]
+    open_outline: Callable[[], None]
+    wrap_width: int
+    output: OutputSink
+    journal: Optional[GameJournal]
+    trace: DebugTrace
+    stats: Optional[GameStats]
+
+    def __init__(self, game_data_file: str, initial_location_id: int, output: Optional[OutputSink] = None) -> None:
         """
         Initialize a new text adventure game, based on the data in the given file, setting starting location of game
-        at the given initial location ID.
+        at the given initial location ID, and showing its output through the given sink (by default, standard output).
         (note: you are allowed to modify the format of the file as you see fit)
 
         Preconditions:
@@ -87,9 +165,22 @@ class AdventureGame:
         # 1. Make sure the Location class is used to represent each location.
         # 2. Make sure the Item class is used to represent each item.
 
-        locations, items, stories, puzzles = self._load_game_data(game_data_file)
-        self._items = items
-        self._locations_all = {**locations, **stories, **puzzles}
+        world = self._load_game_data(game_data_file)
+        self._game_data_file = game_data_file
+        self._world = world
+        self._items = world.items.overlay()
+        self._location_overlay = {}
+        self._locations_all = ChainMap(self._location_overlay, world.locations)
+        self._flags = world.location_flags.copy()
+        self._undo_journal = []
+        self._valid_commands = {}
+        self._routes = None
+        self._trigger_conditions = world.trigger_conditions
+        self._trigger_order = world.trigger_order
+        self._trigger_index = world.trigger_index
+        self._unindexed_triggers = world.unindexed_triggers
+        self._active_triggers = set(world.initial_triggers)
+        self._dirty_trigger_items = set()
 
         # Initialize to 2:00 PM (15*60 minutes)
         self.current_time = 14 * 60
@@ -102,73 +193,278 @@ class AdventureGame:
 
         self.current_location_id = initial_location_id  # game begins at this location
         self.ongoing = True  # whether the game is ongoing
+        self.debug_mode = False
+        self.read_input = input
+        self.open_outline = inquire
+        self.wrap_width = DEFAULT_WRAP_WIDTH
+        self.output = output if output is not None else StreamSink()
+        self.journal = None
+        self.trace = DebugTrace()
+        self.stats = None
+
+    @classmethod
+    def recover(cls, journal_file: str, output: Optional[OutputSink] = None) -> tuple[AdventureGame, EventList]:
+        """Return a game and its event log rebuilt by replaying every turn in the given journal, silently.
+        The game then shows its output through the given sink (by default, standard output) and has no journal.
+
+        Raise JournalError if replaying a turn does not give the state recorded for it (e.g. if the game data file
+        has changed since the journal was written).
+        """
+        header, turns = read_journal(journal_file)
+        game = cls(header["game_data_file"], header["start"], NullSink())
+        game_log = EventList()
+        game.open_outline = lambda: None
+        for turn_number, turn in enumerate(turns, 1):
+            inputs = iter(turn["inputs"])
+            game.read_input = lambda _prompt: next(inputs, "")
+            game.play_turn(turn["command"], game_log)
+            state = game._journaled_state()
+            if state["current_location_id"] != turn["id"] or any(state[name] != value
+                                                                for name, value in turn["delta"].items()):
+                raise JournalError(f"{journal_file}: turn {turn_number} ({turn['command']!r}) did not replay the same")
+
+        game.read_input = input
+        game.open_outline = inquire
+        game.output = output if output is not None else StreamSink()
+        return game, game_log
+
+    def save_game(self, save_file: str, game_log: EventList) -> int:
+        """Save this game and the given event log to the given file (see game_save) and return its size in bytes.
+        load_game restores them.
+        """
+        return write_save(save_file, self.get_saved_state(game_log))
+
+    @classmethod
+    def load_game(cls, save_file: str, output: Optional[OutputSink] = None) -> tuple[AdventureGame, EventList]:
+        """Return the game and event log saved in the given file by save_game, showing its output through the
+        given sink (by default, standard output).
+
+        Raise SaveFileError if the file is not a save file, or if its game data file has changed since it was saved.
+        """
+        return cls.from_saved_state(read_save(save_file), output)
+
+    def get_saved_state(self, game_log: Optional[EventList] = None) -> SavedGame:
+        """Return the full state of this game and the given event log, as save_game saves it.
+
+        Only what differs from the freshly loaded world is kept: the item positions, the flags of the locations
+        this game has changed, the undo journal and the event log, so undo keeps working after restoring it.
+        The events are copied, so the state is not changed by the game or log going on, or by restoring it.
+        With no game_log, the state has no events and an empty undo journal, for callers that keep the history
+        themselves (see from_saved_state).
+        """
+        items = list(self._items)
+        item_indexes = {item.name: i for i, item in enumerate(items)}
+        overlay = self._location_overlay.values()
+
+        journal = self._undo_journal if game_log is not None else []
+        return SavedGame(
+            game_data_file=self._game_data_file,
+            world_digest=self._world.digest,
+            score=self.score,
+            current_time=self.current_time,
+            current_location_id=self.current_location_id,
+            current_objective=self.current_objective,
+            ongoing=self.ongoing,
+            debug_mode=self.debug_mode,
+            item_positions=array("q", (item.current_position for item in items)),
+            item_start_positions=array("q", (item.start_position for item in items)),
+            location_ids=array("q", (location.id_num for location in overlay)),
+            location_flags=array("B", ((VISITED if location.visited else 0) | (LOOKED if location.looked else 0)
+                                       | (LOCKED if location.is_locked else 0) for location in overlay)),
+            undo_kinds=array("B", (UNDO_KINDS.index(kind) for kind, _, _ in journal)),
+            undo_keys=array("q", (item_indexes[key] if kind == "item" else key for kind, key, _ in journal)),
+            undo_values=array("q", (old_value for _, _, old_value in journal)),
+            events=game_log.copy_events() if game_log is not None else []
+        )
+
+    @classmethod
+    def from_saved_state(cls, saved: SavedGame, output: Optional[OutputSink] = None,
+                         game_log: Optional[EventList] = None,
+                         undo_journal: Optional[list[tuple[str, int | str, int | bool]]] = None
+                         ) -> tuple[AdventureGame, EventList]:
+        """Return a game restored from the given state (see get_saved_state), showing its output through the
+        given sink (by default, standard output), and the given event log (by default, a new EventList) with the
+        saved events added to it. The game takes the given undo journal (see get_undo_journal) instead of the
+        saved one if there is one, so a state saved without its history can be restored with a log and journal
+        kept elsewhere.
+
+        Raise SaveFileError if the saved game data file has changed since the state was saved.
+        """
+        game = cls(saved.game_data_file, saved.current_location_id, output)
+        if game._world.digest != saved.world_digest:
+            raise SaveFileError(f"{saved.game_data_file} has changed since the game was saved")
+        game.score = saved.score
+        game.current_time = saved.current_time
+        game.current_objective = saved.current_objective
+        game.ongoing = saved.ongoing
+        game.debug_mode = saved.debug_mode
+
+        items = list(game._items)
+        for item, position, start_position in zip(items, saved.item_positions, saved.item_start_positions):
+            if item.start_position != start_position:
+                game._items.own(item).start_position = start_position
+            if item.current_position != position:
+                game._set_item_position(item, position, record=False)
+        game._refresh_triggers()
+
+        for loc_id, flags in zip(saved.location_ids, saved.location_flags):
+            for flag, bit in (("visited", VISITED), ("looked", LOOKED), ("is_locked", LOCKED)):
+                if game._flags.get(flag, loc_id) != bool(flags & bit):
+                    game._store_flag(loc_id, flag, bool(flags & bit))
+
+        if undo_journal is None:
+            undo_journal = [(UNDO_KINDS[kind], items[key].name if UNDO_KINDS[kind] == "item" else key,
+                             old_value if UNDO_KINDS[kind] == "item" else bool(old_value))
+                            for kind, key, old_value in zip(saved.undo_kinds, saved.undo_keys, saved.undo_values)]
+        game._undo_journal = undo_journal
+
+        if game_log is None:
+            game_log = EventList()
+        for event in saved.events:
+            game_log.add_event(copy_event(event), event.next_command)
+        return game, game_log
 
     @staticmethod
-    def _load_game_data(filename: str) -> tuple[Dict[int, Location], List[str]]:
-        """Load locations and items from a JSON file and return structured game data."""
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)  # Load JSON data
-
-        locations = {}
-        for loc_data in data['locations']:
-            locations[loc_data['id']] = Location(
-                id_num=loc_data['id'],
-                name=loc_data['name'],
-                brief_description=loc_data.get('brief_description', ""),
-                long_description=loc_data.get('long_description', ""),
-                available_commands=loc_data['available_commands'],
-                items=loc_data['items'],
-                extra_description=loc_data.get('extra_description', None),
-                first_time_event_id=loc_data.get('first_time_event_id', None),
-                is_locked=loc_data.get('is_locked', False),
-                unlock_condition=loc_data.get('unlock_condition', None)
-            )
-
-        items = [Item(
-            name=item_data["name"],
-            start_position=item_data["start_position"],
-            target_position=item_data.get("target_position", -1),  # Default target location
-            description=item_data.get("description", ""),
-            target_points=item_data.get("target_points", 0),  # Default points
-            current_position=item_data.get("current_position", item_data["start_position"]),
-            use_location=item_data.get("use_location", None),
-            triggers_event_id=item_data.get("triggers_event_id", None)
-        ) for item_data in data.get("items", [])]
-
-        # Load story events
-        stories = {
-            story_data['id']: StoryEvent(
-                id_num=story_data['id'],
-                name=story_data['name'],
-                brief_description=story_data.get('brief_description', ''),
-                long_description=story_data.get('long_description', ''),
-                available_commands=story_data['available_commands'],
-                items=story_data.get('items', []),
-                story_text=story_data.get('story_text', ""),
-                choices=story_data.get('choices', []),
-                new_objective=story_data.get('new_objective', None),
-                trigger_condition=story_data.get('trigger_condition', None)
-            ) for story_data in data.get('story_events', [])
-        }
+    def _load_game_data(filename: str) -> GameWorld:
+        """Load locations and items from a JSON file and return structured game data.
+        The world is built once per file contents and shared (see game_world.load_world), so only the first game
+        built from a file parses it and creates its Location, Item, StoryEvent and Puzzle objects.
+        """
+        return load_world(filename)
 
-        # Load puzzles
-        puzzles = {
-            puzzle_data['id']: Puzzle(
-                id_num=puzzle_data['id'],
-                name=puzzle_data['name'],
-                brief_description='',
-                long_description='',
-                available_commands=puzzle_data['available_commands'],
-                items=puzzle_data.get('items', []),
-                puzzle_text=puzzle_data['puzzle_text'],
-                answers=puzzle_data.get('answers', []),
-            ) for puzzle_data in data.get('puzzle', [])
-        }
-        return locations, items, stories, puzzles
+    def _own_location(self, loc_id: int) -> Location:
+        """Return this game's own copy of the location with the given ID, copying it from the shared world
+        first if this game has not changed it yet. Call this before changing any attribute of a location.
+        """
+        location = self._location_overlay.get(loc_id)
+        if location is None:
+            location = copy.copy(self._world.locations[loc_id])
+            self._location_overlay[loc_id] = location
+        return location
+
+    def _store_flag(self, loc_id: int, flag: str, value: bool) -> None:
+        """Set the given flag ("visited", "looked" or "is_locked") of the location with the given ID, on both this
+        game's own copy of the location and the flag arrays.
+        """
+        setattr(self._own_location(loc_id), flag, value)
+        self._flags.set(flag, loc_id, value)
+
+    def _set_item_position(self, item: Item, position: int, record: bool = True) -> None:
+        """Move the given item to the given location ID (or -1 for the inventory), keeping the inventory
+        and the story trigger index up to date. Record the old position for undo if record is True.
+        """
+        previous = self._items.move(item, position)
+        if previous != position:
+            self._valid_commands.pop(previous, None)
+            self._valid_commands.pop(position, None)
+            if record:
+                self._undo_journal.append(("item", item.name, previous))
+        if (previous == INVENTORY) != (position == INVENTORY):
+            self._dirty_trigger_items.add(item.name)
+
+    def _set_visited(self, location: Location, visited: bool) -> None:
+        """Set whether the given location has been visited, recording the old value for undo."""
+        if location.visited != visited:
+            self._undo_journal.append(("visited", location.id_num, location.visited))
+            self._store_flag(location.id_num, "visited", visited)
+
+    def _set_looked(self, location: Location, looked: bool) -> None:
+        """Set whether the given location has been looked around, recording the old value for undo."""
+        if location.looked != looked:
+            self._undo_journal.append(("looked", location.id_num, location.looked))
+            self._store_flag(location.id_num, "looked", looked)
+
+    def _rewind_journal(self, length: int) -> None:
+        """Revert every change recorded in the undo journal after its first <length> entries, newest first."""
+        journal = self._undo_journal
+        while len(journal) > length:
+            kind, key, old_value = journal.pop()
+            if kind == "item":
+                self._set_item_position(self._items.get(key), old_value, record=False)
+            else:
+                self._store_flag(key, kind, old_value)
+
+    def _refresh_triggers(self) -> int:
+        """Re-evaluate only the trigger conditions that mention an item which entered or left the inventory
+        since the last evaluation, and return how many were evaluated.
+        """
+        affected = set(self._unindexed_triggers)
+        for item_name in self._dirty_trigger_items:
+            affected.update(self._trigger_index.get(item_name, ()))
+        self._dirty_trigger_items.clear()
+
+        held = self._items.held_mask
+        trigger_masks = self._world.trigger_masks
+        for event_id in affected:
+            masks = trigger_masks.get(event_id)
+            if (held & masks[0] == masks[0] and not held & masks[1] if masks is not None
+                    else self._trigger_conditions[event_id](self._items.held_names)):
+                self._active_triggers.add(event_id)
+            else:
+                self._active_triggers.discard(event_id)
+        return len(affected)
+
+    def describe(self, location: Optional[Location] = None) -> str:
+        """Return the given location's current description (by default, the current location's), wrapped to
+        wrap_width. Each description is only wrapped the first time it is needed at a given width.
+        """
+        if location is None:
+            location = self.get_location()
+        view = "brief" if location.visited else "long"
+        return self._world.render_cache.get((location.id_num, view, self.wrap_width),
+                                            lambda: location.get_description(self.wrap_width))
+
+    def _show_description(self, location: Location) -> None:
+        """Show the given location's current description, unless the output sink discards it (in which case
+        the description is not wrapped at all).
+        """
+        if not self.output.discards:
+            self.output.print(self.describe(location))
+
+    def _show_log(self, game_log: EventList) -> None:
+        """Show every event in the given log, unless the output sink discards it."""
+        if not self.output.discards:
+            for line in game_log.describe_events():
+                self.output.print(line)
 
     def get_current_location_items(self) -> list[Item]:
         """Method for access to _items, to prevent accessing private items."""
-        return [item for item in self._items if item.current_position == self.current_location_id]
+        return self._items.at(self.current_location_id)
+
+    def get_inventory_items(self) -> list[Item]:
+        """Return the items in the player's inventory, in game data order."""
+        return self._items.inventory()
+
+    def get_items(self) -> list[Item]:
+        """Return every item in this game, wherever it is, in game data order."""
+        return list(self._items)
+
+    def get_item(self, name: str) -> Optional[Item]:
+        """Return the item with the given name (ignoring case) as it is in this game, or None if there is none."""
+        return self._items.get(name)
+
+    def get_inventory_mask(self) -> int:
+        """Return the player's inventory as a bitmask over the items' dense indexes (see ItemRegistry.held_mask)."""
+        return self._items.held_mask
+
+    def get_location_flags(self) -> tuple[frozenset[int], frozenset[int], frozenset[int]]:
+        """Return the dense indexes of the locations whose visited, looked and is_locked flags differ from how the
+        world starts, one set per flag (see LocationFlags.snapshot).
+        """
+        return self._flags.snapshot()
+
+    def get_undo_journal(self) -> list[tuple[str, int | str, int | bool]]:
+        """Return this game's undo journal, oldest entry first (see create_new_event). The list is the game's own
+        and changes as the game goes on, so it must not be changed, and must be copied to be kept as it is.
+        """
+        return self._undo_journal
+
+    def get_state_key(self) -> tuple:
+        """Return a hashable key of this game's state: equal keys mean the same location, item positions and
+        location flags. Only the items moved from their starting positions and the location flags changed from
+        their starting values are looked at, so this takes time proportional to them rather than to the world.
+        """
+        return self.current_location_id, self._items.moved(), self._flags.snapshot()
 
     def get_location(self, loc_id: Optional[int] = None) -> Location:
         """Return Location object associated with the provided location ID.
@@ -176,8 +472,9 @@ class AdventureGame:
         """
         if loc_id is None:
             loc_id = self.current_location_id
-        if loc_id in self._locations_all:
-            return self._locations_all[loc_id]
+        location = self._location_overlay.get(loc_id) or self._world.locations.get(loc_id)
+        if location is not None:
+            return location
         else:
             raise KeyError(f"Location ID {loc_id} not found in locations")
 
@@ -186,67 +483,84 @@ class AdventureGame:
         Handles in-game movement, including checking for first visit event triggers,
         locked locations, puzzle movements, and time tracking.
         """
-        current_location = self.get_location()
-
-        if direction not in current_location.available_commands:
-            print("You can't go that way.")
+        # Resolve the command through the world's compiled graph rather than the location's command dictionary
+        graph = self._world.graph
+        node = graph.nodes[self.current_location_id]
+        current_kind = graph.kinds[node]
+        edge = graph.find_edge(node, direction)
+        if edge == MISSING:
+            self.output.print("You can't go that way.")
             return False
 
-        new_location_id = current_location.available_commands[direction]
+        new_location_id = graph.edge_target_id[edge]
         new_location = self.get_location(new_location_id)
 
         # Check if the new location is locked
-        if new_location.is_locked:
+        target = graph.edge_target[edge]
+        if self._flags.is_locked[target]:
             if self.evaluate_unlock_condition(new_location.unlock_condition):
-                new_location.is_locked = False
-                print(f"You've unlocked {new_location.name}!")
+                self._store_flag(new_location_id, "is_locked", False)
+                new_location = self.get_location(new_location_id)
+                self._valid_commands.pop(new_location_id, None)
+                self._unlock_routes(new_location_id)
+                self.output.print(f"You've unlocked {new_location.name}!")
             else:
-                print(
+                self.output.print(
                     f"{new_location.name} is locked. {'You need to fulfill the unlock condition.'}")
 
         # Handle Puzzle-specific movement
-        if isinstance(current_location, Puzzle) and direction != "password":
-            new_location_id = current_location.available_commands[direction]
+        if current_kind == PUZZLE and direction != "password":
             self.current_location_id = new_location_id
-            print(f"You move to {self.get_location().name}.")
+            self.output.print(f"You move to {self.get_location().name}.")
             return True
-        elif isinstance(current_location, Puzzle):
+        elif current_kind == PUZZLE:
             # Prevent automatic puzzle solving during movement
-            print("This location requires a password to proceed. Use the 'password' command to attempt it.")
+            self.output.print("This location requires a password to proceed. Use the 'password' command to attempt it.")
             return False
         else:
             # Update game time for regular locations
-            if not isinstance(new_location, StoryEvent):
+            if graph.kinds[target] != STORY:
                 self.current_time += 1
 
             # Check for game over due to time
             if self.current_time >= 16 * 60:
-                print("\nYou've run out of time! It's now past 4:00 PM. Game Over.")
-                print(f"Score: {self.score}")
+                self.output.print("\nYou've run out of time! It's now past 4:00 PM. Game Over.")
+                self.output.print(f"Score: {self.score}")
                 self.handle_time_command()
                 self.ongoing = False
                 return False
 
-            new_location_id = current_location.available_commands[direction]
             self.current_location_id = new_location_id
-            if not isinstance(current_location, StoryEvent):
-                print(f"You move to {self.get_location().name}.")
+            if current_kind != STORY:
+                self.output.print(f"You move to {self.get_location().name}.")
             return True
 
     def evaluate_unlock_condition(self, condition: Optional[str]) -> bool:
         """Evaluate if the unlock condition is met."""
+        if self.stats is not None:
+            self.stats.count('unlock checks')
+            self.stats.count('condition evaluations')
         if not condition:
             return False
 
-        inventory = [item.name.lower() for item in self._items if item.current_position == -1]
-        return eval(condition, {}, {"inventory": inventory})
+        masks = self._world.unlock_masks.get(condition)
+        if masks is not None:
+            held = self._items.held_mask
+            return held & masks[0] == masks[0] and not held & masks[1]
+        return compile_condition(condition)(self._items.held_keys)
 
     def handle_movement(self, choice: str, game: AdventureGame) -> None:
         """Handle movement between locations."""
         if choice in game.get_location().available_commands:
-            game.move(choice)
+            stats = self.stats
+            if stats is None:
+                game.move(choice)
+            else:
+                start = time.perf_counter()
+                game.move(choice)
+                stats.end_phase('move', start)
         else:
-            print("Invalid movement command.")
+            self.output.print("Invalid movement command.")
 
     def handle_location_visit(self, game_log: EventList) -> None:
         """Handle visiting a location or triggering a story event."""
@@ -254,26 +568,26 @@ class AdventureGame:
 
         # If StoryEvent, display story content and give out items if available.
         if isinstance(location, StoryEvent):
-            print(location.get_description())
+            self._show_description(location)
             for item_name in location.items:
-                item = next((i for i in self._items if i.name == item_name), None)
-                if item:
-                    item.current_position = -1  # Add to inventory
-                    print(f"You received {item.name}!")
+                item = self._items.get(item_name)
+                if item and item.name == item_name:
+                    self._set_item_position(item, -1)  # Add to inventory
+                    self.output.print(f"You received {item.name}!")
             if isinstance(location.new_objective, str):
                 self.current_objective = location.new_objective
             if location.name == "Game Over":
                 self.ongoing = False
-                print("Game Over. Better luck next time!")
-                print(f"Score: {self.score}")
+                self.output.print("Game Over. Better luck next time!")
+                self.output.print(f"Score: {self.score}")
                 self.handle_time_command()
                 return
 
             if location.name == "Victory":
                 self.score += 100
                 self.ongoing = False
-                print("You pass the torch onwards. Or maybe bacwards?")
-                print(f"Score: {self.score}")
+                self.output.print("You pass the torch onwards. Or maybe bacwards?")
+                self.output.print(f"Score: {self.score}")
                 self.handle_time_command()
                 return
 
@@ -284,76 +598,162 @@ class AdventureGame:
                 if location.first_time_event_id:
                     self.current_location_id = location.first_time_event_id
                     self.handle_location_visit(game_log)
-                    location.visited = True
+                    self._set_visited(location, True)
                     return
                 else:
                     # No first-time event to trigger, so display the description,
                     # award 5 bonus points, and mark the location as visited.
-                    print(location.get_description())
+                    self._show_description(location)
                     self.score += 5
-                    location.visited = True
+                    self._set_visited(location, True)
                     return
             else:
                 if self.ongoing:
-                    print(location.get_description())
+                    self._show_description(location)
 
     def display_available_actions(self) -> None:
         """Display available actions and commands to the player.
             Available commands can include location-specific commands, menu commands, and game commands.
         """
+        if self.output.discards:
+            return
         location = self.get_location()
-        valid_items = [item.name.lower() for item in self._items
-                       if item.current_position == self.current_location_id]
 
         if isinstance(location, StoryEvent):
-            print("Actions:")
+            self.output.print("Actions:")
             for action in location.available_commands:
-                print("-", action)
+                self.output.print("-", action)
 
         elif location.is_locked:
-            print("At this location, you can only:")
+            self.output.print("At this location, you can only:")
             for action in location.available_commands:
-                print("-", action)
+                self.output.print("-", action)
         else:
-            print("What to do? Choose from: look, inventory, score, undo, log, quit, time, objective, toggledebug")
-            print("At this location, you can also:")
+            self.output.print("What to do? Choose from: look, inventory, score, undo, log, quit, time, objective, "
+                              "toggledebug, trace, stats, toggleprofile")
+            self.output.print("At this location, you can also:")
             for action in location.available_commands:
-                print("-", action)
+                self.output.print("-", action)
 
             if location.looked:  # Check if the player has looked around
-                valid_items = [item.name.lower() for item in self._items
-                               if item.current_position == self.current_location_id]
+                valid_items = [item.name.lower() for item in self._items.at(self.current_location_id)]
                 if valid_items:
-                    print("You can pick up:", ", ".join(valid_items))
+                    self.output.print("You can pick up:", ", ".join(valid_items))
 
-    def get_player_choice(self, valid_items: list[str]) -> str:
+    def get_player_choice(self) -> str:
         """Get and validate player input."""
-        location = self.get_location()
-        menu = ["look", "inventory", "score", "undo", "log", "quit", "time", "objective", "toggledebug"]
+        while True:
+            choice = self.read_input("\nEnter action: ").lower().strip()
+            if self.is_valid_command(choice):
+                return choice
+            self.output.print("Invalid option. Try again.")
 
-        if isinstance(location, StoryEvent):
-            # Only allow choices specific to the StoryEvent
-            valid_commands = list(location.available_commands.keys())
+    def valid_commands(self) -> frozenset[str]:
+        """Return the exact commands the player may enter at the current location.
+        Commands starting with tp, use, drop or examine are accepted anywhere on top of these (see is_valid_command).
+        """
+        loc_id = self.current_location_id
+        commands = self._valid_commands.get(loc_id)
+        if commands is None:
+            location = self.get_location()
+            commands = set(location.available_commands)
+            # Menu commands and picking up are only allowed in unlocked rooms, not in story events.
+            if not isinstance(location, StoryEvent) and not location.is_locked:
+                commands.update(MENU_COMMANDS)
+                commands.update(f"pick up {item.name.lower()}" for item in self._items.at(loc_id))
+            commands = frozenset(commands)
+            self._valid_commands[loc_id] = commands
+        return commands
+
+    def is_valid_command(self, choice: str) -> bool:
+        """Return whether the given (lowercased, stripped) player input is accepted at the prompt."""
+        return choice in self.valid_commands() or parse_command(choice).verb in ALWAYS_ACCEPTED_VERBS
+
+    def parse(self, choice: str) -> Command:
+        """Return the Command for the given player input, as the adventure.py main loop interprets it at the
+        current location.
+        """
+        return parse_command(choice, self.get_location().available_commands)
 
-        # Only allow non-movement commands when locked
-        elif location.is_locked:
-            valid_commands = list(location.available_commands.keys())
+    def play_turn(self, choice: str, game_log: EventList) -> None:
+        """Process one validated player command: run it as a menu or game command, then activate any story
+        trigger and handle arriving at the resulting location. Append the turn to the journal, if there is one,
+        and record it in the game's stats, if it has any.
+        """
+        stats = self.stats
+        if stats is None:
+            self._play_journaled_turn(choice, game_log)
+            return
+
+        command = self.parse(choice)
+        start = stats.start_turn()
+        try:
+            self._play_journaled_turn(choice, game_log)
+        finally:
+            stats.end_turn(choice, command, start)
+
+    def _play_journaled_turn(self, choice: str, game_log: EventList) -> None:
+        """Play one turn as play_turn does, without recording it in the game's stats."""
+        if self.journal is None:
+            self._play_turn(choice, game_log)
+            return
+
+        before = self._journaled_state()
+        inputs = []
+        read_input = self.read_input
+
+        def read_and_record_input(prompt: str) -> str:
+            """Read an answer to the given prompt with read_input, and record it for the journal."""
+            answer = read_input(prompt)
+            inputs.append(answer)
+            return answer
+
+        self.read_input = read_and_record_input
+        try:
+            self._play_turn(choice, game_log)
+        finally:
+            self.read_input = read_input
+        after = self._journaled_state()
+        delta = {name: value for name, value in after.items()
+                 if before[name] != value and name != "current_location_id"}
+        self.journal.append(self.current_location_id, choice, inputs, delta)
+
+    def _journaled_state(self) -> dict[str, object]:
+        """Return the attributes a journal records the changes of after each turn."""
+        return {
+            "current_location_id": self.current_location_id,
+            "score": self.score,
+            "current_time": self.current_time,
+            "current_objective": self.current_objective,
+            "ongoing": self.ongoing
+        }
+
+    def _play_turn(self, choice: str, game_log: EventList) -> None:
+        """Play one turn as play_turn does, without journaling it or recording it as a turn in the game's stats,
+        but timing its phases there (if the game has stats).
+        """
+        command = self.parse(choice)
+        if command.verb == GOTO:
+            self.handle_goto_command(command.argument, game_log)
+            return
+        stats = self.stats
+        start = time.perf_counter() if stats is not None else 0.0
+        if command.verb == MENU:
+            self.process_menu_command(choice, self, game_log)
+        elif command.verb == ROUTE:
+            self.handle_route_command(command.argument)
         else:
-            # Allow full access to commands when the room is unlocked
-            valid_commands = menu + list(location.available_commands.keys()) + \
-                [f"pick up {item}" for item in valid_items] + \
-                [f"drop {item}" for item in self._get_inventory_items()] + \
-                [f"use {item}" for item in self._get_inventory_items()]
+            self.process_game_command(choice, self, game_log, command)
+        if stats is not None:
+            start = stats.end_phase('dispatch', start)
 
-        while True:
-            choice = input("\nEnter action: ").lower().strip()
-            if (choice in valid_commands
-                    or choice.startswith('tp ')
-                    or choice.startswith('use ')
-                    or choice.startswith('drop ')
-                    or choice.startswith('examine ')):
-                return choice
-            print("Invalid option. Try again.")
+        self.check_trigger_conditions()
+        if stats is not None:
+            start = stats.end_phase('triggers', start)
+
+        self.handle_location_visit(game_log)
+        if stats is not None:
+            stats.end_phase('visit', start)
 
     def process_menu_command(self, choice: str, game: AdventureGame, game_log: EventList) -> None:
         """Handle menu commands that don't change location.
@@ -373,40 +773,50 @@ class AdventureGame:
         elif choice == "score":
             self.handle_score_command()
         elif choice == "log":
-            game_log.display_events()
+            self._show_log(game_log)
         elif choice == "quit":
             game.ongoing = False
-            game_log.display_events()
-            print("Quitting game...")
+            self._show_log(game_log)
+            self.output.print("Quitting game...")
             return
         elif choice == "time":
             self.handle_time_command()
         elif choice == "objective":
-            print(f"Current Objective: {self.current_objective}")
+            self.output.print(f"Current Objective: {self.current_objective}")
         elif choice == "toggledebug":
-            AdventureGame.debug_mode = not AdventureGame.debug_mode
-            print(f"Debug mode {'enabled' if AdventureGame.debug_mode else 'disabled'}.")
+            game.debug_mode = not game.debug_mode
+            self.output.print(f"Debug mode {'enabled' if game.debug_mode else 'disabled'}.")
+        elif choice == "trace":
+            self.handle_trace_command()
+        elif choice == "stats":
+            self.handle_stats_command()
+        elif choice == "toggleprofile":
+            self.handle_profile_command()
 
         game_log.add_event(new_event, choice)
 
-    def process_game_command(self, choice: str, game: AdventureGame, game_log: EventList) -> None:
+    def process_game_command(self, choice: str, game: AdventureGame, game_log: EventList,
+                             command: Optional[Command] = None) -> None:
         """Handle game commands that affect game state.
         One of two main commands with process_game_command.
+        command is the parsed choice, if the caller has already parsed it.
         """
+        if command is None:
+            command = self.parse(choice)
+        verb = command.verb
         new_event = self.create_new_event()
 
-        if (choice.startswith("use ") or choice.startswith("pick up ")
-                or choice.startswith("drop ") or choice.startswith("examine ")):
-            self.process_game_command_extra(choice, game, game_log)
-        elif choice.startswith("tp "):
+        if verb in ITEM_VERBS:
+            self.process_game_command_extra(choice, game, game_log, command)
+        elif verb == TELEPORT:
             self.handle_teleport_command(choice)
             new_location = self.get_location()
             new_event.id_num = new_location.id_num
             if not new_location.visited:
-                new_event.description = new_location.long_description
+                new_event.description = str(new_location.long_description)
             else:
-                new_event.description = new_location.brief_description
-        elif choice == "password":
+                new_event.description = str(new_location.brief_description)
+        elif verb == PASSWORD:
             password_cmd_event = self.create_new_event()
             game_log.add_event(password_cmd_event, "password")
             password_answer = self.handle_password_input(game)
@@ -414,7 +824,7 @@ class AdventureGame:
                 # Log the answer as a separate event.
                 answer_event = self.create_new_event()
                 game_log.add_event(answer_event, password_answer)
-        elif choice == "book search":
+        elif verb == BOOK_SEARCH:
             book_attempt = self.handle_book_search(game)
             if book_attempt is not None:
                 # Add password event
@@ -424,8 +834,8 @@ class AdventureGame:
                 # Log the password and make new event
                 game_log.add_event(new_event, book_attempt)
                 return
-        elif choice == "inquire":
-            inquire()
+        elif verb == INQUIRE:
+            self.open_outline()
         else:
             self.handle_movement(choice, game)
 
@@ -433,18 +843,22 @@ class AdventureGame:
 
         game_log.add_event(new_event, choice)
 
-        if AdventureGame.debug_mode:
-            print(f"[DEBUG] Event logged: Location={new_event.id_num}, Command={choice}")
-            game_log.display_events()
+        if self.debug_mode:
+            self.output.print(f"[DEBUG] Event logged: Location={new_event.id_num}, Command={choice}")
+            self._trace_new_events(game_log)
 
-    def process_game_command_extra(self, choice: str, game: AdventureGame, game_log: EventList) -> None:
-        """Handle game commands that affect game state."""
+    def process_game_command_extra(self, choice: str, game: AdventureGame, game_log: EventList,
+                                   command: Optional[Command] = None) -> None:
+        """Handle game commands that affect game state.
+        command is the parsed choice, if the caller has already parsed it.
+        """
+        verb = (command or self.parse(choice)).verb
         new_event = self.create_new_event()
-        if choice.startswith("use "):
+        if verb == USE:
             self.handle_use_item(choice)
-        elif choice.startswith("pick up "):
+        elif verb == PICK_UP:
             self.handle_item_pickup(choice, game, new_event)
-        elif choice.startswith("drop "):
+        elif verb == DROP:
             self.handle_item_drop(choice, game, new_event)
         else:
             self.handle_examine_item(choice)
@@ -453,38 +867,42 @@ class AdventureGame:
 
         game_log.add_event(new_event, choice)
 
-        if AdventureGame.debug_mode:
-            print(f"[DEBUG] Event logged: Location={new_event.id_num}, Command={choice}")
-            game_log.display_events()
+        if self.debug_mode:
+            self.output.print(f"[DEBUG] Event logged: Location={new_event.id_num}, Command={choice}")
+            self._trace_new_events(game_log)
 
     # Additional helper functions
     def _get_inventory_items(self) -> list[str]:
         """Return list of item names in inventory."""
-        return [item.name for item in self._items if item.current_position == -1]
+        return [item.name for item in self._items.inventory()]
 
     def handle_look_command(self, game: AdventureGame) -> None:
         """Prints extra_description if available and increments time by 1 minute."""
         location = game.get_location()
-        print(location.look_around())
-        location.looked = True  # Mark that the player has looked around (in this location)
+        if not self.output.discards:
+            self.output.print(self._world.render_cache.get((location.id_num, "look", self.wrap_width),
+                                                           lambda: location.look_around(self.wrap_width)))
+        self._set_looked(location, True)  # Mark that the player has looked around (in this location)
         self.current_time += 1
 
     def handle_inventory_command(self) -> None:
         """Display inventory contents."""
         inventory = self._get_inventory_items()
-        print("Inventory:", ", ".join(inventory) if inventory else "(empty)")
+        self.output.print("Inventory:", ", ".join(inventory) if inventory else "(empty)")
 
     def handle_score_command(self) -> None:
         """Display current score."""
         # Implement actual scoring logic here
-        print(f"Your score is {self.score} points.")
+        self.output.print(f"Your score is {self.score} points.")
 
     def handle_undo_command(self, game_log: EventList) -> None:
         """Undo the last action by reverting the game to a previous state."""
         last_event = game_log.remove_last_event()
         if last_event is None:
-            print("Nothing to undo!")
+            self.output.print("Nothing to undo!")
             return
+        if self.trace.last_event is last_event:
+            self.trace.last_event = game_log.last
 
         # Retrieve the saved state.
         snapshot = last_event.state_snapshot
@@ -496,36 +914,39 @@ class AdventureGame:
         self.current_objective = snapshot["current_objective"]
         self.ongoing = snapshot["ongoing"]
 
-    # Restore state for items, locations, stories, puzzles!!!
-        for item in self._items:
-            if item.name in snapshot["items"]:
-                item.current_position = snapshot["items"][item.name]
+        # Revert only the items and location flags changed since the event was created.
+        self._rewind_journal(snapshot["journal_length"])
 
-        for loc_id, states in snapshot["locations_all"].items():
-            if loc_id in self._locations_all:
-                self._locations_all[loc_id].visited = states["visited"]
-                self._locations_all[loc_id].looked = states["looked"]
-
-        print(f"Undo successful. Reverted to previous state at {self.get_location().name}.")
+        self.output.print(f"Undo successful. Reverted to previous state at {self.get_location().name}.")
 
     def create_new_event(self) -> Event:
-        """Create new event for logging."""
+        """Create new event for logging, recording the snapshot in the game's stats if it has any.
+
+        The snapshot holds the scalar game state and the current length of the undo journal; item positions and
+        location flags changed afterwards are recovered from the journal entries past that length.
+        """
+        if self.stats is None:
+            return self._create_event()
+        start = time.perf_counter()
+        event = self._create_event()
+        self.stats.add_snapshot(event, start)
+        return event
+
+    def _create_event(self) -> Event:
+        """Create new event for logging as create_new_event does, without recording it in the game's stats."""
         state_snapshot = {
             "score": self.score,
             "current_time": self.current_time,
             "current_location_id": self.current_location_id,
             "current_objective": self.current_objective,
             "ongoing": self.ongoing,
-            "items": {item.name: item.current_position for item in self._items},
-            "locations_all": {loc_id: {"visited": loc.visited, "looked": loc.looked}
-                              for loc_id, loc in self._locations_all.items()},
-
+            "journal_length": len(self._undo_journal)
         }
 
         location = self.get_location()
         return Event(
             id_num=location.id_num,
-            description=(location.long_description if not location.visited else location.brief_description),
+            description=str(location.long_description if not location.visited else location.brief_description),
             next_command=None,
             next=None,
             prev=None,
@@ -535,58 +956,66 @@ class AdventureGame:
     def handle_item_pickup(self, choice: str, game: AdventureGame, event: Event) -> None:
         """Handle item pickup logic."""
         item_name = choice.replace("pick up ", "").strip().lower()
-        item = next((i for i in self._items if
-                    i.name.lower() == item_name and i.current_position == game.current_location_id), None)
+        item = self._items.get(item_name)
+        if item and item.current_position != game.current_location_id:
+            item = None
 
         if item:
+            item = self._items.own(item)
             event.item_affected = item.name
             event.item_prev_location = item.current_position
-            item.current_position = -1
+            self._set_item_position(item, -1)
             if item.start_position != -1:
                 event.score_change = 10  # Track score gained from picking up the item (FIRST TIME ONLY)
                 item.start_position = -1
                 self.score += 10
-                print(f"You picked up {item.name}! (+10 points)")
+                self.output.print(f"You picked up {item.name}! (+10 points)")
             else:
-                print(f"You picked up {item.name}!")
+                self.output.print(f"You picked up {item.name}!")
         else:
-            print("There's no such item here.")
+            self.output.print("There's no such item here.")
 
     def handle_item_drop(self, choice: str, game: AdventureGame, event: Event) -> None:
         """Handle item drop logic."""
         item_name = choice.replace("drop ", "").strip().lower()
-        item = next((i for i in self._items if i.name.lower() == item_name and i.current_position == -1), None)
+        item = self._items.get(item_name)
+        if item and not self._items.is_held(item):
+            item = None
 
         if item:
             event.item_affected = item.name
             event.item_prev_location = -1
-            item.current_position = game.current_location_id
-            print(f"You dropped {item.name}.")
+            self._set_item_position(item, game.current_location_id)
+            self.output.print(f"You dropped {item.name}.")
         else:
-            print("You don't have that item.")
+            self.output.print("You don't have that item.")
 
     def handle_use_item(self, choice: str) -> None:
         """Checks whether item can be used in a location, and if so triggers item-related event."""
         item_name = choice.replace("use ", "").strip().lower()
-        item = next((i for i in self._items if i.name.lower() == item_name and i.current_position == -1), None)
+        item = self._items.get(item_name)
+        if item and not self._items.is_held(item):
+            item = None
 
         if item:
             current_location_id = self.current_location_id
             if item.use_location == current_location_id:
-                print(f"You used the {item.name}.")
+                self.output.print(f"You used the {item.name}.")
 
                 if item.triggers_event_id:
                     self.current_location_id = item.triggers_event_id
             else:
-                print(f"You can't use {item.name} here.")
+                self.output.print(f"You can't use {item.name} here.")
         else:
-            print("You don't have that item in your inventory.")
+            self.output.print("You don't have that item in your inventory.")
 
     def handle_examine_item(self, choice: str) -> None:
         """Prints item description"""
         item_name = choice.replace("examine ", "").strip().lower()
-        item = next((i for i in self._items if i.name.lower() == item_name and i.current_position == -1), None)
-        print(f"{item.description}.")
+        item = self._items.get(item_name)
+        if item and not self._items.is_held(item):
+            item = None
+        self.output.print(f"{item.description}.")
 
     def handle_teleport_command(self, choice: str) -> None:
         """
@@ -594,68 +1023,188 @@ class AdventureGame:
         """
         parts = choice.split()
         if len(parts) != 2:
-            print("Invalid teleport command. Usage: tp <location_id>")
+            self.output.print("Invalid teleport command. Usage: tp <location_id>")
             return
         else:
             loc_id = int(parts[1])
             if self.get_location():
                 self.get_location(loc_id)
                 self.current_location_id = loc_id
-                print(f"Teleported to location {loc_id}.")
+                self.output.print(f"Teleported to location {loc_id}.")
+            else:
+                self.output.print("Invalid location ID. No such location exists.")
+
+    def get_route_index(self) -> RouteIndex:
+        """Return the index of routes between the locations of this game, with its locations locked as they are now.
+        Games share their world's index until they unlock a location.
+        """
+        if self._routes is None:
+            world_index = self._world.get_route_index()
+            if not self._flags.changed("is_locked"):
+                self._routes = world_index
+            else:
+                self._routes = RouteIndex(world_index.graph, [loc_id for loc_id, location in self._locations_all.items()
+                                                              if location.is_locked])
+        return self._routes
+
+    def _unlock_routes(self, loc_id: int) -> None:
+        """Let routes pass through the location of the given ID, which this game has just unlocked."""
+        if self._routes is not None:
+            if self._routes is self._world.get_route_index():
+                self._routes = self._routes.copy()
+            self._routes.unlock(loc_id)
+
+    def _find_route(self, destination: str) -> Optional[tuple[Location, list[tuple[str, int]]]]:
+        """Return the location the given location ID or name refers to, and the moves of a shortest route there
+        from the current location (see RouteIndex.route). Tell the player and return None if there is no such
+        location or no route to it.
+        """
+        index = self.get_route_index()
+        loc_id = index.graph.find(destination)
+        if loc_id is None:
+            self.output.print(f"There's no location called {destination}.")
+            return None
+        location = self.get_location(loc_id)
+        moves = index.route(self.current_location_id, loc_id)
+        if moves is None:
+            self.output.print(f"There's no way to get to {location.name} from here.")
+            return None
+        return location, moves
+
+    def handle_route_command(self, destination: str) -> None:
+        """Show the commands of a shortest route from the current location to the given location ID or name.
+        Routes never pass through story events or locked locations.
+        """
+        found = self._find_route(destination)
+        if found is not None:
+            location, moves = found
+            if moves:
+                self.output.print(f"Route to {location.name} ({len(moves)} moves):",
+                                  ", ".join(command for command, _ in moves))
             else:
-                print("Invalid location ID. No such location exists.")
+                self.output.print(f"You're already at {location.name}.")
+
+    def handle_goto_command(self, destination: str, game_log: EventList) -> None:
+        """Walk a shortest route from the current location to the given location ID or name, playing each move as
+        its own turn (so each takes time and is logged as usual). Stop early if a move ends up anywhere other than
+        planned, e.g. because a story event was triggered.
+        """
+        found = self._find_route(destination)
+        if found is None:
+            return
+        location, moves = found
+        if not moves:
+            self.output.print(f"You're already at {location.name}.")
+        for command, loc_id in moves:
+            self.output.print(f"Heading for {location.name}:", command)
+            self._play_turn(command, game_log)
+            if not self.ongoing:
+                return
+            if self.current_location_id != loc_id:
+                self.output.print(f"Your way to {location.name} was interrupted.")
+                return
+
+    def _trace_new_events(self, game_log: EventList) -> None:
+        """Show and record in the trace the events added to the given log since the last ones traced."""
+        trace = self.trace
+        for event in game_log.events_since(trace.last_event):
+            line = f"Location: {event.id_num}, Command: {event.next_command}"
+            trace.record(line)
+            self.output.print(line)
+            trace.last_event = event
+
+    def handle_trace_command(self) -> None:
+        """Show the most recent debug trace records."""
+        lines = self.trace.recent()
+        self.output.print("\n".join(lines) if lines else "The debug trace is empty. Use toggledebug to record it.")
+
+    def enable_stats(self) -> GameStats:
+        """Start recording timings and counters for this game, if it is not already, and return its stats. The
+        game calls the hooks of its stats itself while it has some (see game_stats).
+        """
+        if self.stats is None:
+            GameStats().attach(self)
+        return self.stats
+
+    def disable_stats(self) -> None:
+        """Stop recording timings and counters for this game (and stop profiling it), dropping its stats."""
+        if self.stats is not None:
+            self.stats.detach(self)
+
+    def handle_stats_command(self) -> None:
+        """Show the timings and counters recorded so far, turning recording on if it is off."""
+        if self.stats is None:
+            self.enable_stats()
+            self.output.print("Recording command timings. Type stats again to see them.")
+        else:
+            self.output.print(self.stats.report())
+
+    def handle_profile_command(self) -> None:
+        """Start profiling the turns played (turning recording on if it is off), or stop and show the profile."""
+        stats = self.enable_stats()
+        if stats.profile is None:
+            stats.start_profile()
+            self.output.print("Profiling the following turns. Type toggleprofile again to see the profile.")
+        else:
+            profile = stats.stop_profile()
+            self.output.print(format_profile(profile) if profile is not None else "No turns were profiled.")
 
     def handle_time_command(self) -> None:
         """Display the current in-game time."""
         hours = self.current_time // 60
         minutes = self.current_time % 60
-        print(f"Current time: {hours:02}:{minutes:02}")
+        self.output.print(f"Current time: {hours:02}:{minutes:02}")
 
     def handle_password_input(self, game: AdventureGame) -> Optional[str]:
         """Handle password input for puzzle locations."""
         current_location = game.get_location()
 
         if isinstance(current_location, Puzzle):
-            password_attempt = input("Enter the password: ").strip().lower()
+            password_attempt = self.read_input("Enter the password: ").strip().lower()
             if password_attempt in current_location.answers:
-                print("Correct password! You can now proceed.")
+                self.output.print("Correct password! You can now proceed.")
                 # Move to the next location after solving the puzzle
                 next_location_id = list(current_location.available_commands.values())[0]
                 self.current_location_id = next_location_id
                 return password_attempt
             else:
-                print("Incorrect password. Try again.")
+                self.output.print("Incorrect password. Try again.")
         else:
-            print("There's no password to enter here.")
+            self.output.print("There's no password to enter here.")
 
     def handle_book_search(self, game: AdventureGame) -> Optional[str]:
         """Handle password input for puzzle locations."""
         current_location = game.get_location()
 
         if isinstance(current_location, Puzzle):
-            book_attempt = input("Enter section to search: ").strip().lower()
+            book_attempt = self.read_input("Enter section to search: ").strip().lower()
             if book_attempt in current_location.answers:
-                print("Correct! You can now proceed.")
+                self.output.print("Correct! You can now proceed.")
                 # Move to the next location after solving the puzzle
                 next_location_id = list(current_location.available_commands.values())[0]
                 self.current_location_id = next_location_id
                 return book_attempt
             else:
-                print("Incorrect section. Try again.")
+                self.output.print("Incorrect section. Try again.")
         else:
-            print("There's no password to enter here.")
+            self.output.print("There's no password to enter here.")
 
     def check_trigger_conditions(self) -> None:
-        """Check all story events for trigger conditions and activate if met."""
-        inventory = [item.name for item in self._items if item.current_position == -1]  # Get items in inventory
+        """Check all story events for trigger conditions and activate if met.
 
-        for event in self._locations_all.values():
-            if isinstance(event, StoryEvent) and event.trigger_condition:
-                if eval(event.trigger_condition, {}, {"inventory": inventory}):
-                    print(f"\n--- Event Triggered: {event.name} ---")
-                    print(event.get_description())
-                    self.current_location_id = event.id_num  # Move player to event location
-                    break
+        Conditions only depend on the inventory, so they are re-evaluated only when the inventory has
+        changed since the last check. The first met event in world order is activated.
+        """
+        if self._dirty_trigger_items:
+            evaluated = self._refresh_triggers()
+            if self.stats is not None:
+                self.stats.count('condition evaluations', evaluated)
+
+        if self._active_triggers:
+            event = self._locations_all[min(self._active_triggers, key=self._trigger_order.__getitem__)]
+            self.output.print(f"\n--- Event Triggered: {event.name} ---")
+            self._show_description(event)
+            self.current_location_id = event.id_num  # Move player to event location
 
 
 if __name__ == "__main__":
@@ -668,16 +1217,20 @@ if __name__ == "__main__":
     #     'max-line-length': 120,
     #     'disable': ['R1705', 'E9998', 'E9999']
     # })
-    game_obj_log = EventList()
-    game_obj = AdventureGame('game_data.json', 1)  # Insert starting ID here :D
-    menu_list = ["look", "inventory", "score", "undo", "log", "quit", "time", "objective", "toggledebug"]
+    # Run as "python adventure.py <journal file>" to keep a journal of the game, resuming it if the file exists.
+    journal_file = sys.argv[1] if len(sys.argv) > 1 else None
+    if journal_file is not None and os.path.exists(journal_file):
+        game_obj, game_obj_log = AdventureGame.recover(journal_file)
+        print(f"Resumed the game in {journal_file}.")
+    else:
+        game_obj_log = EventList()
+        game_obj = AdventureGame('game_data.json', 1)  # Insert starting ID here :D
+    if journal_file is not None:
+        game_obj.journal = GameJournal(journal_file, 'game_data.json', 1)
 
     while game_obj.ongoing:
-        # Get valid items for current location
-        items_valid = [item.name.lower() for item in game_obj.get_current_location_items()]
-
         # DEBUGMODE!!
-        if AdventureGame.debug_mode:
+        if game_obj.debug_mode:
             print(f"[DEBUG] Current location: {game_obj.current_location_id}")
             print(f"[DEBUG] Items here: {[item.name for item in game_obj.get_current_location_items()]}")
 
@@ -685,16 +1238,12 @@ if __name__ == "__main__":
         game_obj.display_available_actions()
 
         # Get player input
-        choice_str = game_obj.get_player_choice(items_valid)
+        choice_str = game_obj.get_player_choice()
         print("========")
         print("You decided to:", choice_str)
 
         # Process command
-        if choice_str in menu_list:
-            game_obj.process_menu_command(choice_str, game_obj, game_obj_log)
-        else:
-            game_obj.process_game_command(choice_str, game_obj, game_obj_log)
-
-        game_obj.check_trigger_conditions()
+        game_obj.play_turn(choice_str, game_obj_log)
 
-        game_obj.handle_location_visit(game_obj_log)
+    if game_obj.journal is not None:
+        game_obj.journal.close()
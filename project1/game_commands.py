@@ -0,0 +1,112 @@
+"""CSC111 Project 1: Text Adventure Game - Command Parser
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the verb table and the parser that turns a line of player input into a
+Command. The adventure.py main loop and the simulator both parse each command once and dispatch on
+the resulting verb.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Container
+
+MENU_COMMANDS = ["look", "inventory", "score", "undo", "log", "quit", "time", "objective", "toggledebug",
+                 "trace", "stats", "toggleprofile"]
+
+# Verbs a Command can have.
+MENU = "menu"
+MOVE = "move"
+USE = "use"
+PICK_UP = "pick up"
+DROP = "drop"
+EXAMINE = "examine"
+TELEPORT = "tp"
+PASSWORD = "password"
+BOOK_SEARCH = "book search"
+INQUIRE = "inquire"
+ROUTE = "route"
+GOTO = "goto"
+UNKNOWN = "unknown"
+
+ITEM_VERBS = frozenset({USE, PICK_UP, DROP, EXAMINE})
+
+# Verbs that take an argument, keyed by the first word of the command: (prefix including the space, verb).
+PREFIX_VERBS = {
+    "use": ("use ", USE),
+    "pick": ("pick up ", PICK_UP),
+    "drop": ("drop ", DROP),
+    "examine": ("examine ", EXAMINE),
+    "tp": ("tp ", TELEPORT),
+    "route": ("route ", ROUTE),
+    "goto": ("goto ", GOTO),
+}
+
+# Verbs that are the whole command.
+EXACT_VERBS = {**{command: MENU for command in MENU_COMMANDS},
+               "password": PASSWORD, "book search": BOOK_SEARCH, "inquire": INQUIRE}
+
+# Verbs the prompt accepts at any location, even where they do nothing.
+ALWAYS_ACCEPTED_VERBS = frozenset({TELEPORT, USE, DROP, EXAMINE, ROUTE, GOTO})
+
+
+@dataclass(frozen=True, slots=True)
+class Command:
+    """A parsed line of player input.
+
+    Instance Attributes:
+        - text:
+            The command as entered (lowercased and stripped).
+        - verb:
+            What kind of command it is: one of the verb constants in this module. MOVE is one of the current
+            location's available_commands, and UNKNOWN is anything else.
+        - argument:
+            The rest of the command after a prefix verb (e.g. the item name of "pick up <item>"), or ''.
+    """
+    text: str
+    verb: str
+    argument: str = ''
+
+
+def parse_command(text: str, location_commands: Container[str] = (), location_first: bool = False) -> Command:
+    """Return the Command for the given (lowercased, stripped) input.
+
+    The current location's own commands (location_commands) normally only apply to input that is not a menu
+    command or another verb; with location_first, they take precedence over every verb instead, as in the
+    simulator.
+    """
+    if location_first and text in location_commands:
+        return Command(text, MOVE)
+
+    verb = EXACT_VERBS.get(text)
+    if verb is not None:
+        return Command(text, verb)
+
+    prefix_verb = PREFIX_VERBS.get(text.split(" ", 1)[0])
+    if prefix_verb is not None and text.startswith(prefix_verb[0]):
+        prefix, verb = prefix_verb
+        return Command(text, verb, text[len(prefix):].strip())
+
+    return Command(text, MOVE if text in location_commands else UNKNOWN)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
@@ -0,0 +1,195 @@
+"""CSC111 Project 1: Text Adventure Game - Condition Compiler
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module compiles the `trigger_condition` and `unlock_condition` strings found in
+the game data file into predicates, so that each condition is parsed once instead of being
+passed to eval() every time it is checked.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import ast
+from typing import AbstractSet, Callable, Dict, FrozenSet, Mapping, Optional
+
+Predicate = Callable[[AbstractSet[str]], bool]
+
+
+class CompiledCondition:
+    """A condition string from the game data, parsed once into a predicate over an inventory set.
+
+    Instance Attributes:
+        - source:
+            The original condition string.
+        - items:
+            The item names the condition mentions, or None if the condition could not be
+            analysed (in which case it may depend on anything in the inventory).
+        - required:
+            Item names that must be in the inventory, if the condition is a plain conjunction
+            of `in` / `not in` tests (the common case in game_data.json), otherwise None.
+        - forbidden:
+            Item names that must not be in the inventory, under the same conditions as required.
+
+    Representation Invariants:
+        - (self.required is None) == (self.forbidden is None)
+        - self.required is None or self.items == self.required | self.forbidden
+    """
+    __slots__ = ('source', 'items', 'required', 'forbidden', '_predicate')
+
+    source: str
+    items: Optional[FrozenSet[str]]
+    required: Optional[FrozenSet[str]]
+    forbidden: Optional[FrozenSet[str]]
+    _predicate: Predicate
+
+    def __init__(self, source: str) -> None:
+        """Parse the given condition string.
+
+        Conditions built only from string literals, `in` / `not in` tests against `inventory`,
+        `and`, `or`, `not` and boolean constants are compiled into closures. Anything else falls
+        back to a code object compiled once and evaluated with `inventory` bound.
+        """
+        self.source = source
+        self.required = None
+        self.forbidden = None
+        tree = ast.parse(source.strip(), mode='eval')
+        try:
+            self._predicate, items = _compile_node(tree.body)
+            self.items = frozenset(items)
+            conjunction = _as_conjunction(tree.body)
+            if conjunction is not None:
+                self.required, self.forbidden = conjunction
+                self._predicate = _conjunction_predicate(self.required, self.forbidden)
+        except ValueError:
+            code = compile(tree, '<condition>', 'eval')
+            self._predicate = lambda inventory: bool(eval(code, {}, {'inventory': inventory}))
+            self.items = None
+
+    def __call__(self, inventory: AbstractSet[str]) -> bool:
+        """Return whether this condition holds for the given inventory."""
+        return self._predicate(inventory)
+
+    def masks(self, bits: Mapping[str, int]) -> Optional[tuple[int, int]]:
+        """Return the (required, forbidden) bitmasks of this condition over an inventory bitmask, given the bit of
+        each item name, or None if it is not a plain conjunction. The condition holds for an inventory mask held
+        exactly when held & required == required and not held & forbidden.
+
+        A required name with no bit gets the bit just past every given bit, which no inventory has, so the
+        condition never holds; a forbidden name with no bit is never in the inventory, so it is left out.
+        """
+        if self.required is None:
+            return None
+        missing = 1 << len(bits)
+        required = forbidden = 0
+        for name in self.required:
+            required |= bits.get(name, missing)
+        for name in self.forbidden:
+            forbidden |= bits.get(name, 0)
+        return required, forbidden
+
+    def __repr__(self) -> str:
+        """Return a string representation of this condition."""
+        return f'CompiledCondition({self.source!r})'
+
+
+_compiled_cache: Dict[str, CompiledCondition] = {}
+
+
+def compile_condition(source: str) -> CompiledCondition:
+    """Return the compiled form of the given condition string.
+
+    Compiled conditions are cached by their source, so every distinct condition in a process is
+    parsed exactly once no matter how many games load it.
+    """
+    condition = _compiled_cache.get(source)
+    if condition is None:
+        condition = CompiledCondition(source)
+        _compiled_cache[source] = condition
+    return condition
+
+
+def _compile_node(node: ast.expr) -> tuple[Predicate, set[str]]:
+    """Return a predicate for the given expression node and the item names it mentions.
+
+    Raise ValueError if the node uses syntax outside of the supported condition language.
+    """
+    if isinstance(node, ast.BoolOp):
+        parts = [_compile_node(value) for value in node.values]
+        predicates = tuple(part[0] for part in parts)
+        items = set().union(*(part[1] for part in parts))
+        if isinstance(node.op, ast.And):
+            return (lambda inventory: all(p(inventory) for p in predicates)), items
+        return (lambda inventory: any(p(inventory) for p in predicates)), items
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        operand, items = _compile_node(node.operand)
+        return (lambda inventory: not operand(inventory)), items
+
+    if isinstance(node, ast.Constant) and isinstance(node.value, bool):
+        value = node.value
+        return (lambda _: value), set()
+
+    item_test = _as_item_test(node)
+    if item_test is not None:
+        name, present = item_test
+        if present:
+            return (lambda inventory: name in inventory), {name}
+        return (lambda inventory: name not in inventory), {name}
+
+    raise ValueError(f'Unsupported condition syntax: {ast.dump(node)}')
+
+
+def _as_item_test(node: ast.expr) -> Optional[tuple[str, bool]]:
+    """Return (item name, True) for `'name' in inventory`, (item name, False) for
+    `'name' not in inventory`, or None if the node is not such a test.
+    """
+    if (isinstance(node, ast.Compare) and len(node.ops) == 1
+            and isinstance(node.ops[0], (ast.In, ast.NotIn))
+            and isinstance(node.left, ast.Constant) and isinstance(node.left.value, str)
+            and isinstance(node.comparators[0], ast.Name) and node.comparators[0].id == 'inventory'):
+        return node.left.value, isinstance(node.ops[0], ast.In)
+    return None
+
+
+def _as_conjunction(node: ast.expr) -> Optional[tuple[FrozenSet[str], FrozenSet[str]]]:
+    """Return the (required, forbidden) item names if the node is a single item test or an `and`
+    of item tests, otherwise return None.
+    """
+    terms = node.values if isinstance(node, ast.BoolOp) and isinstance(node.op, ast.And) else [node]
+    required = set()
+    forbidden = set()
+    for term in terms:
+        item_test = _as_item_test(term)
+        if item_test is None:
+            return None
+        name, present = item_test
+        (required if present else forbidden).add(name)
+    return frozenset(required), frozenset(forbidden)
+
+
+def _conjunction_predicate(required: FrozenSet[str], forbidden: FrozenSet[str]) -> Predicate:
+    """Return a predicate checking a conjunction of item tests with two set operations."""
+    if required & forbidden:
+        return lambda _: False
+    return lambda inventory: required.issubset(inventory) and forbidden.isdisjoint(inventory)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
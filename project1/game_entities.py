@@ -26,8 +26,12 @@ import os
 import sys
 import subprocess  # For inquire
 
+from game_text import TextRef
 
-@dataclass
+DEFAULT_WRAP_WIDTH = 160
+
+
+@dataclass(slots=True)
 class Location:
     """
     A location in our text adventure game world.
@@ -39,6 +43,7 @@ class Location:
             The name of the location.
         - brief_description:
             A short description used after the location has been visited.
+            Like the other descriptions, this is a TextRef if the world was loaded from a compiled bundle.
         - long_description:
             A detailed description shown the first time the location is visited.
         - available_commands:
@@ -70,29 +75,32 @@ class Location:
 
     id_num: int
     name: str
-    brief_description: str
-    long_description: str
+    brief_description: Union[str, TextRef]
+    long_description: Union[str, TextRef]
     available_commands: Dict[str, int]  # Dictionary mapping directions to location IDs
     items: List[str]  # List of item names present in this location
-    extra_description: Optional[str] = None  # New field for additional details
+    extra_description: Optional[Union[str, TextRef]] = None  # New field for additional details
     visited: bool = False  # Tracks if player has been here before
     looked: bool = False  # Tracks if player has looked here before
     first_time_event_id: Optional[int] = None
     is_locked: bool = False  # Check whether room is locked
     unlock_condition: Optional[str] = None  # If locked, unlock requirement.
 
-    def get_description(self) -> str:
-        """Return the appropriate description based on whether this location has been visited."""
+    def get_description(self, width: int = DEFAULT_WRAP_WIDTH) -> str:
+        """Return the appropriate description based on whether this location has been visited,
+        wrapped to the given width.
+        """
         description = self.long_description if not self.visited else self.brief_description
-        return textwrap.fill(description, width=160)
+        return textwrap.fill(str(description), width=width)
 
-    def look_around(self) -> str:
-        """Return additional details if available, otherwise return a generic response."""
+    def look_around(self, width: int = DEFAULT_WRAP_WIDTH) -> str:
+        """Return additional details if available, otherwise return a generic response, wrapped to the given width.
+        """
         extra = self.extra_description if self.extra_description else "You find nothing of note."
-        return textwrap.fill(extra, width=160)
+        return textwrap.fill(str(extra), width=width)
 
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     """An item in our text adventure game world :D.
     Instance Attributes:
@@ -137,7 +145,7 @@ class Item:
     triggers_event_id: Optional[int] = None  # ID of the StoryEvent triggered when used
 
 
-@dataclass
+@dataclass(slots=True)
 class Puzzle(Location):
     """
     A puzzle location where the player must enter a password to proceed.
@@ -159,12 +167,12 @@ class Puzzle(Location):
     choices: Optional[List[str]] = None
     answers: Optional[List[str]] = None
 
-    def get_description(self) -> str:
-        """Return the puzzle text as the description."""
+    def get_description(self, width: int = DEFAULT_WRAP_WIDTH) -> str:
+        """Return the puzzle text as the description. The puzzle text is shown as written, whatever the width."""
         return "\n".join(self.puzzle_text)
 
 
-@dataclass
+@dataclass(slots=True)
 class StoryEvent(Location):
     """
     A story event that functions like a location, allowing for narrative-driven choices.
@@ -188,16 +196,19 @@ class StoryEvent(Location):
           in a context where 'inventory' is defined.
           """
 
-    story_text: Optional[Union[str, List[str]]] = None  # Allow story_text to be a list or a string
+    story_text: Optional[Union[str, TextRef, List[Union[str, TextRef]]]] = None  # A list or a string
     choices: Optional[List[str]] = None  # List of available choices
     new_objective: Optional[str] = None  # For objective command
     trigger_condition: Optional[str] = None
 
-    def get_description(self) -> str:
-        """Display the story text instead of regular location descriptions."""
+    def get_description(self, width: int = DEFAULT_WRAP_WIDTH) -> str:
+        """Display the story text instead of regular location descriptions.
+        Story text is shown as written; width only applies to the location description used without one.
+        """
         if isinstance(self.story_text, list):
-            return "\n".join(self.story_text)  # Join list elements into a multi-line string
-        return self.story_text if self.story_text else super().get_description()
+            return "\n".join(map(str, self.story_text))  # Join list elements into a multi-line string
+        # Zero-argument super() does not work in slotted dataclasses, so name the parent class explicitly.
+        return str(self.story_text) if self.story_text else Location.get_description(self, width)
 
 
 def inquire() -> None:
@@ -0,0 +1,122 @@
+"""CSC111 Project 1: Text Adventure Game - Location Flags
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the LocationFlags class, which keeps the visited, looked and is_locked
+flags of every location in a game as one byte per location per flag, so that testing or setting a
+flag takes constant time however many locations the world has. It also keeps which flags differ
+from the world's starting flags, so that a game's flags can be compared and hashed in time
+proportional to the flags it has changed.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import copy
+
+from game_entities import Location
+
+FLAGS = ('visited', 'looked', 'is_locked')
+
+
+class LocationFlags:
+    """The visited, looked and is_locked flags of every location in a world, one bytearray per flag.
+
+    Each location gets a dense index, its position in the world's locations, and byte i of an array is the flag of
+    the location with index i. A world keeps the flags its locations start with, and each game works on its own
+    copy of them. A copy shares its arrays until it first sets a flag in one, which copies that array only.
+
+    Instance Attributes:
+        - index:
+            A mapping from location ID to its dense index (shared by every copy, read-only).
+        - visited:
+            For each dense index, 1 if the location has been visited and 0 otherwise.
+        - looked:
+            For each dense index, 1 if the location has been looked around and 0 otherwise.
+        - is_locked:
+            For each dense index, 1 if the location is locked and 0 otherwise.
+
+    Representation Invariants:
+        - all(0 <= i < len(self.index) for i in self.index.values())
+        - all(len(getattr(self, flag)) == len(self.index) for flag in FLAGS)
+        - all(getattr(self, flag)[i] != self._start[flag][i] for flag in FLAGS for i in self._changed[flag])
+    """
+    # Private Instance Attributes:
+    #   - _start: the arrays of the flags the locations start with, by flag (shared by every copy, read-only)
+    #   - _changed: the dense indexes of the locations whose flag differs from the start, by flag
+    #   - _shared: the flags whose array may be shared with another copy, and must be copied before it is set
+
+    index: dict[int, int]
+    visited: bytearray
+    looked: bytearray
+    is_locked: bytearray
+    _start: dict[str, bytearray]
+    _changed: dict[str, set[int]]
+    _shared: set[str]
+
+    def __init__(self, locations: dict[int, Location]) -> None:
+        """Initialize the flags of the given locations, keyed by ID, as they are on the locations."""
+        self.index = {loc_id: i for i, loc_id in enumerate(locations)}
+        self.visited = bytearray(location.visited for location in locations.values())
+        self.looked = bytearray(location.looked for location in locations.values())
+        self.is_locked = bytearray(location.is_locked for location in locations.values())
+        self._start = {flag: getattr(self, flag) for flag in FLAGS}
+        self._changed = {flag: set() for flag in FLAGS}
+        self._shared = set(FLAGS)
+
+    def copy(self) -> LocationFlags:
+        """Return a copy of these flags that can be changed independently, sharing the index and, until they are
+        set, the arrays.
+        """
+        copied = copy.copy(self)
+        copied._changed = {flag: set(changed) for flag, changed in self._changed.items()}
+        copied._shared = set(FLAGS)
+        self._shared = set(FLAGS)
+        return copied
+
+    def get(self, flag: str, loc_id: int) -> bool:
+        """Return the given flag (one of FLAGS) of the location with the given ID."""
+        return bool(getattr(self, flag)[self.index[loc_id]])
+
+    def set(self, flag: str, loc_id: int, value: bool) -> None:
+        """Set the given flag (one of FLAGS) of the location with the given ID."""
+        if flag in self._shared:
+            setattr(self, flag, bytearray(getattr(self, flag)))
+            self._shared.discard(flag)
+        i = self.index[loc_id]
+        getattr(self, flag)[i] = value
+        if value == self._start[flag][i]:
+            self._changed[flag].discard(i)
+        else:
+            self._changed[flag].add(i)
+
+    def changed(self, flag: str) -> frozenset[int]:
+        """Return the dense indexes of the locations whose given flag (one of FLAGS) differs from the start."""
+        return frozenset(self._changed[flag])
+
+    def snapshot(self) -> tuple[frozenset[int], frozenset[int], frozenset[int]]:
+        """Return changed(flag) for each flag of FLAGS, in order. Together with the starting flags, this gives
+        every flag, so equal snapshots of copies of the same flags mean equal flags.
+        """
+        visited, looked, is_locked = (frozenset(self._changed[flag]) for flag in FLAGS)
+        return visited, looked, is_locked
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
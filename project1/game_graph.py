@@ -0,0 +1,180 @@
+"""CSC111 Project 1: Text Adventure Game - World Graph
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains WorldGraph, a world's locations and the commands between them compiled
+to dense arrays: locations are numbered 0 to n - 1, command strings are interned to integer codes,
+and the commands out of each location are stored contiguously (compressed sparse rows). The game
+engine resolves moves through it, and the route index and analytics (reachability, random walks)
+work on it without touching the Location objects.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import random
+from array import array
+from typing import Optional
+
+from game_commands import MOVE, parse_command
+from game_entities import Location, Puzzle, StoryEvent
+
+# Kinds of node.
+PLAIN = 0
+STORY = 1
+PUZZLE = 2
+
+# An edge or node that does not exist.
+MISSING = -1
+
+
+class WorldGraph:
+    """The locations of a world and their available commands, with the locations numbered 0 to n - 1 in world
+    order (the same dense indexes as LocationFlags).
+
+    The commands of node u are the edges offsets[u] to offsets[u + 1] - 1, in the order the location lists them.
+    Each edge has the code of its command string, the location ID it leads to, and its node, which is MISSING if
+    the game data has no location with that ID.
+
+    Instance Attributes:
+        - ids:
+            The location ID of each node.
+        - nodes:
+            A mapping from location ID to node.
+        - kinds:
+            The kind of each node: PLAIN, STORY (a story event) or PUZZLE.
+        - location_names:
+            The name of each node's location.
+        - codes:
+            A mapping from command string to its code.
+        - commands:
+            The command string of each code.
+        - offsets, edge_code, edge_target_id, edge_target:
+            The edges, grouped by source node: each one's command code, the location ID it leads to and its node.
+        - edge_move:
+            1 for each edge whose command the adventure.py main loop treats as moving (so not e.g. "password" or
+            "inquire") and that leads to a location of the world, 0 otherwise.
+
+    Representation Invariants:
+        - len(self.ids) == len(self.nodes) == len(self.kinds) == len(self.location_names)
+        - len(self.offsets) == len(self.ids) + 1
+        - len(self.edge_code) == len(self.edge_target_id) == len(self.edge_target) == len(self.edge_move)
+        - all(self.codes[command] == code for code, command in enumerate(self.commands))
+        - no code appears twice in the row of any node
+    """
+    ids: array
+    nodes: dict[int, int]
+    kinds: bytearray
+    location_names: list[str]
+    codes: dict[str, int]
+    commands: list[str]
+    offsets: array
+    edge_code: array
+    edge_target_id: array
+    edge_target: array
+    edge_move: bytearray
+
+    def __init__(self, locations: dict[int, Location]) -> None:
+        """Compile the given locations, keyed by ID."""
+        self.ids = array('q', locations)
+        self.nodes = {loc_id: node for node, loc_id in enumerate(self.ids)}
+        self.kinds = bytearray(STORY if isinstance(location, StoryEvent) else PUZZLE if isinstance(location, Puzzle)
+                               else PLAIN for location in locations.values())
+        self.location_names = [location.name for location in locations.values()]
+        self.codes = {}
+        self.commands = []
+        self.offsets = array('i', [0])
+        self.edge_code = array('i')
+        self.edge_target_id = array('q')
+        self.edge_target = array('i')
+        self.edge_move = bytearray()
+
+        # Whether each command moves, by code: for a location's own command, this only depends on its text.
+        code_moves = bytearray()
+        for location in locations.values():
+            commands = location.available_commands
+            for command, target_id in commands.items():
+                code = self.codes.get(command)
+                if code is None:
+                    code = self.codes[command] = len(self.commands)
+                    self.commands.append(command)
+                    code_moves.append(parse_command(command, commands).verb == MOVE)
+                target = self.nodes.get(target_id, MISSING)
+                self.edge_code.append(code)
+                self.edge_target_id.append(target_id)
+                self.edge_target.append(target)
+                self.edge_move.append(target != MISSING and code_moves[code])
+            self.offsets.append(len(self.edge_code))
+
+    def find_edge(self, node: int, command: str) -> int:
+        """Return the edge of the given command out of the given node, or MISSING if the node has no such command.
+        The command is interned to its code, which is then searched for in the node's row of edge_code.
+        """
+        code = self.codes.get(command)
+        if code is None:
+            return MISSING
+        try:
+            return self.edge_code.index(code, self.offsets[node], self.offsets[node + 1])
+        except ValueError:
+            return MISSING
+
+    def reachable(self, source_id: int, moves_only: bool = True) -> list[int]:
+        """Return the IDs of the locations reachable from the location with the given ID (itself included) by
+        following moves (or, if moves_only is False, any command), in breadth-first order.
+        """
+        offsets, edge_target, edge_move = self.offsets, self.edge_target, self.edge_move
+        seen = bytearray(len(self.ids))
+        queue = [self.nodes[source_id]]
+        seen[queue[0]] = 1
+        for node in queue:  # The queue grows while it is read.
+            start, end = offsets[node], offsets[node + 1]
+            for target, moves in zip(edge_target[start:end], edge_move[start:end]):
+                if target != MISSING and not seen[target] and (moves or not moves_only):
+                    seen[target] = 1
+                    queue.append(target)
+        return [self.ids[node] for node in queue]
+
+    def random_walk(self, source_id: int, steps: int, rng: Optional[random.Random] = None,
+                    moves_only: bool = True) -> list[int]:
+        """Return the IDs of the locations visited by following <steps> uniformly random moves (or, if moves_only
+        is False, commands leading to a location) from the location with the given ID, starting with it. The walk
+        stops early at a location with no such command.
+        """
+        rng = rng if rng is not None else random.Random()
+        offsets, edge_target, edge_move = self.offsets, self.edge_target, self.edge_move
+        # The targets each node visited can step to, gathered from its row the first time the walk reaches it.
+        choices_by_node = {}
+        node = self.nodes[source_id]
+        walk = [node]
+        for _ in range(steps):
+            choices = choices_by_node.get(node)
+            if choices is None:
+                start, end = offsets[node], offsets[node + 1]
+                choices = [target for target, moves in zip(edge_target[start:end], edge_move[start:end])
+                           if moves or not moves_only and target != MISSING]
+                choices_by_node[node] = choices
+            if not choices:
+                break
+            node = rng.choice(choices)
+            walk.append(node)
+        return [self.ids[node] for node in walk]
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
@@ -0,0 +1,186 @@
+"""CSC111 Project 1: Text Adventure Game - Item Registry
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the ItemRegistry class, which stores every Item in the game and
+indexes them by name and by position so that item commands do not scan the whole item list, and
+keeps the inventory as a bitmask over the items' dense indexes.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import copy
+from typing import Iterator, Optional
+
+from game_entities import Item
+
+INVENTORY = -1
+
+
+class ItemRegistry:
+    """All the items in a game, indexed by case-normalized name and by current position.
+
+    A registry is built over a list of template items, which it never modifies: an item is copied into the
+    registry's own overlay the first time it is moved (or explicitly owned). Registries made with overlay()
+    share the templates and indexes of the registry they were made from, so many games can share one world's
+    items while each only stores the items it has changed.
+
+    Instance Attributes:
+        - held_names:
+            The names of the items currently in the player's inventory.
+        - held_keys:
+            The lowercased names of the items currently in the player's inventory.
+        - held_mask:
+            The inventory as a bitmask: bit i is set if the item at index i (see index_of) is in it.
+
+    Representation Invariants:
+        - item names are unique ignoring case
+        - every item is at the position keyed by its current_position in exactly one of self._base_positions
+          (if it is not owned) or self._moved_at (if it is)
+        - self.held_names == {item.name for item in self if item.current_position == INVENTORY}
+        - self.held_keys == {name.lower() for name in self.held_names}
+        - self.held_mask == sum(1 << self.index_of(name) for name in self.held_names)
+    """
+    # Private Instance Attributes:
+    #   - _items: the template items, in the order they appear in the game data file (shared, read-only)
+    #   - _index: a mapping from lowercased item name to the item's position in _items (shared, read-only)
+    #   - _base_positions: a mapping from location ID (or INVENTORY) to the indexes in _items of the templates
+    #                      there (shared, read-only)
+    #   - _owned: this registry's copies of the items it has changed, by index in _items
+    #   - _moved_at: a mapping from location ID (or INVENTORY) to the indexes of the owned items there
+
+    held_names: set[str]
+    held_keys: set[str]
+    held_mask: int
+    _items: list[Item]
+    _index: dict[str, int]
+    _base_positions: dict[int, frozenset[int]]
+    _owned: dict[int, Item]
+    _moved_at: dict[int, set[int]]
+
+    def __init__(self, items: list[Item]) -> None:
+        """Initialize a new registry over the given template items, at their current positions."""
+        self._items = items
+        self._index = {}
+        positions = {}
+        for i, item in enumerate(items):
+            self._index.setdefault(item.name.lower(), i)
+            positions.setdefault(item.current_position, set()).add(i)
+        self._base_positions = {position: frozenset(indexes) for position, indexes in positions.items()}
+        self._owned = {}
+        self._moved_at = {}
+        self.held_names = {items[i].name for i in self._base_positions.get(INVENTORY, ())}
+        self.held_keys = {name.lower() for name in self.held_names}
+        self.held_mask = sum(1 << i for i in self._base_positions.get(INVENTORY, ()))
+
+    def overlay(self) -> ItemRegistry:
+        """Return a new registry over the same templates and indexes, with the items at their template
+        positions. The templates must not have been changed through this registry (i.e. it owns no items).
+        """
+        registry = copy.copy(self)
+        registry._owned = {}
+        registry._moved_at = {}
+        registry.held_names = set(self.held_names)
+        registry.held_keys = set(self.held_keys)
+        return registry
+
+    def __iter__(self) -> Iterator[Item]:
+        """Return an iterator over all items, in game data order."""
+        owned = self._owned
+        return (owned.get(i, item) for i, item in enumerate(self._items))
+
+    def __len__(self) -> int:
+        """Return the number of items in the game."""
+        return len(self._items)
+
+    def index_of(self, name: str) -> Optional[int]:
+        """Return the dense index (position in game data order) of the item with the given name, ignoring case,
+        or None if there is no such item.
+        """
+        return self._index.get(name.lower())
+
+    def get(self, name: str) -> Optional[Item]:
+        """Return the item with the given name, ignoring case, or None if there is no such item."""
+        i = self._index.get(name.lower())
+        if i is None:
+            return None
+        return self._owned.get(i) or self._items[i]
+
+    def own(self, item: Item) -> Item:
+        """Return this registry's own copy of the given item, copying the template first if needed.
+        Call this before changing any attribute of an item other than through move.
+        """
+        i = self._index[item.name.lower()]
+        owned = self._owned.get(i)
+        if owned is None:
+            owned = copy.copy(self._items[i])
+            self._owned[i] = owned
+            self._moved_at.setdefault(owned.current_position, set()).add(i)
+        return owned
+
+    def at(self, position: int) -> list[Item]:
+        """Return the items at the given location ID (or INVENTORY), in game data order."""
+        owned = self._owned
+        indexes = [i for i in self._base_positions.get(position, ()) if i not in owned]
+        indexes.extend(self._moved_at.get(position, ()))
+        indexes.sort()
+        return [owned.get(i) or self._items[i] for i in indexes]
+
+    def inventory(self) -> list[Item]:
+        """Return the items in the player's inventory, in game data order."""
+        return self.at(INVENTORY)
+
+    def moved(self) -> tuple[tuple[int, int], ...]:
+        """Return (index, current position) of every item this registry has moved away from its template position,
+        in index order. Together with the templates, this is the position of every item.
+        """
+        templates = self._items
+        return tuple((i, item.current_position) for i, item in sorted(self._owned.items())
+                     if item.current_position != templates[i].current_position)
+
+    def is_held(self, item: Item) -> bool:
+        """Return whether the given item is in the player's inventory."""
+        return item.current_position == INVENTORY
+
+    def move(self, item: Item, position: int) -> int:
+        """Move the given item to the given location ID (or INVENTORY) and return its previous position."""
+        i = self._index[item.name.lower()]
+        item = self.own(item)
+        previous = item.current_position
+        if previous != position:
+            indexes = self._moved_at[previous]
+            indexes.discard(i)
+            if not indexes:
+                del self._moved_at[previous]
+            item.current_position = position
+            self._moved_at.setdefault(position, set()).add(i)
+            if previous == INVENTORY:
+                self.held_names.discard(item.name)
+                self.held_keys.discard(item.name.lower())
+                self.held_mask &= ~(1 << i)
+            elif position == INVENTORY:
+                self.held_names.add(item.name)
+                self.held_keys.add(item.name.lower())
+                self.held_mask |= 1 << i
+        return previous
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
@@ -0,0 +1,168 @@
+"""CSC111 Project 1: Text Adventure Game - Event Journal
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the GameJournal class, an append-only file recording every turn of a
+game, which AdventureGame.recover replays to rebuild the game after a crash or restart. Records are
+written and fsynced in batches by a background thread, so playing a turn never waits for the disk.
+
+A journal is a UTF-8 JSON lines file. The first line is a header naming the game data file and the
+starting location; every other line is one turn:
+
+    {"id": 100, "command": "pick up wallet", "inputs": [], "delta": {"score": 10}}
+
+where id is the player's location after the turn, inputs are the lines read during the turn (for
+passwords and book searches) and delta holds the game attributes the turn changed, with their new
+values. Item positions and location flags are not stored: replaying the commands reproduces them.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import os
+from typing import Any
+
+from game_writer import BackgroundWriter
+
+JOURNAL_VERSION = 1
+DEFAULT_MAX_BATCH = 1024
+
+
+class JournalError(Exception):
+    """Raised when a journal cannot be read or does not match the game replaying it."""
+
+
+class GameJournal:
+    """An append-only journal of a game's turns, written to disk by a background thread.
+
+    append() only puts the record on the queue of a BackgroundWriter. Its thread takes everything waiting on the
+    queue (up to max_batch records), writes it as JSON lines, and then fsyncs once for the whole batch, so the more
+    turns arrive while a batch is being written, the fewer fsyncs each one costs.
+
+    Instance Attributes:
+        - path:
+            The path of the journal file.
+        - max_batch:
+            The most records written between two fsyncs.
+    """
+    # Private Instance Attributes:
+    #   - _writer: the writer of the journal file, opened for appending
+
+    path: str
+    max_batch: int
+    _writer: BackgroundWriter
+
+    def __init__(self, path: str, game_data_file: str, initial_location_id: int,
+                 max_batch: int = DEFAULT_MAX_BATCH) -> None:
+        """Open the journal at the given path for appending, starting it with a header for a game of the given
+        file and starting location if it is new or empty. A torn record left at the end of the file by a crash is
+        cut off first.
+        """
+        self.path = path
+        self.max_batch = max_batch
+        _truncate_torn_record(path)
+        file = open(path, 'a', encoding='utf-8')
+        if file.tell() == 0:
+            header = {'journal': JOURNAL_VERSION, 'game_data_file': game_data_file, 'start': initial_location_id}
+            file.write(json.dumps(header) + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        self._writer = BackgroundWriter(file, f'journal {path}', _format_record, fsync=True, max_batch=max_batch)
+
+    @property
+    def records_written(self) -> int:
+        """The number of turn records written to disk so far."""
+        return self._writer.records_written
+
+    @property
+    def batches_written(self) -> int:
+        """The number of batches (and so fsyncs) written to disk so far."""
+        return self._writer.batches_written
+
+    def append(self, id_num: int, command: str, inputs: list[str], delta: dict[str, Any]) -> None:
+        """Queue a turn record for writing, without waiting for it to be written.
+        The caller must not change inputs or delta afterwards.
+        """
+        if self._writer.error is not None:
+            raise JournalError(f'Journal {self.path} stopped writing') from self._writer.error
+        self._writer.put({'id': id_num, 'command': command, 'inputs': inputs, 'delta': delta})
+
+    def flush(self) -> None:
+        """Wait until every record appended so far is on disk."""
+        if not self._writer.flush():
+            raise JournalError(f'Journal {self.path} stopped writing') from self._writer.error
+
+    def close(self) -> None:
+        """Write every record appended so far, then stop the writer thread and close the file."""
+        self._writer.close()
+
+
+def _format_record(record: dict[str, Any]) -> str:
+    """Return the given turn record as a line of the journal."""
+    return json.dumps(record, separators=(',', ':'))
+
+
+def _truncate_torn_record(path: str) -> None:
+    """Cut off everything after the last newline of the file at the given path, if it exists."""
+    try:
+        with open(path, 'r+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b'\n')
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end != size:
+                f.truncate(end)
+    except FileNotFoundError:
+        pass
+
+
+def read_journal(path: str) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Return the header and the turn records of the journal at the given path.
+
+    A torn last line (from a crash in the middle of a write) is ignored; anything else that is not a valid
+    record raises JournalError.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    if lines and lines[-1] == '':
+        lines.pop()
+    elif lines:
+        lines.pop()  # Every complete record ends with a newline, so the last line was torn.
+
+    records = []
+    for line_number, line in enumerate(lines, 1):
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError as error:
+            raise JournalError(f'{path}:{line_number}: not a journal record') from error
+
+    if not records or records[0].get('journal') != JOURNAL_VERSION:
+        raise JournalError(f'{path} is not a version {JOURNAL_VERSION} game journal')
+    return records[0], records[1:]
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
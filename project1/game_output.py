@@ -0,0 +1,114 @@
+"""CSC111 Project 1: Text Adventure Game - Output Sinks
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the output sinks an AdventureGame shows its text through: StreamSink
+writes to a stream (the console by default), BufferedSink keeps the text in memory, and NullSink
+discards it. A game whose sink discards output skips building the text altogether, which is how
+simulations and servers run without paying for console output.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import sys
+from typing import Any, Optional, TextIO
+
+
+class OutputSink:
+    """Somewhere to send the text a game shows the player.
+
+    This is an abstract class. Subclasses implement write, and set discards to True if they throw
+    away what they are given.
+
+    Instance Attributes:
+        - discards:
+            Whether this sink throws its text away, so callers may skip building it.
+    """
+    discards: bool = False
+
+    def write(self, text: str) -> None:
+        """Show the given text, exactly as given."""
+        raise NotImplementedError
+
+    def print(self, *values: Any, sep: str = ' ', end: str = '\n') -> None:
+        """Show the given values the way the built-in print would."""
+        self.write(sep.join(map(str, values)) + end)
+
+
+class NullSink(OutputSink):
+    """A sink that discards everything."""
+    discards = True
+
+    def write(self, text: str) -> None:
+        """Discard the given text."""
+
+    def print(self, *values: Any, sep: str = ' ', end: str = '\n') -> None:
+        """Discard the given values without formatting them."""
+
+
+class BufferedSink(OutputSink):
+    """A sink that keeps everything in memory until it is taken.
+
+    Instance Attributes:
+        - chunks:
+            The text written since the sink was created or last taken from, in order.
+    """
+    chunks: list[str]
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self.chunks = []
+
+    def write(self, text: str) -> None:
+        """Add the given text to the buffer."""
+        self.chunks.append(text)
+
+    def getvalue(self) -> str:
+        """Return all the text in the buffer."""
+        return ''.join(self.chunks)
+
+    def take(self) -> str:
+        """Return all the text in the buffer and empty it."""
+        text = ''.join(self.chunks)
+        self.chunks.clear()
+        return text
+
+
+class StreamSink(OutputSink):
+    """A sink that writes to a text stream.
+
+    Instance Attributes:
+        - stream:
+            The stream written to, or None to write to whatever sys.stdout is at the time of each write
+            (so contextlib.redirect_stdout still captures the game's output).
+    """
+    stream: Optional[TextIO]
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        """Initialize a sink writing to the given stream, or to sys.stdout if it is None."""
+        self.stream = stream
+
+    def write(self, text: str) -> None:
+        """Write the given text to the stream."""
+        (self.stream or sys.stdout).write(text)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
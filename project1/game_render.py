@@ -0,0 +1,96 @@
+"""CSC111 Project 1: Text Adventure Game - Render Cache
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the RenderCache class, a bounded least-recently-used cache of the
+wrapped text of location descriptions, so that showing a description again does not wrap it again.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class RenderCache:
+    """A bounded cache of rendered text, evicting the least recently used entry when full.
+
+    Keys identify what was rendered and how, e.g. (location ID, 'brief', wrap width); the cached text must
+    depend only on the key.
+
+    Instance Attributes:
+        - max_entries:
+            The most entries the cache holds.
+        - hits:
+            The number of lookups answered from the cache.
+        - misses:
+            The number of lookups that had to render the text.
+
+    Representation Invariants:
+        - self.max_entries > 0
+        - len(self) <= self.max_entries
+        - self.hits >= 0 and self.misses >= 0
+    """
+    # Private Instance Attributes:
+    #   - _entries: the cached text by key, least recently used first
+
+    max_entries: int
+    hits: int
+    misses: int
+    _entries: OrderedDict[Hashable, str]
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        """Initialize an empty cache holding at most max_entries entries."""
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of entries in the cache."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, render: Callable[[], str]) -> str:
+        """Return the text cached under key, calling render() to produce (and cache) it if it is not cached."""
+        entries = self._entries
+        text = entries.get(key)
+        if text is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return text
+
+        self.misses += 1
+        text = render()
+        entries[key] = text
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+        return text
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
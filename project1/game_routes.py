@@ -0,0 +1,260 @@
+"""CSC111 Project 1: Text Adventure Game - Routes
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the route index behind the route and goto commands: RouteGraph holds
+the moves of a world's compiled WorldGraph in compact arrays, and RouteIndex answers shortest-route
+queries over it from per-destination next-hop tables, kept up to date as locations are unlocked.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import copy
+from array import array
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from game_graph import STORY, WorldGraph
+
+DEFAULT_MAX_ROWS = 128
+
+# A distance or next hop that does not exist.
+UNREACHABLE = -1
+
+
+class RouteGraph:
+    """The moves between the locations of a world, with the locations numbered as in its WorldGraph.
+
+    A move is one of a location's available_commands that the adventure.py main loop treats as moving (so not
+    e.g. "password" or "inquire"), to a location of the world (see WorldGraph.edge_move). The moves out of node u
+    are the edges edge_start[u] to edge_start[u + 1] - 1, and incoming lists the edges into each node the same way.
+
+    Instance Attributes:
+        - ids:
+            The location ID of each node.
+        - nodes:
+            A mapping from location ID to node.
+        - names:
+            A mapping from lowercased location name to location ID (the first location in world order with
+            that name, preferring locations to story events).
+        - story_nodes:
+            1 for each node that is a story event (which routes never pass through), 0 otherwise.
+        - edge_start, edge_source, edge_target, edge_command:
+            The moves, grouped by source node: the node each starts from and goes to, and its command.
+        - incoming_start, incoming:
+            The indexes of the moves into each node, grouped by target node.
+
+    Representation Invariants:
+        - len(self.ids) == len(self.nodes) == len(self.story_nodes)
+        - len(self.edge_start) == len(self.incoming_start) == len(self.ids) + 1
+        - len(self.edge_source) == len(self.edge_target) == len(self.edge_command) == len(self.incoming)
+    """
+    ids: array
+    nodes: dict[int, int]
+    names: dict[str, int]
+    story_nodes: bytearray
+    edge_start: array
+    edge_source: array
+    edge_target: array
+    edge_command: list[str]
+    incoming_start: array
+    incoming: array
+
+    def __init__(self, graph: WorldGraph) -> None:
+        """Build the graph of the moves in the given compiled world."""
+        self.ids = graph.ids
+        self.nodes = graph.nodes
+        self.names = {}
+        self.story_nodes = bytearray(kind == STORY for kind in graph.kinds)
+        self.edge_start = array('i', [0])
+        self.edge_source = array('i')
+        self.edge_target = array('i')
+        self.edge_command = []
+
+        story_names = {}
+        for node, name in enumerate(graph.location_names):
+            names = self.names if graph.kinds[node] != STORY else story_names
+            names.setdefault(name.lower(), graph.ids[node])
+            for edge in range(graph.offsets[node], graph.offsets[node + 1]):
+                if graph.edge_move[edge]:
+                    self.edge_source.append(node)
+                    self.edge_target.append(graph.edge_target[edge])
+                    self.edge_command.append(graph.commands[graph.edge_code[edge]])
+            self.edge_start.append(len(self.edge_target))
+        for name, loc_id in story_names.items():
+            self.names.setdefault(name, loc_id)
+
+        # Group the edges by target node with a counting sort.
+        counts = array('i', [0]) * (len(self.ids) + 1)
+        for target in self.edge_target:
+            counts[target + 1] += 1
+        for node in range(len(self.ids)):
+            counts[node + 1] += counts[node]
+        self.incoming_start = array('i', counts)
+        self.incoming = array('i', [0]) * len(self.edge_target)
+        for edge, target in enumerate(self.edge_target):
+            self.incoming[counts[target]] = edge
+            counts[target] += 1
+
+    def find(self, destination: str) -> Optional[int]:
+        """Return the ID of the location the given (lowercased) location ID or name refers to, or None."""
+        if destination.isdigit():
+            loc_id = int(destination)
+            return loc_id if loc_id in self.nodes else None
+        return self.names.get(destination)
+
+
+class RouteIndex:
+    """Shortest routes (fewest moves) between the locations of a RouteGraph.
+
+    Routes never pass through a story event or a locked location, but may start or end at one. The index keeps,
+    for each destination asked about, the distance from every node to it and the first move to make (the
+    next hop), computed by one breadth-first search backwards from the destination. Of the moves that start a
+    shortest route, the next hop is always the one listed first, so the same game state always gives the same
+    routes. With max_rows at least the number of locations, the index is the full all-pairs next-hop matrix.
+
+    Instance Attributes:
+        - graph:
+            The moves between the locations.
+        - max_rows:
+            The most destinations whose tables are kept, least recently used dropped first.
+        - rows_built:
+            The number of destination tables computed from scratch.
+        - rows_repaired:
+            The number of destination tables updated in place when a location was unlocked.
+
+    Representation Invariants:
+        - self.max_rows > 0
+        - len(self._rows) <= self.max_rows
+    """
+    # Private Instance Attributes:
+    #   - _passable: 1 for each node a route may pass through (not a story event and not locked), 0 otherwise
+    #   - _rows: (distances, next hops) by destination node, least recently used first
+
+    graph: RouteGraph
+    max_rows: int
+    rows_built: int
+    rows_repaired: int
+    _passable: bytearray
+    _rows: OrderedDict[int, tuple[array, array]]
+
+    def __init__(self, graph: RouteGraph, locked: Iterable[int] = (), max_rows: int = DEFAULT_MAX_ROWS) -> None:
+        """Initialize an index over the given graph, with the locations of the given IDs locked."""
+        self.graph = graph
+        self.max_rows = max_rows
+        self.rows_built = 0
+        self.rows_repaired = 0
+        self._passable = bytearray(1 - story for story in graph.story_nodes)
+        for loc_id in locked:
+            self._passable[graph.nodes[loc_id]] = 0
+        self._rows = OrderedDict()
+
+    def copy(self) -> RouteIndex:
+        """Return an index over the same graph with the same locked locations and its own copy of every table."""
+        index = copy.copy(self)
+        index._passable = bytearray(self._passable)
+        index._rows = OrderedDict((target, (array('i', distances), array('i', hops)))
+                                  for target, (distances, hops) in self._rows.items())
+        return index
+
+    def route(self, source_id: int, target_id: int) -> Optional[list[tuple[str, int]]]:
+        """Return the moves of a shortest route between the locations of the given IDs, as (command, ID of the
+        location it leads to) pairs, or None if there is no route.
+        """
+        graph = self.graph
+        node = graph.nodes[source_id]
+        target = graph.nodes[target_id]
+        hops = self._row(target)[1]
+        moves = []
+        while node != target:
+            edge = hops[node]
+            if edge == UNREACHABLE:
+                return None
+            node = graph.edge_target[edge]
+            moves.append((graph.edge_command[edge], graph.ids[node]))
+        return moves
+
+    def distance(self, source_id: int, target_id: int) -> int:
+        """Return the number of moves of a shortest route between the locations of the given IDs, or UNREACHABLE."""
+        return self._row(self.graph.nodes[target_id])[0][self.graph.nodes[source_id]]
+
+    def build_all(self) -> None:
+        """Compute the table of every destination, keeping them all."""
+        self.max_rows = max(self.max_rows, len(self.graph.ids))
+        for target in range(len(self.graph.ids)):
+            self._row(target)
+
+    def unlock(self, loc_id: int) -> None:
+        """Let routes pass through the location of the given ID, updating the kept tables in place: only the
+        nodes that get closer to a destination through that location are revisited.
+        """
+        node = self.graph.nodes[loc_id]
+        if self._passable[node] or self.graph.story_nodes[node]:
+            return
+        self._passable[node] = 1
+        for target, (distances, hops) in self._rows.items():
+            if node != target and distances[node] != UNREACHABLE:
+                self._relax_from(target, [node], distances, hops)
+                self.rows_repaired += 1
+
+    def _row(self, target: int) -> tuple[array, array]:
+        """Return the distances and next hops to the given destination node, computing them if needed."""
+        rows = self._rows
+        row = rows.get(target)
+        if row is not None:
+            rows.move_to_end(target)
+            return row
+
+        size = len(self.graph.ids)
+        distances = array('i', [UNREACHABLE]) * size
+        hops = array('i', [UNREACHABLE]) * size
+        distances[target] = 0
+        self._relax_from(target, [target], distances, hops)
+        self.rows_built += 1
+        row = rows[target] = (distances, hops)
+        if len(rows) > self.max_rows:
+            rows.popitem(last=False)
+        return row
+
+    def _relax_from(self, target: int, queue: list[int], distances: array, hops: array) -> None:
+        """Search backwards from the nodes in queue (whose distances to target are correct), lowering the
+        distance of every node that can get closer through them, and keeping the first-listed move of the shortest
+        routes as each node's next hop.
+        """
+        graph = self.graph
+        passable = self._passable
+        incoming_start, incoming, edge_source = graph.incoming_start, graph.incoming, graph.edge_source
+        for node in queue:  # The queue grows while it is read, in order of distance.
+            if node != target and not passable[node]:
+                continue
+            distance = distances[node] + 1
+            for i in range(incoming_start[node], incoming_start[node + 1]):
+                edge = incoming[i]
+                source = edge_source[edge]
+                if distances[source] == UNREACHABLE or distance < distances[source]:
+                    distances[source] = distance
+                    hops[source] = edge
+                    queue.append(source)
+                elif distance == distances[source] and edge < hops[source]:
+                    hops[source] = edge
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
@@ -0,0 +1,307 @@
+"""CSC111 Project 1: Text Adventure Game - Save Files
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module reads and writes save files, which hold everything about a game in progress that
+differs from its freshly loaded world: the game's attributes, item positions, location flags, the
+undo journal and the event log. AdventureGame.save_game and AdventureGame.load_game use it.
+
+A save file is little-endian binary: a header (magic, format version, SHA-256 of the game data
+file), a table of every string in the save, then the scalar attributes and a series of arrays, each
+stored as its array typecode, its length and its raw items. Strings are stored once in the table
+and referred to by index everywhere else. The game data file is stored relative to the directory of
+the save file, so a save can be loaded from any working directory.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from proj1_event_logger import Event
+
+SAVE_VERSION = 1
+
+_MAGIC = b'CSC111SV'
+_HEADER = struct.Struct('<8sH32s')
+# game_data_file, current_objective (string indexes), score, current_time, current_location_id, ongoing, debug_mode
+_SCALARS = struct.Struct('<IIqqq??')
+_ARRAY_HEADER = struct.Struct('<cQ')
+
+# Flags in SavedGame.location_flags.
+VISITED = 1
+LOOKED = 2
+LOCKED = 4
+
+# Kinds of undo journal entries in SavedGame.undo_kinds, in the order of AdventureGame's journal kinds.
+UNDO_KINDS = ('item', 'visited', 'looked')
+
+# Flags saved for each event, saying which optional fields it has.
+_HAS_SNAPSHOT = 1
+_HAS_ITEM_PREV_LOCATION = 2
+_HAS_SCORE_CHANGE = 4
+
+# No string (None) in a string index array.
+_NO_STRING = -1
+
+
+class SaveFileError(Exception):
+    """Raised when a save file cannot be read, or does not belong to the game loading it."""
+
+
+@dataclass
+class SavedGame:
+    """Everything a save file holds.
+
+    Instance Attributes:
+        - game_data_file:
+            The game data file the game was loaded from. read_save resolves it from the save file's directory,
+            whatever the working directory was when the game was saved.
+        - world_digest:
+            The SHA-256 (hex) of the contents of game_data_file when the game was saved.
+        - score, current_time, current_location_id, current_objective, ongoing, debug_mode:
+            The game's attributes of the same names.
+        - item_positions:
+            The current_position of every item, in game data order.
+        - item_start_positions:
+            The start_position of every item, in game data order (picking an item up for the first time
+            changes it).
+        - location_ids:
+            The IDs of the locations whose flags are saved.
+        - location_flags:
+            The VISITED, LOOKED and LOCKED flags of each location in location_ids.
+        - undo_kinds, undo_keys, undo_values:
+            The undo journal, one entry per index: the index in UNDO_KINDS of the entry's kind, its key (an
+            item's index in game data order, or a location ID) and its old value.
+        - events:
+            Copies of the events of the event log, in order, linked to no other event (see EventList.copy_events).
+
+    Representation Invariants:
+        - len(self.item_positions) == len(self.item_start_positions)
+        - len(self.location_ids) == len(self.location_flags)
+        - len(self.undo_kinds) == len(self.undo_keys) == len(self.undo_values)
+    """
+    game_data_file: str
+    world_digest: str
+    score: int
+    current_time: int
+    current_location_id: int
+    current_objective: str
+    ongoing: bool
+    debug_mode: bool
+    item_positions: array
+    item_start_positions: array
+    location_ids: array
+    location_flags: array
+    undo_kinds: array
+    undo_keys: array
+    undo_values: array
+    events: list[Event]
+
+
+class _StringTable:
+    """The strings of a save file being written, each given an index the first time it is added."""
+    strings: list[str]
+    indexes: dict[str, int]
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self.strings = []
+        self.indexes = {}
+
+    def add(self, text: Optional[str]) -> int:
+        """Return the index of the given string, adding it if needed, or _NO_STRING for None."""
+        if text is None:
+            return _NO_STRING
+        index = self.indexes.get(text)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(text)
+            self.indexes[text] = index
+        return index
+
+
+def write_save(path: str, saved: SavedGame) -> int:
+    """Write the given game to a save file at the given path and return its size in bytes."""
+    strings = _StringTable()
+    game_data_file = strings.add(_relative_path(saved.game_data_file, path))
+    objective = strings.add(saved.current_objective)
+
+    events = saved.events
+    event_ids = array('q', (event.id_num for event in events))
+    descriptions = array('i', (strings.add(str(event.description)) for event in events))
+    commands = array('i', (strings.add(_command_text(event.next_command)) for event in events))
+    items_affected = array('i', (strings.add(event.item_affected) for event in events))
+    # Optional fields are only stored for the events that have them, in event order.
+    item_prev_locations = array('q', (event.item_prev_location for event in events
+                                      if event.item_prev_location is not None))
+    score_changes = array('q', (event.score_change for event in events if event.score_change is not None))
+    flags = array('B')
+    snapshot_columns = [array('q') for _ in range(4)]  # score, current_time, current_location_id, journal_length
+    snapshot_objectives = array('i')
+    snapshot_ongoing = array('B')
+    for event in events:
+        snapshot = event.state_snapshot
+        flags.append((_HAS_SNAPSHOT if snapshot else 0)
+                     | (_HAS_ITEM_PREV_LOCATION if event.item_prev_location is not None else 0)
+                     | (_HAS_SCORE_CHANGE if event.score_change is not None else 0))
+        if snapshot:
+            snapshot_columns[0].append(snapshot['score'])
+            snapshot_columns[1].append(snapshot['current_time'])
+            snapshot_columns[2].append(snapshot['current_location_id'])
+            snapshot_columns[3].append(snapshot['journal_length'])
+            snapshot_objectives.append(strings.add(snapshot['current_objective']))
+            snapshot_ongoing.append(snapshot['ongoing'])
+
+    encoded = [text.encode('utf-8') for text in strings.strings]
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, SAVE_VERSION, bytes.fromhex(saved.world_digest)))
+        _write_array(f, array('Q', (len(data) for data in encoded)))
+        f.write(b''.join(encoded))
+        f.write(_SCALARS.pack(game_data_file, objective, saved.score, saved.current_time,
+                              saved.current_location_id, saved.ongoing, saved.debug_mode))
+        for arr in (saved.item_positions, saved.item_start_positions, saved.location_ids, saved.location_flags,
+                    saved.undo_kinds, saved.undo_keys, saved.undo_values,
+                    event_ids, descriptions, commands, items_affected, item_prev_locations, score_changes, flags,
+                    *snapshot_columns, snapshot_objectives, snapshot_ongoing):
+            _write_array(f, arr)
+        return f.tell()
+
+
+def read_save(path: str) -> SavedGame:
+    """Return the game saved in the save file at the given path."""
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size or header[:len(_MAGIC)] != _MAGIC:
+            raise SaveFileError(f'{path} is not a save file')
+        _, version, digest = _HEADER.unpack(header)
+        if version != SAVE_VERSION:
+            raise SaveFileError(f'{path} is a version {version} save file; only version {SAVE_VERSION} is supported')
+
+        lengths = _read_array(f, path)
+        blob = f.read(sum(lengths))
+        strings = []
+        offset = 0
+        for length in lengths:
+            strings.append(blob[offset:offset + length].decode('utf-8'))
+            offset += length
+
+        scalars = f.read(_SCALARS.size)
+        if len(scalars) != _SCALARS.size:
+            raise SaveFileError(f'{path} is truncated')
+        game_data_file, objective, score, current_time, current_location_id, ongoing, debug_mode = \
+            _SCALARS.unpack(scalars)
+        (item_positions, item_start_positions, location_ids, location_flags, undo_kinds, undo_keys, undo_values,
+         event_ids, descriptions, commands, items_affected, item_prev_locations, score_changes, flags,
+         snapshot_scores, snapshot_times, snapshot_locations, snapshot_journal_lengths, snapshot_objectives,
+         snapshot_ongoing) = (_read_array(f, path) for _ in range(20))
+
+    def string(index: int) -> Optional[str]:
+        """Return the string at the given index of the table, or None for _NO_STRING."""
+        return None if index == _NO_STRING else strings[index]
+
+    events = []
+    snapshot_index = item_prev_location_index = score_change_index = 0
+    for i, event_id in enumerate(event_ids):
+        item_prev_location = score_change = None
+        if flags[i] & _HAS_ITEM_PREV_LOCATION:
+            item_prev_location = item_prev_locations[item_prev_location_index]
+            item_prev_location_index += 1
+        if flags[i] & _HAS_SCORE_CHANGE:
+            score_change = score_changes[score_change_index]
+            score_change_index += 1
+        snapshot = {}
+        if flags[i] & _HAS_SNAPSHOT:
+            snapshot = {
+                'score': snapshot_scores[snapshot_index],
+                'current_time': snapshot_times[snapshot_index],
+                'current_location_id': snapshot_locations[snapshot_index],
+                'current_objective': strings[snapshot_objectives[snapshot_index]],
+                'ongoing': bool(snapshot_ongoing[snapshot_index]),
+                'journal_length': snapshot_journal_lengths[snapshot_index]
+            }
+            snapshot_index += 1
+        events.append(Event(
+            id_num=event_id,
+            description=strings[descriptions[i]],
+            next_command=string(commands[i]),
+            next=None,
+            prev=None,
+            state_snapshot=snapshot,
+            item_affected=string(items_affected[i]),
+            item_prev_location=item_prev_location,
+            score_change=score_change
+        ))
+
+    return SavedGame(os.path.normpath(os.path.join(os.path.dirname(path), strings[game_data_file])), digest.hex(),
+                     score, current_time, current_location_id, strings[objective], ongoing, debug_mode, item_positions,
+                     item_start_positions, location_ids, location_flags, undo_kinds, undo_keys, undo_values, events)
+
+
+def _relative_path(game_data_file: str, save_file: str) -> str:
+    """Return the path of the given game data file relative to the directory of the given save file, or its
+    absolute path if it has no relative path (e.g. on another drive).
+    """
+    game_data_file = os.path.abspath(game_data_file)
+    try:
+        return os.path.relpath(game_data_file, os.path.dirname(os.path.abspath(save_file)))
+    except ValueError:
+        return game_data_file
+
+
+def _command_text(command: object) -> Optional[str]:
+    """Return the given event command as saved: None stays None, and anything else is saved as a string."""
+    return None if command is None else str(command)
+
+
+def _write_array(f: BinaryIO, arr: array) -> None:
+    """Write the given array to f as its typecode, its length and its items in little-endian order."""
+    f.write(_ARRAY_HEADER.pack(arr.typecode.encode('ascii'), len(arr)))
+    if sys.byteorder == 'big':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    f.write(arr.tobytes())
+
+
+def _read_array(f: BinaryIO, path: str) -> array:
+    """Read an array written by _write_array from f."""
+    header = f.read(_ARRAY_HEADER.size)
+    if len(header) != _ARRAY_HEADER.size:
+        raise SaveFileError(f'{path} is truncated')
+    typecode, length = _ARRAY_HEADER.unpack(header)
+    try:
+        arr = array(typecode.decode('ascii'))
+    except ValueError as error:
+        raise SaveFileError(f'{path} has an array of unknown type {typecode!r}') from error
+    data = f.read(length * arr.itemsize)
+    if len(data) != length * arr.itemsize:
+        raise SaveFileError(f'{path} is truncated')
+    arr.frombytes(data)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return arr
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
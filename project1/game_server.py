@@ -0,0 +1,213 @@
+"""CSC111 Project 1: Text Adventure Game - Multiplayer Server
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module runs many games at once in one process, one per connected player, over a line
+protocol on a local TCP or Unix socket. The game world is loaded once and shared by every session;
+each session only stores what its player has changed (see AdventureGame).
+
+    python game_server.py [--data game_data.json] [--start 1] [--host 127.0.0.1] [--port 4111]
+    python game_server.py [--data game_data.json] [--start 1] --unix /tmp/adventure.sock
+
+Each line a client sends is one command (or the answer to a password/book search prompt). The server
+replies with the game's output, always ending with a prompt that does not end in a newline, exactly
+as the game looks in a terminal. The connection is closed when the game ends.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import contextlib
+from typing import Optional
+
+from adventure import AdventureGame
+from game_commands import PASSWORD, BOOK_SEARCH
+from game_entities import Puzzle
+from game_output import BufferedSink
+from game_world import load_world
+from proj1_event_logger import ArrayEventList, EventList
+
+PROMPT = "\nEnter action: "
+INPUT_PROMPTS = {PASSWORD: "Enter the password: ", BOOK_SEARCH: "Enter section to search: "}
+OUTLINE_MESSAGE = "The Library of Congress outline is in loc_outline.pdf, next to the game."
+
+
+class GameSession:
+    """One player's game on a GameServer.
+
+    Instance Attributes:
+        - game:
+            The player's game.
+        - game_log:
+            The player's event log.
+        - output:
+            The buffer the game's output collects in until it is sent to the player.
+    """
+    game: AdventureGame
+    game_log: EventList
+    output: BufferedSink
+
+    def __init__(self, game_data_file: str, initial_location_id: int) -> None:
+        """Start a new game from the given game data file at the given location."""
+        self.output = BufferedSink()
+        self.game = AdventureGame(game_data_file, initial_location_id, self.output)
+        self.game_log = ArrayEventList()
+        self.game.open_outline = lambda: self.output.print(OUTLINE_MESSAGE)
+
+    def show_actions(self) -> str:
+        """Return what the game shows before prompting for a command, followed by the prompt."""
+        self._print_actions()
+        return self.output.take() + PROMPT
+
+    def input_prompt(self, choice: str) -> Optional[str]:
+        """Return the prompt for the extra line of input the given command reads, or None if it reads none."""
+        verb = self.game.parse(choice).verb
+        if verb in INPUT_PROMPTS and isinstance(self.game.get_location(), Puzzle):
+            return INPUT_PROMPTS[verb]
+        return None
+
+    def is_valid(self, choice: str) -> bool:
+        """Return whether the given (lowercased, stripped) command is accepted at the current location."""
+        return self.game.is_valid_command(choice)
+
+    def play(self, choice: str, extra_input: Optional[str] = None) -> str:
+        """Play the given valid command, answering any prompt it makes with extra_input, and return the output.
+        The output ends with the next prompt if the game is still ongoing.
+        """
+        self.output.print("========")
+        self.output.print("You decided to:", choice)
+        self.game.read_input = lambda _prompt: extra_input or ""
+        self.game.play_turn(choice, self.game_log)
+
+        output = self.output.take()
+        if self.game.ongoing:
+            output += self.show_actions()
+        return output
+
+    def show_error(self, error: Exception) -> str:
+        """Return the output of a command that raised the given error: what it showed before failing, a line
+        describing the error and, if the game is still ongoing, the next prompt.
+        """
+        self.output.print(f"That command failed ({type(error).__name__}: {error}). Try again.")
+        output = self.output.take()
+        if self.game.ongoing:
+            output += self.show_actions()
+        return output
+
+    def _print_actions(self) -> None:
+        """Print the debug information and available actions, as the main loop of adventure.py does."""
+        game = self.game
+        if game.debug_mode:
+            self.output.print(f"[DEBUG] Current location: {game.current_location_id}")
+            self.output.print(f"[DEBUG] Items here: {[item.name for item in game.get_current_location_items()]}")
+        game.display_available_actions()
+
+
+class GameServer:
+    """A server hosting one GameSession per connected client, all sharing one loaded world.
+
+    Instance Attributes:
+        - game_data_file:
+            The game data file every session is loaded from.
+        - initial_location_id:
+            The location every session starts at.
+        - sessions:
+            The number of sessions currently connected.
+    """
+    game_data_file: str
+    initial_location_id: int
+    sessions: int
+
+    def __init__(self, game_data_file: str, initial_location_id: int) -> None:
+        """Initialize a server for the given game, loading its world up front."""
+        self.game_data_file = game_data_file
+        self.initial_location_id = initial_location_id
+        self.sessions = 0
+        load_world(game_data_file)
+
+    async def serve_tcp(self, host: str, port: int) -> None:
+        """Accept players on the given TCP address until cancelled."""
+        server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_unix(self, path: str) -> None:
+        """Accept players on the Unix socket at the given path until cancelled."""
+        server = await asyncio.start_unix_server(self.handle_client, path)
+        async with server:
+            await server.serve_forever()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Play one game with the connected client, until the game ends or the client disconnects."""
+        self.sessions += 1
+        try:
+            session = GameSession(self.game_data_file, self.initial_location_id)
+            writer.write(session.show_actions().encode('utf-8'))
+            while session.game.ongoing:
+                await writer.drain()
+                line = await reader.readline()
+                if not line:
+                    break
+                choice = line.decode('utf-8', errors='replace').lower().strip()
+                if not session.is_valid(choice):
+                    writer.write(("Invalid option. Try again.\n" + PROMPT).encode('utf-8'))
+                    continue
+
+                extra_input = None
+                prompt = session.input_prompt(choice)
+                if prompt is not None:
+                    writer.write(prompt.encode('utf-8'))
+                    await writer.drain()
+                    extra_input = (await reader.readline()).decode('utf-8', errors='replace')
+                try:
+                    output = session.play(choice, extra_input)
+                except Exception as error:  # pylint: disable=broad-exception-caught
+                    # Some commands the prompt accepts still fail in the engine; that must not end the session.
+                    output = session.show_error(error)
+                writer.write(output.encode('utf-8'))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
+    parser = argparse.ArgumentParser(description='Host many text adventure games in one process.')
+    parser.add_argument('--data', default='game_data.json', help='game data file')
+    parser.add_argument('--start', type=int, default=1, help='starting location ID')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=4111)
+    parser.add_argument('--unix', help='serve on this Unix socket path instead of TCP')
+    args = parser.parse_args()
+
+    game_server = GameServer(args.data, args.start)
+    try:
+        if args.unix:
+            asyncio.run(game_server.serve_unix(args.unix))
+        else:
+            asyncio.run(game_server.serve_tcp(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
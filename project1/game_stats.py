@@ -0,0 +1,241 @@
+"""CSC111 Project 1: Text Adventure Game - Instrumentation
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains GameStats, which measures where an AdventureGame spends its time: the
+wall time of each command by type, of the phases of a turn (dispatching the command, moving,
+checking story triggers, visiting the resulting location and snapshotting the state for undo),
+counters such as condition evaluations and snapshot sizes, and optionally a cProfile capture of
+the turns played. In the game, the "stats" command turns it on and shows it, and "toggleprofile"
+starts and stops profiling.
+
+GameStats is told about a game by the game itself: AdventureGame calls its start_turn, end_turn,
+end_phase, count and add_snapshot hooks at the points it measures, only while stats are attached,
+so a game without stats pays one check of its stats attribute at each of those points.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import cProfile
+import io
+import pstats
+import sys
+import time
+from typing import Any, Optional
+
+from game_commands import MENU, Command
+
+# The phases of a turn. Dispatch includes the moves and snapshots made while running the command. A goto command
+# is not a phase of its own: each of its moves is timed like the phases of any other turn.
+PHASES = ('dispatch', 'move', 'triggers', 'visit', 'snapshot')
+
+COUNTERS = ('turns', 'condition evaluations', 'unlock checks', 'snapshots', 'snapshot bytes')
+
+# The number of histogram buckets: bucket i holds the times below 2 ** i microseconds (and at least half that).
+NUM_BUCKETS = 32
+
+# The number of functions listed when a profile is shown.
+PROFILE_LINES = 15
+
+
+class Histogram:
+    """A histogram of wall times, in power-of-two buckets of microseconds.
+
+    Instance Attributes:
+        - count:
+            The number of times recorded.
+        - total:
+            Their sum, in seconds.
+        - max:
+            The longest of them, in seconds.
+        - buckets:
+            The number of times in each bucket: bucket 0 holds those under 1 microsecond, and bucket i > 0 those
+            from 2 ** (i - 1) up to 2 ** i microseconds. The last bucket also holds every longer time.
+
+    Representation Invariants:
+        - self.count == sum(self.buckets)
+        - len(self.buckets) == NUM_BUCKETS
+    """
+    count: int
+    total: float
+    max: float
+    buckets: list[int]
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * NUM_BUCKETS
+
+    def add(self, seconds: float) -> None:
+        """Record the given time, in seconds."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[min(int(seconds * 1e6).bit_length(), NUM_BUCKETS - 1)] += 1
+
+    def mean(self) -> float:
+        """Return the mean of the recorded times in seconds, or 0.0 if there are none."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """Return an upper bound in seconds on the given fraction (between 0 and 1) of the recorded times: the upper
+        end of the bucket holding that percentile, or the maximum if that is smaller.
+        """
+        rank = fraction * self.count
+        seen = 0
+        for i, size in enumerate(self.buckets):
+            seen += size
+            if size and seen >= rank:
+                return min(2 ** i / 1e6, self.max)
+        return self.max
+
+
+class GameStats:
+    """The timings and counters of a game, recorded while it is attached to the game.
+
+    Only the turns the player plays are turns here: the moves a goto command plays as turns of their own count
+    towards the goto turn.
+
+    Instance Attributes:
+        - commands:
+            The histogram of the wall time of each turn by type of command: the menu command itself (e.g. "look"),
+            or the verb of any other command (e.g. "move", "pick up" or "goto").
+        - phases:
+            The histogram of the wall time of each phase of PHASES.
+        - counters:
+            The count of each event in COUNTERS.
+        - profile:
+            The profile collecting the turns played, or None if profiling is off.
+
+    Representation Invariants:
+        - set(self.phases) == set(PHASES)
+        - set(self.counters) == set(COUNTERS)
+    """
+    # Private Instance Attributes:
+    #   - _turn_profile: the profile enabled for the turn being played, or None
+
+    commands: dict[str, Histogram]
+    phases: dict[str, Histogram]
+    counters: dict[str, int]
+    profile: Optional[cProfile.Profile]
+    _turn_profile: Optional[cProfile.Profile]
+
+    def __init__(self) -> None:
+        """Initialize empty stats, attached to no game."""
+        self.commands = {}
+        self.phases = {phase: Histogram() for phase in PHASES}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.profile = None
+        self._turn_profile = None
+
+    def attach(self, game: Any) -> None:
+        """Start recording the given AdventureGame, which must have no stats attached."""
+        game.stats = self
+
+    def detach(self, game: Any) -> None:
+        """Stop recording the given AdventureGame, which must have these stats attached, and stop profiling."""
+        self.stop_profile()
+        game.stats = None
+
+    def start_turn(self) -> float:
+        """Start a turn the player plays, profiling it if profiling is on, and return its start time (for
+        end_turn).
+        """
+        self.counters['turns'] += 1
+        self._turn_profile = self.profile
+        start = time.perf_counter()
+        if self._turn_profile is not None:
+            self._turn_profile.enable()
+        return start
+
+    def end_turn(self, choice: str, command: Command, start: float) -> None:
+        """End the turn started at the given time, recording its time under the type of its command: the given
+        choice, as parsed at the start of the turn.
+        """
+        if self._turn_profile is not None:
+            self._turn_profile.disable()
+            self._turn_profile = None
+        elapsed = time.perf_counter() - start
+        kind = choice if command.verb == MENU else command.verb
+        histogram = self.commands.get(kind)
+        if histogram is None:
+            histogram = self.commands[kind] = Histogram()
+        histogram.add(elapsed)
+
+    def end_phase(self, phase: str, start: float) -> float:
+        """Record the time since the given start time as the given phase of PHASES, and return the time now (the
+        start of the next phase).
+        """
+        now = time.perf_counter()
+        self.phases[phase].add(now - start)
+        return now
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Add the given amount to the given counter of COUNTERS."""
+        self.counters[counter] += amount
+
+    def add_snapshot(self, event: Any, start: float) -> None:
+        """Record the time since the given start time as the snapshot phase of the given new event, and count its
+        snapshot and the bytes of its state.
+        """
+        self.end_phase('snapshot', start)
+        snapshot = event.state_snapshot
+        self.counters['snapshots'] += 1
+        self.counters['snapshot bytes'] += sys.getsizeof(snapshot) + sum(map(sys.getsizeof, snapshot.values()))
+
+    def start_profile(self) -> None:
+        """Start profiling the turns played, adding to the current profile if there is one."""
+        if self.profile is None:
+            self.profile = cProfile.Profile()
+
+    def stop_profile(self) -> Optional[pstats.Stats]:
+        """Stop profiling and return the statistics of the turns profiled, or None if profiling was off."""
+        profile, self.profile = self.profile, None
+        if profile is None:
+            return None
+        # Stats raises TypeError on a profile that has recorded nothing.
+        return pstats.Stats(profile) if profile.getstats() else None
+
+    def report(self) -> str:
+        """Return tables of the recorded timings (in microseconds) by command and by phase, then the counters."""
+        lines = []
+        for title, histograms in (('command', sorted(self.commands.items())),
+                                  ('phase', [(phase, self.phases[phase]) for phase in PHASES])):
+            lines.append(f'{title:16} {"count":>7} {"mean":>10} {"p50 <=":>10} {"p90 <=":>10} {"max":>10}')
+            for name, histogram in histograms:
+                lines.append(f'{name:16} {histogram.count:7} {histogram.mean() * 1e6:10.1f} '
+                             f'{histogram.percentile(0.5) * 1e6:10.1f} {histogram.percentile(0.9) * 1e6:10.1f} '
+                             f'{histogram.max * 1e6:10.1f}')
+        lines.extend(f'{name}: {count}' for name, count in self.counters.items())
+        return '\n'.join(lines)
+
+
+def format_profile(stats: pstats.Stats, limit: int = PROFILE_LINES) -> str:
+    """Return the given profile statistics as text, listing the <limit> functions with the most cumulative time."""
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
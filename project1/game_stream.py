@@ -0,0 +1,184 @@
+"""CSC111 Project 1: Text Adventure Game - Streaming JSON Reader
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains JsonSectionReader, which reads a JSON document whose top level is an
+object of arrays (like a game data file) one array element at a time, from a binary file read in
+fixed-size chunks. Only the chunk being parsed and the element being built are in memory at once,
+so world files far larger than the memory their JSON tree would take can still be loaded. The
+reader also hashes the file as it goes, so the content hash costs no second pass.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import codecs
+import hashlib
+import json
+import re
+from typing import Any, BinaryIO, Callable
+
+CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class JsonSectionReader:
+    """A reader of one JSON document whose top level is an object, from a binary file.
+
+    Instance Attributes:
+        - chunk_size:
+            The number of bytes read from the file at a time.
+        - bytes_read:
+            The number of bytes read from the file so far.
+    """
+    # Private Instance Attributes:
+    #   - _file: the file being read
+    #   - _hash: the SHA-256 of the bytes read so far
+    #   - _decoder: the incremental UTF-8 decoder of the bytes read
+    #   - _json: the decoder of single JSON values
+    #   - _buffer: the decoded text not yet consumed, from _buffer[_pos] on
+    #   - _pos: the position of the next character to parse in _buffer
+    #   - _offset: the number of characters dropped from the front of _buffer so far
+    #   - _eof: whether the whole file has been read
+
+    chunk_size: int
+    bytes_read: int
+    _file: BinaryIO
+    _hash: Any
+    _decoder: codecs.IncrementalDecoder
+    _json: json.JSONDecoder
+    _buffer: str
+    _pos: int
+    _offset: int
+    _eof: bool
+
+    def __init__(self, file: BinaryIO, chunk_size: int = CHUNK_SIZE) -> None:
+        """Initialize a reader of the given file, open in binary mode, reading chunk_size bytes at a time."""
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self._file = file
+        self._hash = hashlib.sha256()
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._offset = 0
+        self._eof = False
+
+    def hexdigest(self) -> str:
+        """Return the SHA-256 (hex) of the bytes read so far: of the whole file once read_sections has returned."""
+        return self._hash.hexdigest()
+
+    def read_sections(self, handlers: dict[str, Callable[[Any], None]]) -> dict[str, Any]:
+        """Read the document, calling handlers[key] on each element of the array of every key that has a handler,
+        in order, as soon as the element is parsed. Return the number of elements handled of every key handled, and
+        the value of every other key.
+
+        Raise ValueError if the document is not valid JSON or its top level is not an object.
+        """
+        result = {}
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+        else:
+            while True:
+                key = self._value()
+                if not isinstance(key, str):
+                    self._fail('Expecting property name enclosed in double quotes')
+                self._expect(':')
+                handler = handlers.get(key)
+                if handler is not None and self._peek() == '[':
+                    result[key] = self._read_array(handler)
+                else:
+                    result[key] = self._value()
+                if self._peek() == '}':
+                    self._pos += 1
+                    break
+                self._expect(',')
+        if self._peek() != '':
+            self._fail('Extra data')
+        return result
+
+    def _read_array(self, handler: Callable[[Any], None]) -> int:
+        """Read the array starting at the current position, calling handler on each element, and return its length."""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return 0
+        count = 0
+        while True:
+            handler(self._value())
+            count += 1
+            if self._peek() == ']':
+                self._pos += 1
+                return count
+            self._expect(',')
+
+    def _fill(self) -> bool:
+        """Read the next chunk of the file into the buffer, dropping the text already consumed.
+        Return False if the file had no more bytes.
+        """
+        if self._eof:
+            return False
+        raw = self._file.read(self.chunk_size)
+        self.bytes_read += len(raw)
+        self._hash.update(raw)
+        self._offset += self._pos
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(raw, final=not raw)
+        self._pos = 0
+        if not raw:
+            self._eof = True
+        return bool(raw)
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, without consuming it, or '' at the end of the file."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def _expect(self, char: str) -> None:
+        """Consume the given character, which must come next (after any whitespace)."""
+        if self._peek() != char:
+            self._fail(f'Expecting {char!r}')
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """Parse and return the JSON value that comes next, reading more of the file as long as it is cut off."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+                # A number at the end of the buffer may continue in the next chunk.
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError as error:
+                if self._eof:
+                    raise ValueError(f'{error.msg} at character {self._offset + error.pos}') from error
+            self._fill()
+
+    def _fail(self, message: str) -> None:
+        """Raise a ValueError with the given message and the current position in the document."""
+        raise ValueError(f'{message} at character {self._offset + self._pos}')
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
@@ -0,0 +1,107 @@
+"""CSC111 Project 1: Text Adventure Game - Lazy Text Store
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the TextStore and TextRef classes. A TextStore memory-maps the text
+section of a compiled world bundle (see game_world), and each description in the world is kept as
+a TextRef pointing into it, which is only decoded the first time it is shown.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import mmap
+from typing import Optional
+
+
+class TextStore:
+    """UTF-8 text memory-mapped from a section of a file.
+
+    Instance Attributes:
+        - path:
+            The path of the mapped file.
+        - base:
+            The byte offset in the file at which the text section starts.
+
+    Representation Invariants:
+        - self.base >= 0
+    """
+    # Private Instance Attributes:
+    #   - _map: the read-only memory map of the whole file
+
+    path: str
+    base: int
+    _map: mmap.mmap
+
+    def __init__(self, path: str, base: int) -> None:
+        """Map the file at the given path, whose text section starts at byte <base>."""
+        self.path = path
+        self.base = base
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def decode(self, offset: int, length: int) -> str:
+        """Return the text of <length> bytes starting <offset> bytes into the text section."""
+        start = self.base + offset
+        return self._map[start:start + length].decode('utf-8')
+
+
+class TextRef:
+    """A piece of text in a TextStore, decoded on first use and then kept.
+
+    str(ref) returns the text, and a TextRef is truthy exactly when its text is non-empty, so code
+    written for plain string descriptions works unchanged as long as it calls str() before using one.
+
+    Instance Attributes:
+        - offset:
+            The byte offset of the text within the store's text section.
+        - length:
+            The length of the text in bytes.
+    """
+    __slots__ = ('_store', 'offset', 'length', '_text')
+
+    _store: TextStore
+    offset: int
+    length: int
+    _text: Optional[str]
+
+    def __init__(self, store: TextStore, offset: int, length: int) -> None:
+        """Initialize a reference to <length> bytes of text at <offset> in the given store."""
+        self._store = store
+        self.offset = offset
+        self.length = length
+        self._text = None
+
+    def __str__(self) -> str:
+        """Return the referenced text, decoding it if this is the first access."""
+        if self._text is None:
+            self._text = self._store.decode(self.offset, self.length)
+        return self._text
+
+    def __bool__(self) -> bool:
+        """Return whether the referenced text is non-empty."""
+        return self.length > 0
+
+    def __repr__(self) -> str:
+        """Return a string representation of this reference."""
+        return f'TextRef({self.offset}, {self.length})'
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
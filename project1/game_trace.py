@@ -0,0 +1,111 @@
+"""CSC111 Project 1: Text Adventure Game - Debug Trace
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains DebugTrace, which keeps the debug trace of a game: in debug mode, every
+event a command adds to the game log is shown once, as it is added, and recorded here. The most
+recent records are kept in a bounded ring buffer (shown by the "trace" command), and can also be
+streamed to a file, which a background thread writes (see game_writer) so that tracing never waits
+for the disk.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from collections import deque
+from typing import Optional
+
+from game_writer import BackgroundWriter
+from proj1_event_logger import Event
+
+DEFAULT_TRACE_CAPACITY = 256
+
+
+class DebugTrace:
+    """The debug trace records of a game: the most recent ones in memory, and optionally all of them in a file.
+
+    Instance Attributes:
+        - capacity:
+            The number of recent records kept in memory.
+        - path:
+            The file every record is appended to, or None to keep only the recent ones.
+        - last_event:
+            The last game log event recorded, or None if none has been. The next records are the events added to
+            the log after it.
+    """
+    # Private Instance Attributes:
+    #   - _recent: the last <capacity> records, oldest first
+    #   - _writer: the writer of the trace file, opened for appending, or None if there is no file or once it is
+    #     closed
+    #   - _closed_written: the number of records the writer had written when it was closed
+
+    capacity: int
+    path: Optional[str]
+    last_event: Optional[Event]
+    _recent: deque[str]
+    _writer: Optional[BackgroundWriter]
+    _closed_written: int
+
+    def __init__(self, capacity: int = DEFAULT_TRACE_CAPACITY, path: Optional[str] = None) -> None:
+        """Initialize an empty trace keeping the given number of recent records, and appending every record to the
+        file at the given path if there is one.
+        """
+        self.capacity = capacity
+        self.path = path
+        self.last_event = None
+        self._closed_written = 0
+        self._recent = deque(maxlen=capacity)
+        self._writer = None
+        if path is not None:
+            self._writer = BackgroundWriter(open(path, 'a', encoding='utf-8'), f'trace {path}')
+
+    @property
+    def records_written(self) -> int:
+        """The number of records written to the file so far."""
+        if self._writer is None:
+            return self._closed_written
+        return self._writer.records_written
+
+    def record(self, line: str) -> None:
+        """Add the given record to the recent ones, and queue it for the file if there is one."""
+        self._recent.append(line)
+        if self._writer is not None:
+            if self._writer.error is not None:
+                raise OSError(f'Trace file {self.path} stopped writing') from self._writer.error
+            self._writer.put(line)
+
+    def recent(self) -> list[str]:
+        """Return the recent records, oldest first."""
+        return list(self._recent)
+
+    def flush(self) -> None:
+        """Wait until every record so far is written to the file, if there is one."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Write every record so far to the file, if there is one, then stop the writer thread and close it."""
+        if self._writer is not None:
+            self._writer.close()
+            self._closed_written = self._writer.records_written
+            self._writer = None
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
@@ -0,0 +1,487 @@
+"""CSC111 Project 1: Text Adventure Game - World Loading
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module reads game data files for the `adventure` module and builds the GameWorld that
+every game loaded from the same file shares. Parsed game data is cached in-process, and each JSON
+file is compiled ahead of time into a binary bundle (stored in a __worldcache__ directory next to
+it) that loads much faster than the JSON. Descriptions in a bundle are kept in a memory-mapped text
+section and only decoded when shown (see game_text). Very large files are instead streamed one
+entity at a time (see game_stream), without bundles. To compile bundles ahead of time, run:
+
+    python game_world.py game_data.json [more_game_data.json ...]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import hashlib
+import json
+import marshal
+import os
+import struct
+import sys
+from typing import Any, Optional
+
+from game_conditions import CompiledCondition, compile_condition
+from game_entities import Location, Item, StoryEvent, Puzzle
+from game_flags import LocationFlags
+from game_graph import WorldGraph
+from game_items import ItemRegistry
+from game_render import RenderCache
+from game_routes import RouteGraph, RouteIndex
+from game_stream import CHUNK_SIZE, JsonSectionReader
+from game_text import TextRef, TextStore
+
+BUNDLE_DIR = '__worldcache__'
+BUNDLE_VERSION = 2
+
+# Game data files at least this big are streamed rather than parsed whole, which would take several times their size
+# in memory, and bundled.
+STREAM_THRESHOLD = 64 * 2 ** 20
+
+# Worlds with more items than this build no condition masks: each mask is as wide as the number of items, so masks
+# for every condition would take memory quadratic in the size of the world, and the compiled conditions test the
+# few items they mention just as fast.
+MASK_ITEM_LIMIT = 4096
+
+# A bundle is this header (magic, size of the marshalled structure), the marshalled structure, then the UTF-8 text
+# of every field below, which the structure refers to by (offset, length) into the text section.
+_BUNDLE_HEADER = struct.Struct('<8sQ')
+_BUNDLE_MAGIC = b'CSC111WB'
+LAZY_TEXT_FIELDS = {
+    'locations': ('brief_description', 'long_description', 'extra_description'),
+    'story_events': ('brief_description', 'long_description', 'story_text'),
+}
+
+# Parsed game data and built worlds by content hash, and content hash by (absolute path, mtime, size) of the file
+# it came from.
+_parsed_by_digest: dict[str, dict[str, Any]] = {}
+_worlds_by_digest: dict[str, GameWorld] = {}
+_digest_by_stat: dict[tuple[str, int, int], str] = {}
+
+
+class GameWorld:
+    """The read-only part of a game built from one game data file, shared by every game loaded from it.
+
+    The entities here are templates: a game copies a location or item into its own overlay before changing it,
+    and never changes these objects (see AdventureGame and ItemRegistry.overlay).
+
+    Instance Attributes:
+        - locations:
+            A mapping from ID to every location, story event and puzzle, in that order.
+        - items:
+            A registry of every item, at its starting position.
+        - trigger_conditions:
+            The compiled trigger_condition of every StoryEvent that has one, keyed by event ID, in the
+            same order as locations.
+        - trigger_order:
+            A mapping from the ID of each StoryEvent in trigger_conditions to its position there.
+        - trigger_index:
+            A mapping from item name to the IDs of the StoryEvents whose trigger_condition mentions it.
+        - unindexed_triggers:
+            IDs of StoryEvents whose trigger_condition could not be analysed, which must be re-evaluated
+            whenever the inventory changes at all.
+        - initial_triggers:
+            IDs of the StoryEvents whose trigger_condition holds for the starting inventory.
+        - trigger_masks:
+            The (required, forbidden) masks over the inventory bitmask (see ItemRegistry.held_mask) of each
+            trigger_condition that is a plain conjunction, keyed by event ID. Empty if there are more than
+            MASK_ITEM_LIMIT items.
+        - unlock_masks:
+            The same masks for each unlock_condition that is a plain conjunction, keyed by the condition string.
+            Unlock conditions test the lowercased item names. Empty if there are more than MASK_ITEM_LIMIT items.
+        - location_flags:
+            The flags every location starts with, one byte per location in the same order as locations.
+        - graph:
+            The locations and their commands compiled to dense arrays, numbered in the same order as locations.
+        - render_cache:
+            The wrapped descriptions shown so far by any game of this world, keyed by location ID, which
+            description was shown and the wrap width.
+        - digest:
+            The SHA-256 (hex) of the game data file contents the world was built from, or '' if it was built
+            from data that did not come from a file.
+
+    Representation Invariants:
+        - self.items owns no items (all its items are templates)
+        - all(event_id in self.locations for event_id in self.trigger_conditions)
+    """
+    # Private Instance Attributes:
+    #   - _route_index: the routes between the locations as they start out (locked or not), built when first needed
+    locations: dict[int, Location | StoryEvent | Puzzle]
+    items: ItemRegistry
+    trigger_conditions: dict[int, CompiledCondition]
+    trigger_order: dict[int, int]
+    trigger_index: dict[str, list[int]]
+    unindexed_triggers: list[int]
+    initial_triggers: frozenset[int]
+    trigger_masks: dict[int, tuple[int, int]]
+    unlock_masks: dict[str, tuple[int, int]]
+    location_flags: LocationFlags
+    graph: WorldGraph
+    render_cache: RenderCache
+    digest: str
+    _route_index: Optional[RouteIndex]
+
+    def __init__(self, data: dict[str, Any], digest: str = '') -> None:
+        """Build a world from parsed game data, compiling every trigger and unlock condition once, ahead of
+        play, and indexing the trigger conditions by the items they mention.
+        """
+        self._build(*build_entities(data), digest)
+
+    @classmethod
+    def from_entities(cls, locations: dict[int, Location], items: list[Item], stories: dict[int, StoryEvent],
+                      puzzles: dict[int, Puzzle], digest: str = '') -> GameWorld:
+        """Return a world built from already built entities, as returned by build_entities."""
+        world = cls.__new__(cls)
+        world._build(locations, items, stories, puzzles, digest)
+        return world
+
+    def _build(self, locations: dict[int, Location], items: list[Item], stories: dict[int, StoryEvent],
+               puzzles: dict[int, Puzzle], digest: str) -> None:
+        """Initialize this world from its entities, as described in __init__."""
+        self.locations = {**locations, **stories, **puzzles}
+        self.items = ItemRegistry(items)
+        self.render_cache = RenderCache()
+        self.digest = digest
+        self._route_index = None
+
+        self.location_flags = LocationFlags(self.locations)
+        self.graph = WorldGraph(self.locations)
+
+        use_masks = len(items) <= MASK_ITEM_LIMIT
+        name_bits = {item.name: 1 << i for i, item in enumerate(self.items)} if use_masks else {}
+        key_bits = {name.lower(): bit for name, bit in name_bits.items()}
+        self.trigger_conditions = {}
+        self.trigger_index = {}
+        self.unindexed_triggers = []
+        self.trigger_masks = {}
+        self.unlock_masks = {}
+        for loc_id, location in self.locations.items():
+            if isinstance(location, StoryEvent) and location.trigger_condition:
+                condition = compile_condition(location.trigger_condition)
+                self.trigger_conditions[loc_id] = condition
+                if condition.items is None:
+                    self.unindexed_triggers.append(loc_id)
+                else:
+                    for item_name in condition.items:
+                        self.trigger_index.setdefault(item_name, []).append(loc_id)
+                masks = condition.masks(name_bits) if use_masks else None
+                if masks is not None:
+                    self.trigger_masks[loc_id] = masks
+            if location.unlock_condition and use_masks:
+                masks = compile_condition(location.unlock_condition).masks(key_bits)
+                if masks is not None:
+                    self.unlock_masks[location.unlock_condition] = masks
+
+        self.trigger_order = {event_id: i for i, event_id in enumerate(self.trigger_conditions)}
+        self.initial_triggers = frozenset(event_id for event_id, condition in self.trigger_conditions.items()
+                                          if condition(self.items.held_names))
+
+    def get_route_index(self) -> RouteIndex:
+        """Return the route index of this world's locations with their starting locks, building it the first time.
+        Games share it until they unlock a location (see AdventureGame.get_route_index).
+        """
+        if self._route_index is None:
+            locked = [loc_id for loc_id, location in self.locations.items() if location.is_locked]
+            self._route_index = RouteIndex(RouteGraph(self.graph), locked)
+        return self._route_index
+
+
+def load_world(filename: str) -> GameWorld:
+    """Return the GameWorld for the given game data JSON file, building it only the first time these file
+    contents are loaded in this process.
+
+    Files of at least STREAM_THRESHOLD bytes are streamed (see stream_world) rather than parsed whole and bundled.
+    """
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    if stat.st_size >= STREAM_THRESHOLD:
+        stat_key = (path, stat.st_mtime_ns, stat.st_size)
+        digest = _digest_by_stat.get(stat_key)
+        world = _worlds_by_digest.get(digest) if digest is not None else None
+        if world is None:
+            world = stream_world(path)
+            world = _worlds_by_digest.setdefault(world.digest, world)
+            _digest_by_stat[stat_key] = world.digest
+        return world
+
+    digest, data = _read(filename)
+    world = _worlds_by_digest.get(digest)
+    if world is None:
+        world = GameWorld(data, digest)
+        _worlds_by_digest[digest] = world
+    return world
+
+
+def stream_world(filename: str, chunk_size: int = CHUNK_SIZE) -> GameWorld:
+    """Return a new GameWorld for the given game data JSON file, building each entity as soon as it is parsed.
+
+    The file is read chunk_size bytes at a time, and only the entities are kept, so loading takes memory for the
+    world itself but never for the whole file or its JSON tree. No bundle is read or written: for files this big,
+    the bundle's parsed structure would take as much memory as the JSON's.
+    """
+    locations, items, stories, puzzles = {}, [], {}, {}
+    # Each entry is parsed on its own, so unlike in a whole-file parse, equal keys are not the same string unless
+    # shared here.
+    commands = {}
+
+    def add_location(loc_data: dict[str, Any]) -> None:
+        """Build the location described by loc_data."""
+        loc_data['available_commands'] = {commands.setdefault(command, command): target_id
+                                          for command, target_id in loc_data['available_commands'].items()}
+        locations[loc_data['id']] = build_location(loc_data)
+
+    def add_story_event(story_data: dict[str, Any]) -> None:
+        """Build the story event described by story_data."""
+        stories[story_data['id']] = build_story_event(story_data)
+
+    def add_puzzle(puzzle_data: dict[str, Any]) -> None:
+        """Build the puzzle described by puzzle_data."""
+        puzzles[puzzle_data['id']] = build_puzzle(puzzle_data)
+
+    with open(filename, 'rb') as f:
+        reader = JsonSectionReader(f, chunk_size)
+        sections = reader.read_sections({'locations': add_location, 'items': lambda d: items.append(build_item(d)),
+                                         'story_events': add_story_event, 'puzzle': add_puzzle})
+    if 'locations' not in sections:
+        raise KeyError('locations')
+    return GameWorld.from_entities(locations, items, stories, puzzles, reader.hexdigest())
+
+
+def build_entities(data: dict[str, Any]) -> tuple[dict[int, Location], list[Item], dict[int, StoryEvent],
+                                                  dict[int, Puzzle]]:
+    """Return the locations, items, story events and puzzles described by the given parsed game data."""
+    locations = {loc_data['id']: build_location(loc_data) for loc_data in data['locations']}
+    items = [build_item(item_data) for item_data in data.get("items", [])]
+    stories = {story_data['id']: build_story_event(story_data) for story_data in data.get('story_events', [])}
+    puzzles = {puzzle_data['id']: build_puzzle(puzzle_data) for puzzle_data in data.get('puzzle', [])}
+    return locations, items, stories, puzzles
+
+
+def build_location(loc_data: dict[str, Any]) -> Location:
+    """Return the location described by the given entry of the game data's locations."""
+    return Location(
+        id_num=loc_data['id'],
+        name=loc_data['name'],
+        brief_description=loc_data.get('brief_description', ""),
+        long_description=loc_data.get('long_description', ""),
+        available_commands=loc_data['available_commands'],
+        items=loc_data['items'],
+        extra_description=loc_data.get('extra_description', None),
+        first_time_event_id=loc_data.get('first_time_event_id', None),
+        is_locked=loc_data.get('is_locked', False),
+        unlock_condition=loc_data.get('unlock_condition', None)
+    )
+
+
+def build_item(item_data: dict[str, Any]) -> Item:
+    """Return the item described by the given entry of the game data's items."""
+    return Item(
+        name=item_data["name"],
+        start_position=item_data["start_position"],
+        target_position=item_data.get("target_position", -1),  # Default target location
+        description=item_data.get("description", ""),
+        target_points=item_data.get("target_points", 0),  # Default points
+        current_position=item_data.get("current_position", item_data["start_position"]),
+        use_location=item_data.get("use_location", None),
+        triggers_event_id=item_data.get("triggers_event_id", None)
+    )
+
+
+def build_story_event(story_data: dict[str, Any]) -> StoryEvent:
+    """Return the story event described by the given entry of the game data's story_events."""
+    return StoryEvent(
+        id_num=story_data['id'],
+        name=story_data['name'],
+        brief_description=story_data.get('brief_description', ''),
+        long_description=story_data.get('long_description', ''),
+        available_commands=story_data['available_commands'],
+        items=story_data.get('items', []),
+        story_text=story_data.get('story_text', ""),
+        choices=story_data.get('choices', []),
+        new_objective=story_data.get('new_objective', None),
+        trigger_condition=story_data.get('trigger_condition', None)
+    )
+
+
+def build_puzzle(puzzle_data: dict[str, Any]) -> Puzzle:
+    """Return the puzzle described by the given entry of the game data's puzzle."""
+    return Puzzle(
+        id_num=puzzle_data['id'],
+        name=puzzle_data['name'],
+        brief_description='',
+        long_description='',
+        available_commands=puzzle_data['available_commands'],
+        items=puzzle_data.get('items', []),
+        puzzle_text=puzzle_data['puzzle_text'],
+        answers=puzzle_data.get('answers', []),
+    )
+
+
+def read_game_data(filename: str) -> dict[str, Any]:
+    """Return the parsed contents of the given game data JSON file.
+
+    The result is shared between every caller that reads the same file contents, so it must be treated as
+    read-only. A file that has not changed since it was last read in this process is not even re-read. Otherwise
+    its contents are hashed, and the compiled bundle for that hash is loaded if there is one; only if there is
+    not is the JSON parsed (and a bundle written for next time).
+
+    When the data comes from a bundle, the LAZY_TEXT_FIELDS are TextRefs (or lists of TextRefs where the JSON
+    has a list of strings) rather than strings.
+    """
+    return _read(filename)[1]
+
+
+def _read(filename: str) -> tuple[str, dict[str, Any]]:
+    """Return the content hash and the parsed contents of the given game data JSON file, as described in
+    read_game_data.
+    """
+    path = os.path.abspath(filename)
+    stat = os.stat(path)
+    stat_key = (path, stat.st_mtime_ns, stat.st_size)
+    digest = _digest_by_stat.get(stat_key)
+    # A streamed file has a digest but no parsed data.
+    if digest is not None and digest in _parsed_by_digest:
+        return digest, _parsed_by_digest[digest]
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    data = _parsed_by_digest.get(digest)
+    if data is None:
+        bundle_path = get_bundle_path(path, digest)
+        data = _read_bundle(bundle_path, digest)
+        if data is None:
+            data = json.loads(raw)
+            _write_bundle(bundle_path, digest, data)
+            data = _read_bundle(bundle_path, digest) or data
+        _parsed_by_digest[digest] = data
+    _digest_by_stat[stat_key] = digest
+    return digest, data
+
+
+def compile_world(filename: str) -> str:
+    """Compile the given game data JSON file into a bundle, if it does not have an up-to-date one already,
+    and return the bundle's path.
+    """
+    path = os.path.abspath(filename)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    bundle_path = get_bundle_path(path, digest)
+    if _read_bundle(bundle_path, digest) is None:
+        _write_bundle(bundle_path, digest, json.loads(raw))
+    return bundle_path
+
+
+def get_bundle_path(path: str, digest: str) -> str:
+    """Return where the bundle of the game data file at the given path with the given content hash is stored.
+
+    Bundles use marshal, whose format depends on the Python version, so the interpreter's cache tag is part of
+    the name (as it is for .pyc files).
+    """
+    directory, name = os.path.split(path)
+    stem = os.path.splitext(name)[0]
+    return os.path.join(directory, BUNDLE_DIR, f'{stem}.{sys.implementation.cache_tag}.{digest[:16]}.bundle')
+
+
+def clear_cache() -> None:
+    """Forget every game data file parsed and world built in this process (bundles on disk are kept)."""
+    _parsed_by_digest.clear()
+    _worlds_by_digest.clear()
+    _digest_by_stat.clear()
+
+
+def _read_bundle(bundle_path: str, digest: str) -> Optional[dict[str, Any]]:
+    """Return the game data stored in the bundle at the given path, or None if it is missing, unreadable or
+    was compiled from different contents.
+    """
+    try:
+        with open(bundle_path, 'rb') as f:
+            magic, size = _BUNDLE_HEADER.unpack(f.read(_BUNDLE_HEADER.size))
+            if magic != _BUNDLE_MAGIC:
+                return None
+            version, bundle_digest, data = marshal.loads(f.read(size))
+        if version != BUNDLE_VERSION or bundle_digest != digest:
+            return None
+        store = TextStore(bundle_path, _BUNDLE_HEADER.size + size)
+    except (OSError, EOFError, ValueError, TypeError, struct.error):
+        return None
+
+    for section, fields in LAZY_TEXT_FIELDS.items():
+        for entry in data.get(section, []):
+            for field in fields:
+                value = entry.get(field)
+                if isinstance(value, tuple):
+                    entry[field] = TextRef(store, *value)
+                elif isinstance(value, list):
+                    entry[field] = [TextRef(store, *part) for part in value]
+    return data
+
+
+def _write_bundle(bundle_path: str, digest: str, data: dict[str, Any]) -> None:
+    """Write the given game data to a bundle at the given path, replacing older bundles of the same file.
+
+    Bundles are only a cache, so failing to write one (e.g. in a read-only directory) is not an error.
+    """
+    text = bytearray()
+
+    def add_text(value: str) -> tuple[int, int]:
+        """Append value to the text section and return its (offset, length) there."""
+        encoded = value.encode('utf-8')
+        text.extend(encoded)
+        return len(text) - len(encoded), len(encoded)
+
+    structure = dict(data)
+    for section, fields in LAZY_TEXT_FIELDS.items():
+        entries = []
+        for entry in data.get(section, []):
+            entry = dict(entry)
+            for field in fields:
+                value = entry.get(field)
+                if isinstance(value, str):
+                    entry[field] = add_text(value)
+                elif isinstance(value, list) and all(isinstance(part, str) for part in value):
+                    entry[field] = [add_text(part) for part in value]
+            entries.append(entry)
+        structure[section] = entries
+    body = marshal.dumps((BUNDLE_VERSION, digest, structure))
+
+    directory, name = os.path.split(bundle_path)
+    prefix = name[:-len('.bundle') - 16]
+    try:
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f'{bundle_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(_BUNDLE_HEADER.pack(_BUNDLE_MAGIC, len(body)))
+            f.write(body)
+            f.write(text)
+        os.replace(temp_path, bundle_path)
+        for other in os.listdir(directory):
+            if other.startswith(prefix) and other.endswith('.bundle') and other != name:
+                os.remove(os.path.join(directory, other))
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
+    for game_data_file in sys.argv[1:]:
+        print(f'{game_data_file} -> {compile_world(game_data_file)}')
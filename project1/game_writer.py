@@ -0,0 +1,163 @@
+"""CSC111 Project 1: Text Adventure Game - Background Writer
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains BackgroundWriter, which appends records to a file from a background
+thread, so that the game never waits for the disk. Each time the thread wakes up it takes every
+record waiting (up to a batch size), writes them as one block of lines and, if asked to, fsyncs
+once for the whole batch. GameJournal and DebugTrace both write through it.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import os
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+# Requests put on the queue: FLUSH makes the writer set the request's threading.Event once everything before it
+# is written, and CLOSE makes the writer finish.
+_FLUSH = 'flush'
+_CLOSE = 'close'
+
+
+class _Request:
+    """A flush or close request on a writer's queue, told apart from records by its type."""
+    __slots__ = ('kind', 'done')
+    kind: str
+    done: Optional[threading.Event]
+
+    def __init__(self, kind: str, done: Optional[threading.Event] = None) -> None:
+        """Initialize a request of the given kind (_FLUSH or _CLOSE), with the event a flush sets when done."""
+        self.kind = kind
+        self.done = done
+
+
+class BackgroundWriter:
+    """Records appended as lines to an open text file by a background thread, in batches.
+
+    Instance Attributes:
+        - format_record:
+            The function turning a record into its line (without the newline), called by the writer thread.
+        - fsync:
+            Whether each batch is fsynced once it is written, rather than only flushed to the operating system.
+        - max_batch:
+            The most records written in one batch, or None for no limit.
+        - records_written:
+            The number of records written so far.
+        - batches_written:
+            The number of batches written so far.
+        - error:
+            The exception that stopped the writer thread, or None while it is running normally.
+    """
+    # Private Instance Attributes:
+    #   - _file: the file written to, closed by close
+    #   - _queue: records (and flush and close requests) waiting for the writer thread
+    #   - _thread: the writer thread
+
+    format_record: Callable[[Any], str]
+    fsync: bool
+    max_batch: Optional[int]
+    records_written: int
+    batches_written: int
+    error: Optional[BaseException]
+    _file: Any
+    _queue: queue.SimpleQueue
+    _thread: threading.Thread
+
+    def __init__(self, file: Any, name: str, format_record: Callable[[Any], str] = str, fsync: bool = False,
+                 max_batch: Optional[int] = None) -> None:
+        """Start a writer thread with the given name, appending records to the given open text file."""
+        self.format_record = format_record
+        self.fsync = fsync
+        self.max_batch = max_batch
+        self.records_written = 0
+        self.batches_written = 0
+        self.error = None
+        self._file = file
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._write_batches, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, record: Any) -> None:
+        """Queue the given record for writing, without waiting for it to be written. The caller must not change
+        the record afterwards.
+        """
+        self._queue.put(record)
+
+    def flush(self) -> bool:
+        """Wait until every record queued so far is written, and return True; or return False as soon as the
+        writer thread is found to have stopped.
+        """
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(_Request(_FLUSH, done))
+        while not done.wait(0.1):
+            if not self._thread.is_alive():
+                return False
+        return True
+
+    def close(self) -> None:
+        """Write every record queued so far, then stop the writer thread and close the file."""
+        if self._thread.is_alive():
+            self._queue.put(_Request(_CLOSE))
+            self._thread.join()
+        self._file.close()
+
+    def _write_batches(self) -> None:
+        """Write records from the queue in batches until asked to close (run by the writer thread)."""
+        try:
+            closing = False
+            while not closing:
+                lines = []
+                flushed = []
+                item = self._queue.get()
+                while True:
+                    if isinstance(item, _Request):
+                        if item.kind == _CLOSE:
+                            closing = True
+                            break
+                        flushed.append(item.done)
+                    else:
+                        lines.append(self.format_record(item))
+                    if self.max_batch is not None and len(lines) >= self.max_batch:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+
+                if lines:
+                    self._file.write('\n'.join(lines) + '\n')
+                    self._file.flush()
+                    if self.fsync:
+                        os.fsync(self._file.fileno())
+                    self.records_written += len(lines)
+                    self.batches_written += 1
+                for done in flushed:
+                    done.set()
+        except BaseException as error:  # Reported to the caller by the class using the writer.
+            self.error = error
+            raise
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
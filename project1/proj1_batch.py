@@ -0,0 +1,202 @@
+"""CSC111 Project 1: Text Adventure Game - Batch Simulator
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module runs many simulated playthroughs (see proj1_simulation) across a pool of worker
+processes. Each worker loads every game world it needs once, and results are streamed back as jobs
+finish. From the project1 directory:
+
+    python proj1_batch.py jobs.jsonl [--workers N] [--chunksize C] [--repeat R]
+
+Each line of the jobs file is a JSON object such as
+
+    {"id": "win", "game_data_file": "game_data.json", "start": 1, "commands": ["turn off alarm", ...]}
+
+and one JSON result per job is printed, in the order the jobs finish. A job that raised an exception
+is still printed, with the exception in its "error".
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import Iterable, Iterator, Optional
+
+from game_output import NullSink
+from game_world import load_world
+from proj1_simulation import AdventureGameSimulation
+
+
+@dataclass
+class SimulationJob:
+    """A playthrough to simulate.
+
+    Instance Attributes:
+        - job_id:
+            A name for the job, copied into its result.
+        - game_data_file:
+            The game data file to play.
+        - initial_location_id:
+            The location ID to start at.
+        - commands:
+            The commands to play, as given to AdventureGameSimulation.
+    """
+    job_id: str
+    game_data_file: str
+    initial_location_id: int
+    commands: list[str]
+
+
+@dataclass
+class SimulationResult:
+    """The outcome of a simulated playthrough.
+
+    Instance Attributes:
+        - job_id:
+            The job_id of the job that was run.
+        - id_log:
+            The location ID log of the playthrough.
+        - score:
+            The final score.
+        - current_time:
+            The final in-game time, in minutes since midnight.
+        - ongoing:
+            Whether the game was still going after the last command.
+        - elapsed:
+            The wall time the simulation took, in seconds.
+        - error:
+            None if the job ran, or the exception that stopped it, as "<type>: <message>". A failed job has an
+            empty id_log and zero score, current_time and elapsed.
+    """
+    job_id: str
+    id_log: list[int]
+    score: int
+    current_time: int
+    ongoing: bool
+    elapsed: float
+    error: Optional[str] = None
+
+
+def run_job(job: SimulationJob) -> SimulationResult:
+    """Simulate the given job in this process and return its result. Whatever the game prints is discarded."""
+    start = time.perf_counter()
+    simulation = AdventureGameSimulation(job.game_data_file, job.initial_location_id, job.commands, NullSink())
+    elapsed = time.perf_counter() - start
+    game = simulation.get_game()
+    return SimulationResult(job.job_id, simulation.get_id_log(), game.score, game.current_time, game.ongoing,
+                            elapsed)
+
+
+def failed_result(job: SimulationJob, error: BaseException) -> SimulationResult:
+    """Return the result of the given job having been stopped by the given exception."""
+    return SimulationResult(job.job_id, [], 0, 0, False, 0.0, f'{type(error).__name__}: {error}')
+
+
+def try_job(job: SimulationJob) -> SimulationResult:
+    """Simulate the given job in this process and return its result, or a failed result if it raises an exception."""
+    try:
+        return run_job(job)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return failed_result(job, error)
+
+
+def run_jobs(jobs: list[SimulationJob]) -> list[SimulationResult]:
+    """Simulate the given jobs in this process, in order, and return their results. A job that raises an
+    exception gets a failed result, and the jobs after it still run.
+    """
+    return [try_job(job) for job in jobs]
+
+
+def _init_worker(game_data_files: list[str]) -> None:
+    """Load every given game world in a new worker process, so that no job pays for loading one. A file that
+    cannot be loaded is skipped here: each job playing it then fails with the error when it runs.
+    """
+    for game_data_file in game_data_files:
+        try:
+            load_world(game_data_file)
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+
+
+def run_batch(jobs: Iterable[SimulationJob], workers: Optional[int] = None,
+              chunksize: int = 1) -> Iterator[SimulationResult]:
+    """Simulate all the given jobs on a pool of <workers> processes (by default, one per CPU), yielding the
+    results of each chunk of <chunksize> consecutive jobs as soon as the chunk finishes. Larger chunks cost
+    fewer round trips to the workers when jobs are short. With workers == 0, run the jobs one at a time in
+    this process instead.
+
+    A job that raises an exception, or whose chunk is lost with its worker, is yielded as a failed result (see
+    SimulationResult.error), so one bad job does not stop the rest of the batch.
+    """
+    jobs = list(jobs)
+    game_data_files = sorted({job.game_data_file for job in jobs})
+    if workers == 0:
+        _init_worker(game_data_files)
+        for job in jobs:
+            yield try_job(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(game_data_files,)) as executor:
+        chunks = {}
+        for i in range(0, len(jobs), chunksize):
+            chunk = jobs[i:i + chunksize]
+            chunks[executor.submit(run_jobs, chunk)] = chunk
+        for future in as_completed(chunks):
+            try:
+                yield from future.result()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                yield from (failed_result(job, error) for job in chunks[future])
+
+
+def read_jobs(filename: str) -> list[SimulationJob]:
+    """Return the jobs in the given JSON lines file. A job without an "id" is named after its line number,
+    and "game_data_file" and "start" default to 'game_data.json' and 1.
+    """
+    jobs = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            job = json.loads(line)
+            jobs.append(SimulationJob(str(job.get('id', line_number)), job.get('game_data_file', 'game_data.json'),
+                                      job.get('start', 1), job['commands']))
+    return jobs
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
+    parser = argparse.ArgumentParser(description='Simulate many playthroughs across worker processes.')
+    parser.add_argument('jobs', help='JSON lines file of jobs')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: one per CPU; 0 runs in this process)')
+    parser.add_argument('--chunksize', type=int, default=1, help='number of jobs sent to a worker at a time')
+    parser.add_argument('--repeat', type=int, default=1, help='run every job this many times')
+    args = parser.parse_args()
+
+    batch = [job for job in read_jobs(args.jobs) for _ in range(args.repeat)]
+    batch_start = time.perf_counter()
+    for result in run_batch(batch, args.workers, args.chunksize):
+        print(json.dumps(asdict(result)), flush=True)
+    print(f'{len(batch)} jobs in {time.perf_counter() - batch_start:.2f} s', file=sys.stderr)
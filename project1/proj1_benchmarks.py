@@ -0,0 +1,979 @@
+"""CSC111 Project 1: Text Adventure Game - Benchmarks
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains timing benchmarks for the game engine. Run it from the project1
+directory, optionally naming the benchmarks to run:
+
+    python proj1_benchmarks.py [benchmark ...]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import ast
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from adventure import AdventureGame
+from game_entities import Location
+from game_graph import WorldGraph
+from game_conditions import compile_condition
+from game_journal import GameJournal
+from game_output import BufferedSink, NullSink, StreamSink
+from game_routes import RouteGraph, RouteIndex
+import game_world
+from proj1_batch import SimulationJob, run_batch
+from proj1_event_logger import ArrayEventList, Event, EventList
+from proj1_replay import GameReplay
+from proj1_simulation import AdventureGameSimulation
+from proj1_solver import GameSolver
+from proj1_worldgen import START_ID, WorldSpec, generate_world, play_walkthrough
+
+GAME_DATA_FILE = 'game_data.json'
+
+
+def _best_time(func: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best wall time in seconds of <repeat> calls to func."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def load_demo_commands(name: str) -> list[str]:
+    """Return the command list assigned to <name> in the __main__ block of proj1_simulation.py,
+    e.g. load_demo_commands('win_walkthrough').
+    """
+    with open('proj1_simulation.py', 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id == name):
+            return ast.literal_eval(node.value)
+    raise KeyError(f'No demo named {name} in proj1_simulation.py')
+
+
+def play_command(game: AdventureGame, game_log: EventList, command: str) -> None:
+    """Process one command the same way the main loop of adventure.py does."""
+    game.play_turn(command, game_log)
+
+
+def random_commands(game: AdventureGame, rng: random.Random) -> list[str]:
+    """Return the commands a random player may choose from at the game's current location, leaving out
+    the ones that wait for input, open files or print the whole log.
+    """
+    location = game.get_location()
+    commands = [command for command in location.available_commands
+                if command not in ('password', 'book search', 'inquire')]
+    commands += ['look', 'inventory', 'score', 'time', 'objective']
+    commands += [f'pick up {item.name.lower()}' for item in game.get_current_location_items()]
+    held = [item.name.lower() for item in game.get_inventory_items()]
+    commands += [f'{verb} {name}' for name in held for verb in ('drop', 'use')]
+    if rng.random() < 0.05:
+        commands.append('undo')
+    return commands
+
+
+def _run_memory_session(kind: str, num_commands: int) -> None:
+    """Play a session of the given kind with output discarded, then print the number of commands, the wall
+    time and the peak resident set size of this process in KiB.
+
+    'win_walkthrough' runs that demo through AdventureGameSimulation; 'random' plays <num_commands> random
+    commands through the adventure.py main loop.
+    """
+    start = time.perf_counter()
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        if kind == 'win_walkthrough':
+            commands = load_demo_commands('win_walkthrough')
+            num_commands = len(commands)
+            AdventureGameSimulation(GAME_DATA_FILE, 1, commands)
+        else:
+            game_log = EventList()
+            game = AdventureGame(GAME_DATA_FILE, 1)
+            rng = random.Random(111)
+            for _ in range(num_commands):
+                play_command(game, game_log, rng.choice(random_commands(game, rng)))
+    elapsed = time.perf_counter() - start
+    print(num_commands, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _run_load_session(mode: str, path: str) -> None:
+    """Build the GameWorld of the game data file at path, then print the number of locations, the wall time and
+    the peak resident set size of this process in KiB.
+
+    'whole' parses the whole file (and writes and reads its bundle), as load_world does for files below
+    game_world.STREAM_THRESHOLD; 'stream' builds it with game_world.stream_world.
+    """
+    start = time.perf_counter()
+    if mode == 'whole':
+        world = game_world.GameWorld(game_world.read_game_data(path))
+    else:
+        world = game_world.stream_world(path)
+    elapsed = time.perf_counter() - start
+    print(len(world.locations), elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _synthetic_conditions(num_events: int, num_items: int, seed: int = 111) -> list[str]:
+    """Return <num_events> trigger conditions shaped like the ones in game_data.json,
+    each requiring a few random items and forbidding the item the event grants.
+    """
+    rng = random.Random(seed)
+    names = [f'item {i}' for i in range(num_items)]
+    conditions = []
+    for _ in range(num_events):
+        required = rng.sample(names, 3)
+        conditions.append(' and '.join(f"'{name}' in inventory" for name in required)
+                          + f" and '{rng.choice(names)}' not in inventory")
+    return conditions
+
+
+def _compare_condition_paths(label: str, conditions: list[str], inventory: list[str], rounds: int) -> None:
+    """Print the time taken to check every condition <rounds> times through eval() and through
+    the compiled predicates, the same way check_trigger_conditions scans the world.
+    """
+    def eval_path() -> None:
+        """Check every condition <rounds> times with eval()."""
+        for _ in range(rounds):
+            for condition in conditions:
+                eval(condition, {}, {"inventory": inventory})
+
+    compiled = [compile_condition(condition) for condition in conditions]
+    inventory_set = set(inventory)
+
+    def compiled_path() -> None:
+        """Check every condition <rounds> times with its compiled predicate."""
+        for _ in range(rounds):
+            for condition in compiled:
+                condition(inventory_set)
+
+    checks = rounds * len(conditions)
+    eval_time = _best_time(eval_path, repeat=3)
+    compiled_time = _best_time(compiled_path, repeat=3)
+    print(f'{label}: {len(conditions)} conditions x {rounds} rounds')
+    print(f'    eval():   {eval_time * 1e9 / checks:9.1f} ns/check')
+    print(f'    compiled: {compiled_time * 1e9 / checks:9.1f} ns/check  ({eval_time / compiled_time:.1f}x faster)')
+
+
+def bench_conditions() -> None:
+    """Benchmark trigger/unlock condition checks: eval() against compiled predicates."""
+    with open(GAME_DATA_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    shipped = [story['trigger_condition'] for story in data['story_events'] if story.get('trigger_condition')]
+    shipped += [loc['unlock_condition'] for loc in data['locations'] if loc.get('unlock_condition')]
+    inventory = ['wallet', 'bag', 'tcard', 'lucky mug', 'usb drive']
+    _compare_condition_paths('game_data.json', shipped, inventory, rounds=20000)
+
+    synthetic = _synthetic_conditions(5000, 500)
+    _compare_condition_paths('synthetic world', synthetic, [f'item {i}' for i in range(0, 500, 7)], rounds=20)
+
+
+def bench_triggers() -> None:
+    """Benchmark check_trigger_conditions on a large world, with and without an inventory change."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'world.json')
+        generate_world(path, WorldSpec(1000, events=5000, items=500))
+        game = AdventureGame(path, START_ID)
+
+    rounds = 2000
+    with contextlib.redirect_stdout(io.StringIO()):
+        idle = _best_time(lambda: [game.check_trigger_conditions() for _ in range(rounds)]) / rounds
+        item = game.get_items()[0]
+        game.current_location_id = item.current_position
+        event = game.create_new_event()
+
+        def pickup_and_drop() -> None:
+            """Pick up and drop the item <rounds> times in all, checking the triggers after each."""
+            for _ in range(rounds // 2):
+                game.handle_item_pickup(f'pick up {item.name}', game, event)
+                game.check_trigger_conditions()
+                game.handle_item_drop(f'drop {item.name}', game, event)
+                game.check_trigger_conditions()
+
+        changed = _best_time(pickup_and_drop) / rounds
+    print('check_trigger_conditions: 5000 story events, 500 items')
+    print(f'    inventory unchanged:             {idle * 1e6:8.2f} us/command')
+    print(f'    one item picked up or dropped:   {changed * 1e6:8.2f} us/command')
+
+
+def bench_state() -> None:
+    """Benchmark taking a hashable snapshot of a game's state on a large world, by scanning every item and location
+    against get_state_key (moved items and changed flags), and checking conditions against an inventory set and
+    against an inventory bitmask.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'world.json')
+        generate_world(path, WorldSpec(10000, events=5000, items=500))
+        game = AdventureGame(path, START_ID, NullSink())
+        world = game_world.load_world(path)
+    game_log = EventList()
+    event = game.create_new_event()
+    for item in game.get_items()[::10]:
+        game.current_location_id = item.current_position
+        game.handle_item_pickup(f'pick up {item.name}', game, event)
+    for loc_id in range(START_ID, START_ID + 10000, 7):
+        game.current_location_id = loc_id
+        game.handle_location_visit(game_log)
+
+    def scan() -> int:
+        """Return the hash of the whole game state, found by scanning every item and location."""
+        return hash((game.current_location_id, tuple(item.current_position for item in game.get_items()),
+                     tuple((location.visited, location.looked, location.is_locked)
+                           for location in map(game.get_location, world.locations))))
+
+    scanned = _best_time(lambda: [scan() for _ in range(10)], 3) / 10
+    keyed = _best_time(lambda: [hash(game.get_state_key()) for _ in range(1000)], 3) / 1000
+    print('state snapshot: 10000 locations, 500 items (50 held)')
+    print(f'    scanning every item and location: {scanned * 1e6:9.1f} us')
+    print(f'    get_state_key:                    {keyed * 1e6:9.1f} us  ({scanned / keyed:.0f}x faster)')
+
+    held_names = {item.name for item in game.get_inventory_items()}
+    held = game.get_inventory_mask()
+    conditions = list(world.trigger_conditions.values())
+    masks = list(world.trigger_masks.values())
+    by_set = _best_time(lambda: [condition(held_names) for condition in conditions], 3) / len(conditions)
+    by_mask = _best_time(lambda: [held & required == required and not held & forbidden
+                                  for required, forbidden in masks], 3) / len(masks)
+    print(f'conditions: {len(conditions)} triggers, {len(masks)} plain conjunctions')
+    print(f'    inventory set:     {by_set * 1e9:7.1f} ns/check')
+    print(f'    inventory bitmask: {by_mask * 1e9:7.1f} ns/check  ({by_set / by_mask:.1f}x faster)')
+    game_world.clear_cache()
+
+
+def bench_items() -> None:
+    """Benchmark item pickup and drop as the number of items in the world grows."""
+    print('handle_item_pickup + handle_item_drop:')
+    for num_items in (100, 1000, 10000):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'world.json')
+            generate_world(path, WorldSpec(1000, events=10, items=num_items))
+            game = AdventureGame(path, START_ID)
+        item = game.get_item(f'item {num_items - 1}')
+        game.current_location_id = item.current_position
+        event = game.create_new_event()
+        rounds = 2000
+
+        def pickup_and_drop() -> None:
+            """Pick up and drop the item <rounds> times through the command handlers."""
+            for _ in range(rounds):
+                game.handle_item_pickup(f'pick up {item.name}', game, event)
+                game.handle_item_drop(f'drop {item.name}', game, event)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = _best_time(pickup_and_drop) / rounds
+        print(f'    {num_items:6} items: {elapsed * 1e6:8.2f} us/pickup+drop')
+
+
+def bench_undo_memory() -> None:
+    """Benchmark the peak RSS of whole sessions, each run in a fresh interpreter, to show how the
+    memory kept for undo grows with the number of commands.
+    """
+    print('session peak RSS (each in a fresh process):')
+    for kind, num_commands in (('win_walkthrough', 0), ('random', 1000), ('random', 100000)):
+        result = subprocess.run([sys.executable, __file__, '--memory-session', kind, str(num_commands)],
+                                capture_output=True, text=True, check=True)
+        commands, elapsed, peak_kib = result.stdout.split()
+        print(f'    {kind:16} {commands:>7} commands: {float(elapsed):7.2f} s, '
+              f'peak RSS {int(peak_kib) / 1024:8.1f} MiB')
+
+
+def _time_load(path: str, cold: bool, warm_process: bool) -> tuple[float, float]:
+    """Return the best times in seconds to read the game data at path and to construct an AdventureGame from it.
+    A cold load has no bundle on disk; otherwise the in-process cache is kept only if warm_process is True.
+    """
+    def prepare() -> None:
+        """Clear the in-process cache unless warm_process, and the bundles on disk if cold."""
+        if not warm_process:
+            game_world.clear_cache()
+        if cold:
+            bundle_dir = os.path.join(os.path.dirname(os.path.abspath(path)), game_world.BUNDLE_DIR)
+            for name in os.listdir(bundle_dir) if os.path.isdir(bundle_dir) else []:
+                os.remove(os.path.join(bundle_dir, name))
+
+    read_best = construct_best = float('inf')
+    for _ in range(5):
+        prepare()
+        start = time.perf_counter()
+        game_world.read_game_data(path)
+        read_best = min(read_best, time.perf_counter() - start)
+        prepare()
+        start = time.perf_counter()
+        AdventureGame(path, 1)
+        construct_best = min(construct_best, time.perf_counter() - start)
+    return read_best, construct_best
+
+
+def bench_load() -> None:
+    """Benchmark reading game data and constructing games: cold (JSON parse and bundle write), warm from the
+    bundle on disk (a new process), and warm from the in-process cache.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic = os.path.join(tmp, 'world.json')
+        generate_world(synthetic, WorldSpec(20000, events=5000, items=2000))
+        for label, path in (('game_data.json', os.path.join(tmp, GAME_DATA_FILE)), ('synthetic 20k', synthetic)):
+            if path.endswith(GAME_DATA_FILE):
+                with open(GAME_DATA_FILE, 'rb') as src, open(path, 'wb') as dst:
+                    dst.write(src.read())
+            print(f'{label} ({os.path.getsize(path) / 1024:.0f} KiB): read / AdventureGame(...)')
+            for mode, cold, warm_process in (('cold', True, False), ('warm bundle', False, False),
+                                             ('warm process', False, True)):
+                read_time, construct_time = _time_load(path, cold, warm_process)
+                print(f'    {mode:12}: {read_time * 1e3:8.3f} ms / {construct_time * 1e3:8.3f} ms')
+
+
+def bench_text_memory() -> None:
+    """Benchmark the Python heap held by a world with long descriptions: the parsed JSON (which every
+    description used to be materialized from) against the lazily loaded bundle, before and after showing
+    some of the descriptions.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'world.json')
+        generate_world(path, WorldSpec(20000, events=100, items=100, description_words=200))
+        game_world.compile_world(path)
+        print(f'synthetic world: 20000 locations, {os.path.getsize(path) / 2 ** 20:.1f} MiB of JSON')
+
+        tracemalloc.start()
+        with open(path, 'r', encoding='utf-8') as f:
+            eager = json.load(f)
+        print(f'    json.load (all text materialized): {tracemalloc.get_traced_memory()[0] / 2 ** 20:7.1f} MiB')
+        del eager
+        tracemalloc.stop()
+
+        game_world.clear_cache()
+        tracemalloc.start()
+        lazy = game_world.read_game_data(path)
+        print(f'    bundle (text left in the mmap):    {tracemalloc.get_traced_memory()[0] / 2 ** 20:7.1f} MiB')
+        for location in lazy['locations'][:200]:
+            str(location['long_description'])
+        print(f'    bundle, 200 descriptions shown:    {tracemalloc.get_traced_memory()[0] / 2 ** 20:7.1f} MiB')
+        tracemalloc.stop()
+        del lazy
+        game_world.clear_cache()
+
+
+def _unslotted_twin(cls: type) -> type:
+    """Return a plain (per-instance __dict__) dataclass with the same fields as the given dataclass."""
+    fields = [(f.name, f.type) if f.default is dataclasses.MISSING
+              else (f.name, f.type, dataclasses.field(default=f.default)) for f in dataclasses.fields(cls)]
+    return dataclasses.make_dataclass(cls.__name__, fields)
+
+
+def _bytes_per_instance(make: Callable[[int], object], count: int = 100000) -> float:
+    """Return the traced heap bytes per object of keeping <count> objects built by make(i)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make(i) for i in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return used / count
+
+
+def bench_entity_memory() -> None:
+    """Benchmark the memory per Event and per Location of the slotted dataclasses against plain dataclasses
+    with the same fields (what they were before). Shared field values are not counted.
+    """
+    commands = {'go east': 2, 'go west': 1}
+    items = []
+    snapshot = {}
+    print('bytes per instance (100000 instances):')
+    for cls, make in ((Event, lambda c, i: c(i % 256, 'text', 'go east', None, None, snapshot)),
+                      (Location, lambda c, i: c(i % 256, 'name', 'brief', 'long', commands, items))):
+        plain = _bytes_per_instance(lambda i, c=_unslotted_twin(cls): make(c, i))
+        slotted = _bytes_per_instance(lambda i, c=cls: make(c, i))
+        print(f'    {cls.__name__:8}: dataclass {plain:6.0f}, slotted dataclass {slotted:6.0f}')
+
+
+def bench_sessions() -> None:
+    """Benchmark the cost of each extra concurrent game once the world is loaded: how long a new game takes
+    to start, and how much memory it keeps when new and after playing the win walkthrough.
+    """
+    AdventureGame(GAME_DATA_FILE, 1)
+    commands = [command for command in load_demo_commands('win_walkthrough') if command != 'inquire']
+    count = 2000
+    start = time.perf_counter()
+    games = [AdventureGame(GAME_DATA_FILE, 1) for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    del games
+    new = _bytes_per_instance(lambda _: AdventureGame(GAME_DATA_FILE, 1), count)
+
+    def played(_: int) -> tuple[AdventureGame, EventList]:
+        """Return a new game and its event log after playing the commands."""
+        game = AdventureGame(GAME_DATA_FILE, 1)
+        game_log = EventList()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for command in commands:
+                play_command(game, game_log, command)
+        return game, game_log
+
+    after_win = _bytes_per_instance(played, 200)
+    print(f'per session: start {elapsed / count * 1e6:8.1f} us, new {new / 1024:7.1f} KiB, '
+          f'after win walkthrough (with its log) {after_win / 1024:7.1f} KiB')
+
+
+DEMO_NAMES = ['win_walkthrough', 'lose_demo', 'inventory_demo', 'scores_demo', 'first_time_event_demo',
+              'story_event_items_and_item_triggered_events_demo', 'openpdf_demo', 'objectives_demo']
+
+
+def bench_batch() -> None:
+    """Benchmark the throughput of proj1_batch on the proj1_simulation demos by worker count, against running
+    them one at a time in this process. Then check that jobs playing a missing or invalid game data file fail
+    without failing the good jobs in the same batch.
+    """
+    demos = [(name, load_demo_commands(name)) for name in DEMO_NAMES]
+    jobs = [SimulationJob(f'{name} {i}', GAME_DATA_FILE, 1, commands) for i in range(50) for name, commands in demos]
+    print(f'{len(jobs)} demo playthroughs ({os.cpu_count()} CPUs):')
+    for workers, chunksize in ((0, 1), (1, 1), (1, 25), (2, 25), (4, 25)):
+        start = time.perf_counter()
+        results = list(run_batch(jobs, workers, chunksize))
+        elapsed = time.perf_counter() - start
+        assert len(results) == len(jobs) and all(result.error is None for result in results)
+        label = 'in process' if workers == 0 else f'{workers} workers, chunks of {chunksize}'
+        print(f'    {label:26}: {elapsed:6.2f} s, {len(jobs) / elapsed:7.1f} jobs/s')
+
+    # A missing and an invalid game data file fail only the jobs playing them.
+    with tempfile.TemporaryDirectory() as tmp:
+        invalid = os.path.join(tmp, 'invalid.json')
+        with open(invalid, 'w', encoding='utf-8') as f:
+            f.write('{"locations": [')
+        bad_files = [os.path.join(tmp, 'missing.json'), invalid]
+        mixed = jobs[:4] + [SimulationJob(f'bad {i}', path, 1, ['look']) for i, path in enumerate(bad_files)]
+        for workers in (0, 2):
+            results = list(run_batch(mixed, workers, 2))
+            assert sorted(result.job_id for result in results) == sorted(job.job_id for job in mixed)
+            assert all((result.error is not None) == result.job_id.startswith('bad ') for result in results)
+
+
+def bench_output() -> None:
+    """Benchmark the time per command of simulating the win walkthrough with each kind of output sink."""
+    commands = load_demo_commands('win_walkthrough')
+    AdventureGameSimulation(GAME_DATA_FILE, 1, commands, NullSink())
+    print(f'win walkthrough ({len(commands)} commands), time per command:')
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        for label, make_sink in (('StreamSink to /dev/null', lambda: StreamSink(devnull)),
+                                 ('BufferedSink', BufferedSink),
+                                 ('NullSink', NullSink)):
+            elapsed = _best_time(lambda: AdventureGameSimulation(GAME_DATA_FILE, 1, commands, make_sink()), 20)
+            print(f'    {label:24}: {elapsed / len(commands) * 1e6:7.1f} us')
+
+
+def bench_render() -> None:
+    """Benchmark showing a description that has been shown before, with and without the render cache, and report
+    the cache's hit rate over the win walkthrough and a random session.
+    """
+    world = game_world.load_world(GAME_DATA_FILE)
+    game = AdventureGame(GAME_DATA_FILE, 1, NullSink())
+    location = game.get_location(100)
+    rounds = 10000
+    uncached = _best_time(lambda: [location.get_description() for _ in range(rounds)])
+    cached = _best_time(lambda: [game.describe(location) for _ in range(rounds)])
+    print(f'description of location 100: wrapped {uncached / rounds * 1e6:6.2f} us, '
+          f'cached {cached / rounds * 1e6:6.2f} us')
+
+    for label, play in (('win walkthrough', lambda: AdventureGameSimulation(
+                            GAME_DATA_FILE, 1, load_demo_commands('win_walkthrough'), BufferedSink())),
+                        ('random, 5000 commands', lambda: _play_random(5000))):
+        world.render_cache.clear()
+        play()
+        cache = world.render_cache
+        print(f'    {label:22}: {cache.hits} hits, {cache.misses} misses '
+              f'({cache.hits / (cache.hits + cache.misses):.1%} hit rate), {len(cache)} entries')
+
+
+def _play_random(num_commands: int) -> None:
+    """Play <num_commands> random commands through the adventure.py main loop, buffering the output."""
+    game = AdventureGame(GAME_DATA_FILE, 1, BufferedSink())
+    game_log = EventList()
+    rng = random.Random(111)
+    for _ in range(num_commands):
+        play_command(game, game_log, rng.choice(random_commands(game, rng)))
+
+
+def bench_commands() -> None:
+    """Benchmark validating player input at the prompt at location 100, with a few items in the inventory."""
+    game = AdventureGame(GAME_DATA_FILE, 1, NullSink())
+    game_log = EventList()
+    for command in ('tp 100', 'pick up wallet', 'pick up bag'):
+        game.play_turn(command, game_log)
+    choices = ['go west', 'look', 'drop wallet', 'use bag', 'tp 303', 'pick up nothing', 'dance']
+    rounds = 20000
+    elapsed = _best_time(lambda: [game.is_valid_command(choice) for _ in range(rounds) for choice in choices])
+    print(f'validate a command at the prompt: {elapsed / rounds / len(choices) * 1e6:6.3f} us')
+
+
+def bench_event_log() -> None:
+    """Benchmark the event list backends: adding events with a state snapshot like AdventureGame.create_new_event
+    makes, the memory they take, indexing into the log and getting the id log of a long session.
+    """
+    num_events = 100000
+    print(f'{num_events} events:')
+    for cls in (EventList, ArrayEventList):
+        def fill(event_list: EventList) -> EventList:
+            """Add <num_events> events to the given event list and return it."""
+            for i in range(num_events):
+                snapshot = {'score': i // 100, 'current_time': i, 'current_location_id': i % 256,
+                            'current_objective': 'Find the lost items', 'ongoing': True, 'journal_length': i // 2}
+                event_list.add_event(Event(i % 256, f'Location {i % 256}.', None, None, None, snapshot), 'go east')
+            return event_list
+
+        add = _best_time(lambda: fill(cls()), 3)
+        tracemalloc.start()
+        event_list = fill(cls())
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        id_log = _best_time(event_list.get_id_log, 5)
+        if isinstance(event_list, ArrayEventList):
+            middle = _best_time(lambda: event_list[num_events // 2], 5)
+        else:
+            middle = _best_time(lambda: _walk(event_list, num_events // 2), 5)
+        print(f'    {cls.__name__:14}: add {add / num_events * 1e6:5.2f} us/event, {memory / num_events:6.1f} B/event, '
+              f'get_id_log {id_log * 1e3:7.2f} ms, event {num_events // 2} {middle * 1e6:9.2f} us')
+
+
+def _walk(event_list: EventList, index: int) -> Event:
+    """Return the event at the given index of a linked event list by walking from its first event."""
+    event = event_list.first
+    for _ in range(index):
+        event = event.next
+    return event
+
+
+class _SyncJournal:
+    """A journal that writes and fsyncs every record before returning, for comparison with GameJournal."""
+
+    def __init__(self, path: str) -> None:
+        """Create (or empty) the journal file at the given path."""
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def append(self, id_num: int, command: str, inputs: list[str], delta: dict) -> None:
+        """Write the record and wait for it to reach the disk."""
+        self._file.write(json.dumps({'id': id_num, 'command': command, 'inputs': inputs, 'delta': delta}) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the file."""
+        self._file.close()
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Return the value at the given fraction of the way through sorted_values."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def bench_journal() -> None:
+    """Benchmark the latency of play_turn over 5000 random commands with no journal, with GameJournal (background
+    batched fsync) and with a journal that fsyncs every record in the command path.
+    """
+    num_commands = 5000
+    print(f'play_turn latency over {num_commands} random commands:')
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ('no journal', 'GameJournal', 'fsync per command'):
+            path = os.path.join(tmp, label.replace(' ', '_') + '.jsonl')
+            game = AdventureGame(GAME_DATA_FILE, 1, NullSink())
+            if label == 'GameJournal':
+                game.journal = GameJournal(path, GAME_DATA_FILE, 1)
+            elif label == 'fsync per command':
+                game.journal = _SyncJournal(path)
+            game_log = EventList()
+            rng = random.Random(111)
+            latencies = []
+            for _ in range(num_commands):
+                command = rng.choice(random_commands(game, rng))
+                start = time.perf_counter()
+                game.play_turn(command, game_log)
+                latencies.append(time.perf_counter() - start)
+            if game.journal is not None:
+                game.journal.close()
+            latencies.sort()
+            extra = ''
+            if isinstance(game.journal, GameJournal):
+                extra = f', {game.journal.batches_written} fsyncs'
+            print(f'    {label:18}: p50 {percentile(latencies, 0.5) * 1e6:7.1f} us, '
+                  f'p99 {percentile(latencies, 0.99) * 1e6:8.1f} us, '
+                  f'mean {sum(latencies) / num_commands * 1e6:7.1f} us{extra}')
+
+
+def bench_save() -> None:
+    """Benchmark save_game and load_game, and the save file size, after 5000 random commands in game_data.json
+    and after teleporting once to every location of a generated world of 100000 locations (visiting them all).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        world_path = os.path.join(tmp, 'synthetic.json')
+        generate_world(world_path, WorldSpec(100000, items=100))
+        sessions = []
+
+        game = AdventureGame(GAME_DATA_FILE, 1, NullSink())
+        game_log = EventList()
+        rng = random.Random(111)
+        for _ in range(5000):
+            game.play_turn(rng.choice(random_commands(game, rng)), game_log)
+        sessions.append(('game_data.json, 5000 random commands', game, game_log))
+
+        game = AdventureGame(world_path, START_ID, NullSink())
+        game_log = EventList()
+        game.handle_location_visit(game_log)
+        for loc_id in range(START_ID + 1, START_ID + 100000):
+            game.play_turn(f'tp {loc_id}', game_log)
+        sessions.append(('100000 locations, all visited', game, game_log))
+
+        save_path = os.path.join(tmp, 'game.sav')
+        for label, game, game_log in sessions:
+            save = _best_time(lambda: game.save_game(save_path, game_log), 3)
+            load = _best_time(lambda: AdventureGame.load_game(save_path, NullSink()), 3)
+            print(f'{label:37}: {len(game_log.get_id_log()):6} events, save {save * 1e3:7.2f} ms, '
+                  f'load {load * 1e3:7.2f} ms, {os.path.getsize(save_path) / 1024:8.1f} KiB')
+
+
+def bench_replay() -> None:
+    """Benchmark seeking to random steps of a lose_demo-style session of 10000 moves, by re-running the simulation
+    from the start and through GameReplay keyframes at a few intervals. Seeking the same step twice in a row must
+    give the event log of re-running from the start both times, and so must seeking in a session with undos.
+    """
+    lose_demo = load_demo_commands('lose_demo')
+    commands = lose_demo[:10] + ['go west', 'go east'] * 5000
+    rng = random.Random(111)
+    steps = [rng.randrange(len(commands) + 1) for _ in range(20)]
+    print(f'seek to {len(steps)} random steps of {len(commands)} commands:')
+
+    start = time.perf_counter()
+    id_logs = [AdventureGameSimulation(GAME_DATA_FILE, 1, commands[:step], NullSink()).get_events().get_id_log()
+               for step in steps]
+    print(f'    {"re-run from start":22}: {(time.perf_counter() - start) / len(steps) * 1e3:8.2f} ms/seek')
+
+    for interval in (64, 256, 1024):
+        tracemalloc.start()
+        start = time.perf_counter()
+        replay = GameReplay(GAME_DATA_FILE, 1, commands, interval)
+        build = time.perf_counter() - start
+        keyframe_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for step in steps:
+            replay.seek(step)
+        seek = (time.perf_counter() - start) / len(steps)
+        print(f'    {f"keyframes every {interval}":22}: {seek * 1e3:8.2f} ms/seek, build {build * 1e3:7.1f} ms, '
+              f'{keyframe_memory / 1024:7.0f} KiB')
+        for step, id_log in zip(steps, id_logs):
+            assert replay.seek(step).get_events().get_id_log() == replay.seek(step).get_events().get_id_log() == id_log
+
+    # Undo cuts the event log back below some keyframes, which seek must then skip.
+    commands = [rng.choice(lose_demo[:10] + ['undo'] * 4) for _ in range(2000)]
+    replay = GameReplay(GAME_DATA_FILE, 1, commands, 16)
+    assert len(replay.event_steps) == len(replay.seek(-1).get_events())
+    for step in [rng.randrange(len(commands) + 1) for _ in range(20)]:
+        simulation = AdventureGameSimulation(GAME_DATA_FILE, 1, commands[:step], NullSink())
+        assert replay.seek(step).get_events().get_id_log() == simulation.get_events().get_id_log()
+
+
+def bench_routes() -> None:
+    """Benchmark the route index on game_data.json (the full next-hop matrix) and on generated worlds of up to 50000
+    locations with a random portal out of each, every 100th one locked: building the graph, the first route to a
+    destination (one breadth-first search), a route to a destination already searched, and updating 32
+    destinations' tables when a location is unlocked, against searching them again.
+    """
+    index = RouteIndex(RouteGraph(game_world.load_world(GAME_DATA_FILE).graph))
+    elapsed = _best_time(lambda: RouteIndex(index.graph).build_all(), 3)
+    print(f'game_data.json: {len(index.graph.ids)} locations, {len(index.graph.edge_target)} moves, '
+          f'all-pairs next hops in {elapsed * 1e3:.2f} ms')
+
+    rng = random.Random(111)
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_locations in (1000, 10000, 50000):
+            path = os.path.join(tmp, f'world_{num_locations}.json')
+            generate_world(path, WorldSpec(num_locations))
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            for location in data['locations']:  # Portals, so that routes are not only paths along the grid.
+                location['available_commands']['go through portal'] = START_ID + rng.randrange(num_locations)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            world = game_world.load_world(path)
+            locked = range(START_ID + 50, START_ID + num_locations, 100)
+            start = time.perf_counter()
+            graph = RouteGraph(world.graph)
+            build = time.perf_counter() - start
+
+            targets = [START_ID + rng.randrange(num_locations) for _ in range(32)]
+            index = RouteIndex(graph, locked)
+            start = time.perf_counter()
+            for target in targets:
+                index.route(START_ID, target)
+            first = (time.perf_counter() - start) / len(targets)
+            cached = _best_time(lambda: [index.distance(START_ID + rng.randrange(num_locations), target)
+                                         for target in targets])
+            unlock = _best_time(lambda: index.copy().unlock(locked[0]), 3) - _best_time(index.copy, 3)
+
+            def search_again() -> None:
+                """Find the distance to every target in a new index, with the first locked location unlocked."""
+                fresh = RouteIndex(graph, locked[1:])
+                for target in targets:
+                    fresh.distance(START_ID, target)
+
+            rebuild = _best_time(search_again, 3)
+            print(f'{num_locations:6} locations: graph {build * 1e3:7.1f} ms, first route {first * 1e3:7.2f} ms, '
+                  f'cached {cached / len(targets) * 1e6:5.2f} us, unlock {unlock * 1e3:7.2f} ms '
+                  f'(searching again {rebuild * 1e3:7.1f} ms)')
+            game_world.clear_cache()
+
+
+def bench_solver() -> None:
+    """Benchmark the solver on game_data.json at several heuristic weights: the in-game time of the walkthrough
+    found, the states expanded per second and the peak memory traced during a second, traced search.
+    """
+    for weight in (5, 3, 2):
+        result = GameSolver(GAME_DATA_FILE, 1).solve(weight)
+        tracemalloc.start()
+        GameSolver(GAME_DATA_FILE, 1).solve(weight)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f'weight {weight}: wins at {result.current_time // 60}:{result.current_time % 60:02} with '
+              f'{len(result.commands)} commands, {result.expanded:5} states expanded ({result.seen:5} seen) in '
+              f'{result.elapsed:6.2f} s, {result.expanded / result.elapsed:5.0f} states/s, '
+              f'peak {peak / 2 ** 20:5.1f} MiB')
+        game_world.clear_cache()
+
+
+def bench_graph() -> None:
+    """Benchmark the compiled world graph on game_data.json and a generated world of 50000 locations with a random
+    portal out of each: compiling it, then reachability from one location, a 100000-step random walk and looking
+    up every command of every location, through the graph's arrays against through the Location objects'
+    available_commands.
+    """
+    rng = random.Random(111)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'world.json')
+        generate_world(path, WorldSpec(50000))
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        for location in data['locations']:
+            location['available_commands']['go through portal'] = START_ID + rng.randrange(50000)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        worlds = [('game_data.json', game_world.load_world(GAME_DATA_FILE)),
+                  ('50000 locations', game_world.load_world(path))]
+
+    for label, world in worlds:
+        locations = world.locations
+        start_id = next(iter(locations))
+        compile_time = _best_time(lambda: WorldGraph(locations), 3)
+        graph = world.graph
+
+        def reachable_by_dicts() -> list[int]:
+            """Return the IDs of the locations reachable from start_id, searching the location dicts."""
+            seen = {start_id}
+            queue = [start_id]
+            for loc_id in queue:
+                for target in locations[loc_id].available_commands.values():
+                    if target in locations and target not in seen:
+                        seen.add(target)
+                        queue.append(target)
+            return queue
+
+        def walk_by_dicts() -> list[int]:
+            """Return the IDs visited by a random walk from start_id, following the location dicts."""
+            walk_rng = random.Random(1)
+            loc_id = start_id
+            walk = [loc_id]
+            for _ in range(100000):
+                choices = [target for target in locations[loc_id].available_commands.values() if target in locations]
+                if not choices:
+                    break
+                loc_id = walk_rng.choice(choices)
+                walk.append(loc_id)
+            return walk
+
+        by_dicts = _best_time(reachable_by_dicts, 3)
+        by_graph = _best_time(lambda: graph.reachable(start_id, moves_only=False), 3)
+        walk_dicts = _best_time(walk_by_dicts, 3)
+        walk_graph = _best_time(lambda: graph.random_walk(start_id, 100000, random.Random(1), moves_only=False), 3)
+        pairs = [(loc_id, command) for loc_id, location in locations.items() for command in location.available_commands]
+        lookup_dicts = _best_time(lambda: [locations[loc_id].available_commands.get(command)
+                                           for loc_id, command in pairs], 3) / len(pairs)
+        lookup_graph = _best_time(lambda: [graph.find_edge(graph.nodes[loc_id], command)
+                                           for loc_id, command in pairs], 3) / len(pairs)
+        print(f'{label}: {len(graph.ids)} locations, {len(graph.edge_code)} commands '
+              f'({len(graph.commands)} distinct), compiled in {compile_time * 1e3:.1f} ms')
+        print(f'    reachability: dicts {by_dicts * 1e3:8.2f} ms, graph {by_graph * 1e3:8.2f} ms')
+        print(f'    random walk:  dicts {walk_dicts * 1e3:8.2f} ms, graph {walk_graph * 1e3:8.2f} ms')
+        print(f'    command lookup: dicts {lookup_dicts * 1e9:6.1f} ns, graph {lookup_graph * 1e9:6.1f} ns')
+    game_world.clear_cache()
+
+
+def bench_worlds() -> None:
+    """Benchmark generated worlds of 10^2 to 10^5 locations (see proj1_worldgen.WorldSpec.scaled): generating
+    and loading them, playing their walkthrough, and create_new_event and check_trigger_conditions partway through.
+    Larger worlds can be generated with proj1_worldgen.py.
+    """
+    print('generated worlds: generate / load / walkthrough, then create_new_event and check_trigger_conditions')
+    with tempfile.TemporaryDirectory() as tmp:
+        for exponent in range(2, 6):
+            path = os.path.join(tmp, f'world{exponent}.json')
+            start = time.perf_counter()
+            walkthrough = generate_world(path, WorldSpec.scaled(10 ** exponent))
+            generate_time = time.perf_counter() - start
+            start = time.perf_counter()
+            AdventureGame(path, START_ID, NullSink())
+            load_time = time.perf_counter() - start
+            start = time.perf_counter()
+            play_walkthrough(path, walkthrough)
+            play_time = time.perf_counter() - start
+
+            # Replay up to the first pick-up, so that the inventory holds an item.
+            game, _ = play_walkthrough(path, walkthrough[:next(i for i, command in enumerate(walkthrough)
+                                                             if command.startswith('pick up')) + 1])
+            item = game.get_inventory_items()[0]
+            event = game.create_new_event()
+            event_time = _best_time(lambda: [game.create_new_event() for _ in range(1000)], 3) / 1000
+
+            def drop_and_pick_up() -> None:
+                """Drop and pick up the item 500 times, checking the triggers after each."""
+                for _ in range(500):
+                    game.handle_item_drop(f'drop {item.name}', game, event)
+                    game.check_trigger_conditions()
+                    game.handle_item_pickup(f'pick up {item.name}', game, event)
+                    game.check_trigger_conditions()
+
+            trigger_time = _best_time(drop_and_pick_up, 3) / 1000
+            print(f'    10^{exponent}: {os.path.getsize(path) / 2 ** 20:7.1f} MiB, {generate_time * 1e3:8.1f} / '
+                  f'{load_time * 1e3:8.1f} / {play_time * 1e3:8.1f} ms ({len(walkthrough)} commands), '
+                  f'{event_time * 1e6:6.2f} us, {trigger_time * 1e6:6.2f} us')
+            game_world.clear_cache()
+
+
+def bench_stream_load() -> None:
+    """Benchmark the load time and peak RSS of building the world of large generated files, each in a fresh
+    interpreter: parsing the whole file against streaming it entity by entity (see game_world.stream_world).
+    """
+    print('world load, whole file / streamed (each in a fresh process):')
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_locations in (10 ** 5, 5 * 10 ** 5):
+            path = os.path.join(tmp, f'world{num_locations}.json')
+            generate_world(path, WorldSpec.scaled(num_locations))
+            for mode in ('whole', 'stream'):
+                result = subprocess.run([sys.executable, __file__, '--load-session', mode, path],
+                                        capture_output=True, text=True, check=True)
+                locations, elapsed, peak_kib = result.stdout.split()
+                print(f'    {os.path.getsize(path) / 2 ** 20:7.1f} MiB {mode:6}: {locations:>7} locations, '
+                      f'{float(elapsed):7.2f} s, peak RSS {int(peak_kib) / 1024:8.1f} MiB')
+            shutil.rmtree(os.path.join(tmp, game_world.BUNDLE_DIR), ignore_errors=True)
+            os.remove(path)
+
+
+def bench_stats() -> None:
+    """Benchmark 5000 random commands through play_turn without stats, with stats recording and with stats
+    recording and profiling, then show the stats recorded.
+    """
+    num_commands = 5000
+    print(f'play_turn over {num_commands} random commands:')
+    for label in ('no stats', 'stats', 'stats + profile'):
+        game = AdventureGame(GAME_DATA_FILE, 1, NullSink())
+        if label != 'no stats':
+            game.enable_stats()
+        if label == 'stats + profile':
+            game.stats.start_profile()
+        game_log = EventList()
+        rng = random.Random(111)
+        commands = []
+        start = time.perf_counter()
+        for _ in range(num_commands):
+            commands.append(rng.choice(random_commands(game, rng)))
+            game.play_turn(commands[-1], game_log)
+        print(f'    {label:15}: {(time.perf_counter() - start) / num_commands * 1e6:7.1f} us/command')
+    game.stats.stop_profile()
+    print(game.stats.report())
+    assert game.stats.counters['turns'] == sum(histogram.count for histogram in game.stats.commands.values())
+
+    # A goto is one turn, however many moves it plays.
+    game = AdventureGame(GAME_DATA_FILE, 1, NullSink())
+    game_log = EventList()
+    for command in load_demo_commands('win_walkthrough')[:9]:
+        game.play_turn(command, game_log)
+    stats = game.enable_stats()
+    game.play_turn('goto 302', game_log)
+    assert game.current_location_id == 302 and stats.phases['move'].count == 3
+    assert stats.counters['turns'] == stats.commands['goto'].count == 1 and len(stats.commands) == 1
+
+
+def bench_debug() -> None:
+    """Benchmark play_turn in debug mode over 20000 random commands, comparing the first and last 2000 commands:
+    debug output only shows the events each command adds, so later commands should cost no more than early ones.
+    """
+    num_commands, window = 20000, 2000
+    game = AdventureGame(GAME_DATA_FILE, 1, BufferedSink())
+    game.debug_mode = True
+    game_log = EventList()
+    rng = random.Random(111)
+    latencies = []
+    for _ in range(num_commands):
+        command = rng.choice(random_commands(game, rng))
+        start = time.perf_counter()
+        game.play_turn(command, game_log)
+        latencies.append(time.perf_counter() - start)
+        game.output.take()
+    print(f'debug mode play_turn over {num_commands} random commands:')
+    print(f'    first {window}: {sum(latencies[:window]) / window * 1e6:7.1f} us/command')
+    print(f'    last {window}:  {sum(latencies[-window:]) / window * 1e6:7.1f} us/command')
+
+
+BENCHMARKS = {
+    'conditions': bench_conditions,
+    'triggers': bench_triggers,
+    'items': bench_items,
+    'undo_memory': bench_undo_memory,
+    'load': bench_load,
+    'text_memory': bench_text_memory,
+    'entity_memory': bench_entity_memory,
+    'sessions': bench_sessions,
+    'batch': bench_batch,
+    'output': bench_output,
+    'render': bench_render,
+    'commands': bench_commands,
+    'event_log': bench_event_log,
+    'journal': bench_journal,
+    'save': bench_save,
+    'replay': bench_replay,
+    'routes': bench_routes,
+    'solver': bench_solver,
+    'state': bench_state,
+    'graph': bench_graph,
+    'worlds': bench_worlds,
+    'stream_load': bench_stream_load,
+    'stats': bench_stats,
+    'debug': bench_debug,
+}
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--memory-session']:
+        _run_memory_session(sys.argv[2], int(sys.argv[3]))
+        sys.exit()
+    if sys.argv[1:2] == ['--load-session']:
+        _run_load_session(sys.argv[2], sys.argv[3])
+        sys.exit()
+
+    for benchmark_name in sys.argv[1:] or list(BENCHMARKS):
+        BENCHMARKS[benchmark_name]()
@@ -22,14 +22,18 @@ This file is Copyright (c) 2025 CSC111 Teaching Team
 """
 
 from __future__ import annotations
+from array import array
 from dataclasses import dataclass
-from typing import Optional, Any
+from typing import Iterator, Optional, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """
     A node representing one event in an adventure game.
+
+    Events are slotted, so every attribute must be declared here. The item fields are only set by item pickups
+    and drops, and score_change only by the first pickup of an item.
     """
     id_num: int
     description: str
@@ -37,6 +41,24 @@ class Event:
     next: Optional['Event']
     prev: Optional['Event']
     state_snapshot: dict[str, Any]
+    item_affected: Optional[str] = None
+    item_prev_location: Optional[int] = None
+    score_change: Optional[int] = None
+
+
+def copy_event(event: Event) -> Event:
+    """Return a copy of the given event that is linked to no other event, with its own state snapshot."""
+    return Event(
+        id_num=event.id_num,
+        description=event.description,
+        next_command=event.next_command,
+        next=None,
+        prev=None,
+        state_snapshot=dict(event.state_snapshot),
+        item_affected=event.item_affected,
+        item_prev_location=event.item_prev_location,
+        score_change=event.score_change
+    )
 
 
 class EventList:
@@ -63,10 +85,17 @@ class EventList:
 
     def display_events(self) -> None:
         """Display all events in chronological order."""
+        for line in self.describe_events():
+            print(line)
+
+    def describe_events(self) -> list[str]:
+        """Return the lines display_events shows, one per event in chronological order."""
+        lines = []
         curr = self.first
         while curr:
-            print(f"Location: {curr.id_num}, Command: {curr.next_command}")
+            lines.append(f"Location: {curr.id_num}, Command: {curr.next_command}")
             curr = curr.next
+        return lines
 
     #  That is, the function headers (parameters, return type, etc.) must NOT be changed.
     def is_empty(self) -> bool:
@@ -120,6 +149,430 @@ class EventList:
 
     # Note: You may add other methods to this class as needed but DO NOT CHANGE THE SPECIFICATION OF ANY OF THE ABOVE
 
+    def __iter__(self) -> Iterator[Event]:
+        """Return an iterator over the events in this list, in chronological order. It stops at the last event even
+        if that event is linked to itself.
+        """
+        event = self.first
+        while event is not None:
+            yield event
+            if event is self.last:
+                break
+            event = event.next
+
+    def copy_events(self) -> list[Event]:
+        """Return copies of the events in this list, in chronological order, linked to no other event."""
+        return [copy_event(event) for event in self]
+
+    def events_since(self, marker: Optional[Event]) -> list[Event]:
+        """Return the events after the given event in this list (every event if it is None), in chronological order.
+
+        The list is walked back from its last event, so this only takes time for the events returned. The walk also
+        stops at an event added twice in a row, which is linked to itself.
+        """
+        events = []
+        event = self.last
+        while event is not None and event is not marker:
+            events.append(event)
+            if event.prev is event:
+                break
+            event = event.prev
+        events.reverse()
+        return events
+
+
+# The state_snapshot keys of the events AdventureGame.create_new_event makes, which ArrayEventList stores in arrays.
+SNAPSHOT_KEYS = ('score', 'current_time', 'current_location_id', 'current_objective', 'ongoing', 'journal_length')
+_SNAPSHOT_KEY_SET = frozenset(SNAPSHOT_KEYS)
+
+# The bits of ArrayEventList._flags.
+_HAS_SNAPSHOT = 1
+_ONGOING = 2
+_HAS_ITEM_PREV_LOCATION = 4
+_HAS_SCORE_CHANGE = 8
+
+# The string code of None.
+_NO_STRING = -1
+
+
+class ArrayEventList(EventList):
+    """An event list backed by arrays, for long sessions.
+
+    It has the same methods as EventList, but it keeps no Event objects: each field of each event is stored in an
+    array, with every string (command, description, objective and item name) stored once in a table and referred
+    to by its integer code. Indexing is O(1), get_id_log copies the array of location IDs instead of walking a
+    chain, and an event costs about a hundred bytes instead of an Event and its state_snapshot dict.
+
+    Events are rebuilt from the arrays when they are asked for, so the events of a list must not be changed after
+    they are added. Only the last event, and the newest event returned by events_since, are kept as objects, so
+    that checking them by identity keeps working; every other event is a new object each time. first returns all
+    the events as a chain linked through next and prev, ending in the last event. The chain is built on first use,
+    then kept: events added later are linked onto it the next time first is read, and removing an event cuts it
+    back. The chain holds an Event per event, so iterate over the list instead where possible, which keeps none.
+    An event whose fields do not fit the arrays (e.g. a state_snapshot with other keys) is kept as it was added.
+
+    Adding the event that is already last again only updates its next_command. (EventList would link the
+    event to itself, so that walking the list never ends until another event is added.)
+
+    Representation Invariants:
+        - all(len(column) == len(self._ids) for column in self._all_columns)
+        - all(0 <= index < len(self._ids) for index in self._others)
+    """
+    # Private Instance Attributes:
+    #   - _ids: the location ID of each event, in chronological order
+    #   - _commands: the string code of each event's next_command
+    #   - _descriptions: the string code of each event's description
+    #   - _items_affected: the string code of each event's item_affected
+    #   - _item_prev_locations: each event's item_prev_location, or 0 if it has none
+    #   - _score_changes: each event's score_change, or 0 if it has none
+    #   - _flags: the _HAS_SNAPSHOT, _ONGOING, _HAS_ITEM_PREV_LOCATION and _HAS_SCORE_CHANGE bits of each event
+    #   - _scores, _times, _locations, _objectives, _journal_lengths: the state_snapshot values of each event (the
+    #     objective as a string code), or 0 if it has no snapshot
+    #   - _strings: the string of each code
+    #   - _codes: the code of each string in _strings
+    #   - _others: the events that do not fit the arrays, as they were added, by index (their row holds only the
+    #     location ID)
+    #   - _last_event: the last event, if it has been added or rebuilt since it became last, or None
+    #   - _marker: the index and object of the newest event returned by events_since, or None
+    #   - _chain: the events of the chain first returns, in order, linked through next and prev (empty until first
+    #     is read); it may end before the last event, which is linked onto it when first is next read
+    #   - _all_columns: every array above, in the order of the values returned by _row
+
+    _ids: array
+    _commands: array
+    _descriptions: array
+    _items_affected: array
+    _item_prev_locations: array
+    _score_changes: array
+    _flags: array
+    _scores: array
+    _times: array
+    _locations: array
+    _objectives: array
+    _journal_lengths: array
+    _strings: list[str]
+    _codes: dict[str, int]
+    _others: dict[int, Event]
+    _last_event: Optional[Event]
+    _marker: Optional[tuple[int, Event]]
+    _chain: list[Event]
+    _all_columns: tuple[array, ...]
+
+    def __init__(self) -> None:
+        """Initialize a new empty event list."""
+        # first and last are properties here, so EventList.__init__ is not called.
+        # pylint: disable=super-init-not-called
+        self._ids = array('q')
+        self._commands = array('l')
+        self._descriptions = array('l')
+        self._items_affected = array('l')
+        self._item_prev_locations = array('q')
+        self._score_changes = array('q')
+        self._flags = array('B')
+        self._scores = array('q')
+        self._times = array('q')
+        self._locations = array('q')
+        self._objectives = array('l')
+        self._journal_lengths = array('q')
+        self._strings = []
+        self._codes = {}
+        self._others = {}
+        self._last_event = None
+        self._marker = None
+        self._chain = []
+        self._all_columns = (self._ids, self._commands, self._descriptions, self._items_affected,
+                             self._item_prev_locations, self._score_changes, self._flags, self._scores, self._times,
+                             self._locations, self._objectives, self._journal_lengths)
+
+    @property
+    def first(self) -> Optional[Event]:
+        """The first event of the chain of all the events in the list, or None if it is empty. Only the events
+        added since the chain was last read are built and linked onto it.
+        """
+        size = len(self._ids)
+        if not size:
+            return None
+        chain = self._chain
+        last = self.last
+        if len(chain) == size and chain[-1] is last:
+            return chain[0]
+
+        del chain[size - 1:]
+        start = len(chain)
+        chain.extend(self._build_event(i) for i in range(start, size - 1))
+        chain.append(last)
+        for i in range(max(start, 1), size):
+            chain[i - 1].next = chain[i]
+            chain[i].prev = chain[i - 1]
+        chain[0].prev = None
+        last.next = None
+        return chain[0]
+
+    @property
+    def last(self) -> Optional[Event]:
+        """The last event in the list, or None if it is empty."""
+        return self._event(len(self._ids) - 1) if self._ids else None
+
+    def __len__(self) -> int:
+        """Return the number of events in this list."""
+        return len(self._ids)
+
+    def __getitem__(self, index: int) -> Event:
+        """Return the event at the given position (negative positions count from the end)."""
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError('event list index out of range')
+        return self._event(index)
+
+    def __iter__(self) -> Iterator[Event]:
+        """Return an iterator over the events in this list, in chronological order, rebuilding them as they are
+        reached (so that, unlike walking from first, no chain of every event is made).
+        """
+        return (self._event(i) for i in range(len(self._ids)))
+
+    def copy_events(self) -> list[Event]:
+        """Return copies of the events in this list, in chronological order, linked to no other event."""
+        return [self._build_event(i) for i in range(len(self._ids))]
+
+    def copy(self, length: Optional[int] = None) -> ArrayEventList:
+        """Return a new list of the first <length> events of this list (by default, all of them), made by copying
+        the arrays, so that no event is rebuilt. Events kept as they were added are copied too.
+        """
+        if length is None or length > len(self._ids):
+            length = len(self._ids)
+        copied = ArrayEventList()
+        for column, copied_column in zip(self._all_columns, copied._all_columns):
+            copied_column.extend(column[:length])
+        copied._strings = list(self._strings)
+        copied._codes = dict(self._codes)
+        copied._others = {index: copy_event(event) for index, event in self._others.items() if index < length}
+        return copied
+
+    def describe_events(self) -> list[str]:
+        """Return the lines display_events shows, one per event in chronological order."""
+        lines = []
+        for i, (id_num, command) in enumerate(zip(self._ids, self._commands)):
+            command = self._others[i].next_command if i in self._others else self._string(command)
+            lines.append(f"Location: {id_num}, Command: {command}")
+        return lines
+
+    def is_empty(self) -> bool:
+        """Return whether this event list is empty."""
+        return not self._ids
+
+    def add_event(self, event: Event, command: Optional[str] = None) -> None:
+        """Add the given new event to the end of this event list.
+        The given command is the command which was used to reach this new event, or None if this is the first
+        event in the game.
+        """
+        event.next_command = command
+        index = len(self._ids)
+        if index and self._last_event is event:
+            if index - 1 not in self._others:
+                self._commands[-1] = self._code(command)
+            return
+
+        columns = self._all_columns
+        row = self._row(event)
+        if row is not None:
+            try:
+                (ids, commands, descriptions, items_affected, item_prev_locations, score_changes, flags, scores,
+                 times, locations, objectives, journal_lengths) = columns
+                (id_num, command, description, item_affected, item_prev_location, score_change, flag, score, time,
+                 location_id, objective, journal_length) = row
+                ids.append(id_num)
+                commands.append(command)
+                descriptions.append(description)
+                items_affected.append(item_affected)
+                item_prev_locations.append(item_prev_location)
+                score_changes.append(score_change)
+                flags.append(flag)
+                scores.append(score)
+                times.append(time)
+                locations.append(location_id)
+                objectives.append(objective)
+                journal_lengths.append(journal_length)
+            except OverflowError:  # An int too big for its array.
+                row = None
+        if row is None:
+            for column in columns:
+                del column[index:]
+            self._ids.append(event.id_num)
+            for column in columns[1:]:
+                column.append(0)
+            self._others[index] = event
+        self._last_event = event
+
+    def remove_last_event(self) -> Optional[Event]:
+        """Remove the last event from this event list, reverting any item changes if necessary."""
+        if not self._ids:
+            return None
+
+        index = len(self._ids) - 1
+        removed_event = self._event(index)
+        for column in self._all_columns:
+            column.pop()
+        self._others.pop(index, None)
+        self._last_event = None
+        del self._chain[index:]
+        if self._chain and len(self._chain) == index:
+            # The chain still ends in the new last event, which stays the same object.
+            self._chain[-1].next = None
+            if index - 1 not in self._others:
+                self._last_event = self._chain[-1]
+        if self._marker is not None and self._marker[0] >= index:
+            # The newest event returned is gone, so the new last event takes its place.
+            self._marker = (index - 1, self._event(index - 1)) if index else None
+        return removed_event
+
+    def get_id_log(self) -> list[int]:
+        """Return a list of all location IDs visited for each event in this list, in sequence."""
+        return self._ids.tolist()
+
+    def events_since(self, marker: Optional[Event]) -> list[Event]:
+        """Return the events after the given event in this list (every event if it is None, or if it is not the
+        last event, the newest event this method returned, or an event kept as it was added), in chronological
+        order.
+        """
+        end = len(self._ids)
+        start = 0
+        if marker is not None:
+            if marker is self._last_event:
+                start = end
+            elif self._marker is not None and marker is self._marker[1]:
+                start = self._marker[0] + 1
+            else:
+                start = next((index + 1 for index, event in self._others.items() if event is marker), 0)
+        events = [self._event(i) for i in range(start, end)]
+        if events:
+            self._marker = (end - 1, events[-1])
+        return events
+
+    def iter_ids(self) -> Iterator[int]:
+        """Return an iterator over the location IDs of the events in this list, in sequence, without copying them.
+        """
+        return iter(self._ids)
+
+    def id_view(self) -> memoryview:
+        """Return a read-only view of the location IDs of the events in this list, without copying them.
+
+        No event can be added or removed while the view exists, so release it as soon as possible, e.g. by using
+        it as a context manager:
+
+            with event_list.id_view() as ids:
+                ...
+        """
+        return memoryview(self._ids).toreadonly()
+
+    def _row(self, event: Event) -> Optional[tuple[int, ...]]:
+        """Return the values stored in the arrays for the given event, or None if it does not fit them."""
+        snapshot = event.state_snapshot
+        if type(event.description) is not str or type(snapshot) is not dict:
+            return None
+        flags = 0
+        item_code = _NO_STRING
+        if event.item_affected is not None or event.item_prev_location is not None or event.score_change is not None:
+            if (not _is_string(event.item_affected) or not _is_int(event.item_prev_location)
+                    or not _is_int(event.score_change)):
+                return None
+            item_code = self._code(event.item_affected)
+            if event.item_prev_location is not None:
+                flags |= _HAS_ITEM_PREV_LOCATION
+            if event.score_change is not None:
+                flags |= _HAS_SCORE_CHANGE
+        command = event.next_command
+        command_code = _NO_STRING
+        if command is not None:
+            if type(command) is not str:
+                return None
+            command_code = self._codes.get(command)
+            if command_code is None:
+                command_code = self._code(command)
+        if not snapshot:
+            return (event.id_num, command_code, self._code(event.description), item_code,
+                    event.item_prev_location or 0, event.score_change or 0, flags, 0, 0, 0, 0, 0)
+        if snapshot.keys() != _SNAPSHOT_KEY_SET:
+            return None
+        score, current_time, location_id, objective, ongoing, journal_length = (
+            snapshot['score'], snapshot['current_time'], snapshot['current_location_id'],
+            snapshot['current_objective'], snapshot['ongoing'], snapshot['journal_length'])
+        if (type(score) is not int or type(current_time) is not int or type(location_id) is not int
+                or type(objective) is not str or type(ongoing) is not bool or type(journal_length) is not int):
+            return None
+        flags |= _HAS_SNAPSHOT | (_ONGOING if ongoing else 0)
+        return (event.id_num, command_code, self._code(event.description), item_code,
+                event.item_prev_location or 0, event.score_change or 0, flags, score, current_time, location_id,
+                self._code(objective), journal_length)
+
+    def _event(self, index: int) -> Event:
+        """Return the event at the given (non-negative) index: the object kept for it if there is one, otherwise
+        a new one. The last event is kept once it has been rebuilt.
+        """
+        last = len(self._ids) - 1
+        if index == last and self._last_event is not None:
+            return self._last_event
+        if self._marker is not None and self._marker[0] == index:
+            event = self._marker[1]
+        elif index in self._others:
+            event = self._others[index]
+        else:
+            event = self._build_event(index)
+        if index == last:
+            self._last_event = event
+        return event
+
+    def _build_event(self, index: int) -> Event:
+        """Return a new event, linked to no other, with the fields of the event at the given index."""
+        if index in self._others:
+            return copy_event(self._others[index])
+        flags = self._flags[index]
+        snapshot = {}
+        if flags & _HAS_SNAPSHOT:
+            snapshot = {
+                'score': self._scores[index],
+                'current_time': self._times[index],
+                'current_location_id': self._locations[index],
+                'current_objective': self._strings[self._objectives[index]],
+                'ongoing': bool(flags & _ONGOING),
+                'journal_length': self._journal_lengths[index]
+            }
+        return Event(
+            id_num=self._ids[index],
+            description=self._strings[self._descriptions[index]],
+            next_command=self._string(self._commands[index]),
+            next=None,
+            prev=None,
+            state_snapshot=snapshot,
+            item_affected=self._string(self._items_affected[index]),
+            item_prev_location=self._item_prev_locations[index] if flags & _HAS_ITEM_PREV_LOCATION else None,
+            score_change=self._score_changes[index] if flags & _HAS_SCORE_CHANGE else None
+        )
+
+    def _code(self, text: Optional[str]) -> int:
+        """Return the code of the given string, adding it to the table if needed, or _NO_STRING for None."""
+        if text is None:
+            return _NO_STRING
+        code = self._codes.get(text)
+        if code is None:
+            code = self._codes[text] = len(self._strings)
+            self._strings.append(text)
+        return code
+
+    def _string(self, code: int) -> Optional[str]:
+        """Return the string with the given code, or None for _NO_STRING."""
+        return None if code == _NO_STRING else self._strings[code]
+
+
+def _is_string(value: object) -> bool:
+    """Return whether the given value is a str or None."""
+    return value is None or type(value) is str
+
+
+def _is_int(value: object) -> bool:
+    """Return whether the given value is an int (not a bool) or None."""
+    return value is None or type(value) is int
+
 
 if __name__ == "__main__":
     # When you are ready to check your work with python_ta, uncomment the following lines.
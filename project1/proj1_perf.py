@@ -0,0 +1,344 @@
+"""CSC111 Project 1: Text Adventure Game - Engine Performance Suite
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module times the engine's hot paths one call at a time: loading the game data, each
+kind of menu and game command, creating events, undoing, checking story triggers, and simulating
+every demo walkthrough of proj1_simulation.py. For each operation it reports latency percentiles
+and the peak memory allocated by one call. Run it from the project1 directory:
+
+    python proj1_perf.py [--rounds N] [--save FILE] [--compare FILE] [--tolerance T] [operation ...]
+
+Operations are named like "menu.look" or "simulation.win_walkthrough"; naming a prefix such as "menu"
+runs every operation under it. --save writes the results to a JSON baseline, and --compare checks them
+against one, exiting with status 1 if an operation's median latency or peak memory grew by more than
+the tolerance (a fraction, 0.25 by default). Timings depend on the machine, so baselines are only
+meaningful locally; files named perf_baseline*.json are ignored by git.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from adventure import AdventureGame
+from game_output import NullSink
+import game_world
+from proj1_benchmarks import GAME_DATA_FILE, load_demo_commands, percentile
+from proj1_event_logger import EventList
+from proj1_simulation import AdventureGameSimulation
+
+BASELINE_VERSION = 1
+
+# The demo walkthroughs of proj1_simulation.py.
+DEMOS = ('win_walkthrough', 'lose_demo', 'inventory_demo', 'scores_demo', 'first_time_event_demo',
+         'story_event_items_and_item_triggered_events_demo', 'openpdf_demo', 'objectives_demo')
+
+# The commands played before each command is timed: the player is in their room (location 100), with the wallet
+# picked up and a few events in the log. The item commands are timed on the wallet (which is used elsewhere, so
+# "use" takes the refusal path), and the move is one of the room's own commands.
+SETUP_COMMANDS = ['tp 100', 'look', 'pick up wallet', 'score']
+ITEM = 'wallet'
+MOVE_COMMAND = 'go west'
+
+# The number of calls traced for peak memory (tracing makes them too slow to time).
+MEMORY_ROUNDS = 5
+
+
+@dataclass
+class OperationStats:
+    """The latency and memory of one operation, over a number of timed calls.
+
+    Instance Attributes:
+        - name:
+            The name of the operation.
+        - samples:
+            The number of timed calls.
+        - p50_us, p90_us, p99_us, max_us:
+            The 50th, 90th and 99th percentiles and the maximum of the call latencies, in microseconds.
+        - peak_kib:
+            The largest peak of memory allocated during one traced call, in KiB.
+
+    Representation Invariants:
+        - self.samples > 0
+        - 0 <= self.p50_us <= self.p90_us <= self.p99_us <= self.max_us
+        - self.peak_kib >= 0
+    """
+    name: str
+    samples: int
+    p50_us: float
+    p90_us: float
+    p99_us: float
+    max_us: float
+    peak_kib: float
+
+
+# An operation is a function that prepares one call (untimed) and returns the call to time.
+Operation = Callable[[], Callable[[], object]]
+
+
+def measure(name: str, prepare: Operation, rounds: int) -> OperationStats:
+    """Return the stats of <rounds> timed calls of the given operation, each prepared afresh, and of MEMORY_ROUNDS
+    more calls traced with tracemalloc.
+    """
+    latencies = []
+    for _ in range(rounds):
+        call = prepare()
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    peak = 0
+    for _ in range(min(rounds, MEMORY_ROUNDS)):
+        call = prepare()
+        tracemalloc.start()
+        try:
+            call()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+
+    return OperationStats(name, rounds, percentile(latencies, 0.5) * 1e6, percentile(latencies, 0.9) * 1e6,
+                          percentile(latencies, 0.99) * 1e6, latencies[-1] * 1e6, peak / 1024)
+
+
+def _setup_game(setup: Optional[list[str]] = None) -> tuple[AdventureGame, EventList]:
+    """Return a silent game of GAME_DATA_FILE and its log, after playing the given commands (by default,
+    SETUP_COMMANDS) as the adventure.py main loop would.
+    """
+    game = AdventureGame(GAME_DATA_FILE, 1, NullSink())
+    game_log = EventList()
+    for command in SETUP_COMMANDS if setup is None else setup:
+        game.play_turn(command, game_log)
+    return game, game_log
+
+
+def _menu_command(choice: str) -> Operation:
+    """Return the operation of process_menu_command(choice) in a set-up game."""
+    def prepare() -> Callable[[], object]:
+        """Return the menu command to time, on a newly set-up game."""
+        game, game_log = _setup_game()
+        return lambda: game.process_menu_command(choice, game, game_log)
+    return prepare
+
+
+def _game_command(choice: str, setup: Optional[list[str]] = None) -> Operation:
+    """Return the operation of process_game_command(choice) in a game set up with the given commands."""
+    def prepare() -> Callable[[], object]:
+        """Return the game command to time, on a newly set-up game."""
+        game, game_log = _setup_game(setup)
+        return lambda: game.process_game_command(choice, game, game_log)
+    return prepare
+
+
+def _simulation(demo: str) -> Operation:
+    """Return the operation of simulating the given demo walkthrough of proj1_simulation.py."""
+    commands = load_demo_commands(demo)
+    return lambda: lambda: AdventureGameSimulation(GAME_DATA_FILE, 1, commands, NullSink())
+
+
+def engine_operations(scratch_dir: str) -> dict[str, Operation]:
+    """Return every operation of the suite by name. Loading from JSON works on a copy of GAME_DATA_FILE in the
+    given directory, so that the bundle of the original is kept.
+    """
+    json_copy = os.path.join(scratch_dir, GAME_DATA_FILE)
+    shutil.copyfile(GAME_DATA_FILE, json_copy)
+    bundle_dir = os.path.join(scratch_dir, game_world.BUNDLE_DIR)
+
+    def load_json() -> Callable[[], object]:
+        """Clear the cache and the bundle, and return a load of the JSON copy."""
+        game_world.clear_cache()
+        shutil.rmtree(bundle_dir, ignore_errors=True)
+        return lambda: game_world.load_world(json_copy)
+
+    def load_bundle() -> Callable[[], object]:
+        """Make sure the bundle exists, clear the cache, and return a load from the bundle."""
+        game_world.clear_cache()
+        game_world.load_world(GAME_DATA_FILE)  # Makes sure the bundle exists.
+        game_world.clear_cache()
+        return lambda: game_world.load_world(GAME_DATA_FILE)
+
+    def load_cached() -> Callable[[], object]:
+        """Make sure the world is cached, and return a load from the cache."""
+        game_world.load_world(GAME_DATA_FILE)
+        return lambda: game_world.load_world(GAME_DATA_FILE)
+
+    def create_event() -> Callable[[], object]:
+        """Return the event creation of a newly set-up game."""
+        game, _ = _setup_game()
+        return game.create_new_event
+
+    def undo() -> Callable[[], object]:
+        """Return an undo of the last turn of a newly set-up game."""
+        game, game_log = _setup_game()
+        return lambda: game.handle_undo_command(game_log)
+
+    def triggers_unchanged() -> Callable[[], object]:
+        """Return a trigger check of a set-up game whose inventory has not changed since the last one."""
+        game, _ = _setup_game()
+        game.check_trigger_conditions()
+        return game.check_trigger_conditions
+
+    def triggers_changed() -> Callable[[], object]:
+        """Return a trigger check of a set-up game whose inventory has just changed."""
+        game, game_log = _setup_game(SETUP_COMMANDS[:2])
+        game.process_game_command(f'pick up {ITEM}', game, game_log)  # Leaves the triggers to re-evaluate.
+        return game.check_trigger_conditions
+
+    operations = {
+        'load.json': load_json,
+        'load.bundle': load_bundle,
+        'load.cached': load_cached,
+    }
+    for choice in ('look', 'inventory', 'score', 'time', 'objective', 'log', 'toggledebug'):
+        operations[f'menu.{choice}'] = _menu_command(choice)
+    operations.update({
+        'game.move': _game_command(MOVE_COMMAND),
+        'game.pick_up': _game_command(f'pick up {ITEM}', SETUP_COMMANDS[:2]),
+        'game.drop': _game_command(f'drop {ITEM}'),
+        'game.use': _game_command(f'use {ITEM}'),
+        'game.examine': _game_command(f'examine {ITEM}'),
+        'game.teleport': _game_command('tp 100'),
+        'create_new_event': create_event,
+        'handle_undo_command': undo,
+        'check_trigger_conditions.unchanged': triggers_unchanged,
+        'check_trigger_conditions.changed': triggers_changed,
+    })
+    for demo in DEMOS:
+        operations[f'simulation.{demo}'] = _simulation(demo)
+    return operations
+
+
+def select(names: list[str], patterns: list[str]) -> list[str]:
+    """Return the names equal to or under (as in "menu" for "menu.look") any of the given patterns, in order,
+    or all names if there are no patterns. Raise KeyError if a pattern matches no name.
+    """
+    if not patterns:
+        return list(names)
+    for pattern in patterns:
+        if not any(name == pattern or name.startswith(pattern + '.') for name in names):
+            raise KeyError(f'No operation named {pattern}')
+    return [name for name in names if any(name == p or name.startswith(p + '.') for p in patterns)]
+
+
+def run_suite(patterns: list[str], rounds: int) -> list[OperationStats]:
+    """Measure the operations matching the given patterns (see select) with <rounds> timed calls each, printing
+    each one's stats as it finishes.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        operations = engine_operations(scratch_dir)
+        names = select(list(operations), patterns)
+        print(f'{"operation":60} {"p50 us":>10} {"p90 us":>10} {"p99 us":>10} {"max us":>10} {"peak KiB":>9}')
+        for name in names:
+            stats = measure(name, operations[name], rounds)
+            print(f'{name:60} {stats.p50_us:10.1f} {stats.p90_us:10.1f} {stats.p99_us:10.1f} {stats.max_us:10.1f} '
+                  f'{stats.peak_kib:9.1f}')
+            results.append(stats)
+    game_world.clear_cache()
+    return results
+
+
+def save_baseline(path: str, results: list[OperationStats]) -> None:
+    """Write the given results to a JSON baseline file at path."""
+    baseline = {
+        'version': BASELINE_VERSION,
+        'python': platform.python_version(),
+        'operations': {stats.name: asdict(stats) for stats in results}
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+
+def load_baseline(path: str) -> dict[str, OperationStats]:
+    """Return the results stored in the JSON baseline file at path, by operation name.
+    Raise ValueError if the file was written by a different version of this suite.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f'{path} is not a version {BASELINE_VERSION} baseline')
+    return {name: OperationStats(**stats) for name, stats in baseline['operations'].items()}
+
+
+def compare(results: list[OperationStats], baseline: dict[str, OperationStats], tolerance: float) -> list[str]:
+    """Print how the given results compare with the baseline, and return the names of the operations whose median
+    latency or peak memory is more than (1 + tolerance) times the baseline's. Operations missing from the baseline
+    are reported but never regressions.
+    """
+    regressions = []
+    print(f'\n{"operation":60} {"p50 ratio":>10} {"peak ratio":>10}')
+    for stats in results:
+        old = baseline.get(stats.name)
+        if old is None:
+            print(f'{stats.name:60} {"(new)":>10}')
+            continue
+        time_ratio = stats.p50_us / old.p50_us if old.p50_us else 1.0
+        # Allow 1 KiB of slack so that tiny allocations don't flag noise.
+        memory_ratio = (stats.peak_kib + 1) / (old.peak_kib + 1)
+        regressed = time_ratio > 1 + tolerance or memory_ratio > 1 + tolerance
+        if regressed:
+            regressions.append(stats.name)
+        print(f'{stats.name:60} {time_ratio:10.2f} {memory_ratio:10.2f}{"  REGRESSED" if regressed else ""}')
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the suite with the given command line arguments and return the exit status."""
+    parser = argparse.ArgumentParser(description='Time the engine operations and check them against a baseline.')
+    parser.add_argument('operations', nargs='*', help='operations or prefixes of operations to run (default: all)')
+    parser.add_argument('--rounds', type=int, default=200, help='timed calls per operation')
+    parser.add_argument('--save', metavar='FILE', help='write the results to this JSON baseline')
+    parser.add_argument('--compare', metavar='FILE', help='check the results against this JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='the fraction an operation may slow down or grow before it counts as a regression')
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    try:
+        results = run_suite(args.operations, args.rounds)
+    except KeyError as error:
+        parser.error(error.args[0])
+    if args.save:
+        save_baseline(args.save, results)
+        print(f'\nSaved the baseline to {args.save}.')
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s): {", ".join(regressions)}')
+            return 1
+        print('\nNo regressions.')
+    return 0
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
+    sys.exit(main())
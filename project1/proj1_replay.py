@@ -0,0 +1,180 @@
+"""CSC111 Project 1: Text Adventure Game - Replay
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module replays a recorded command log (as given to AdventureGameSimulation) silently,
+keeping a keyframe of the full game state every few commands, so that the state at any point of a
+long session can be restored by replaying only the commands after the nearest keyframe. From the
+project1 directory:
+
+    python proj1_replay.py jobs.jsonl JOB_ID STEP [STEP ...] [--every K]
+
+replays the job with the given id from a proj1_batch jobs file and prints the game state after the
+given numbers of commands, one JSON object per step.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import json
+from array import array
+from typing import Optional
+
+from adventure import AdventureGame
+from game_output import NullSink
+from game_save import SavedGame
+from proj1_batch import read_jobs
+from proj1_event_logger import ArrayEventList
+from proj1_simulation import AdventureGameSimulation
+
+DEFAULT_KEYFRAME_INTERVAL = 256
+
+
+class GameReplay:
+    """A command log replayed silently through AdventureGameSimulation, with keyframes of the full game state.
+
+    Step i is the state after the first i commands of the log (step 0 is the start of the game). The whole log is
+    replayed once when the replay is created, keeping the final event log and undo journal, and a keyframe of the
+    game state at every multiple of keyframe_interval steps. A keyframe holds only the game's own state and the
+    lengths of the event log and undo journal at its step: seek(i) restores the keyframe at or before step i with
+    the first that many events and journal entries of the final ones, then replays at most keyframe_interval - 1
+    commands.
+
+    An "undo" in the log removes the last event and journal entries, and the entries added afterwards replace
+    them in the final log and journal. A keyframe whose log or journal was cut back like this after its step is
+    dropped, and seek starts from the keyframe before it instead (or from the start of the game).
+
+    Instance Attributes:
+        - game_data_file:
+            The game data file the log was recorded in.
+        - initial_location_id:
+            The location ID the log starts at.
+        - commands:
+            The recorded commands.
+        - keyframe_interval:
+            The number of steps between two keyframes.
+        - event_steps:
+            For each event in the event log after the last step, the step that added it to the log.
+
+    Representation Invariants:
+        - self.keyframe_interval > 0
+        - len(self._keyframes) == len(self.commands) // self.keyframe_interval + 1
+        - len(self.event_steps) == len(self._events)
+    """
+    # Private Instance Attributes:
+    #   - _keyframes: for step i * keyframe_interval, for each i, the game state at that step (without its event
+    #     log and undo journal) and the lengths of the event log and undo journal then, or None if the keyframe
+    #     was dropped
+    #   - _events: the event log after the last step
+    #   - _undo_journal: the undo journal after the last step
+
+    game_data_file: str
+    initial_location_id: int
+    commands: list[str]
+    keyframe_interval: int
+    event_steps: array
+    _keyframes: list[Optional[tuple[SavedGame, int, int]]]
+    _events: ArrayEventList
+    _undo_journal: list[tuple[str, int | str, int | bool]]
+
+    def __init__(self, game_data_file: str, initial_location_id: int, commands: list[str],
+                 keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> None:
+        """Replay the given commands from the given start, keeping a keyframe every keyframe_interval steps."""
+        self.game_data_file = game_data_file
+        self.initial_location_id = initial_location_id
+        self.commands = commands
+        self.keyframe_interval = keyframe_interval
+        self.event_steps = array('q', [0])
+        self._keyframes = []
+
+        simulation = AdventureGameSimulation(game_data_file, initial_location_id, [], NullSink())
+        game = simulation.get_game()
+        events = simulation.get_events()
+        # The indexes of the keyframes not dropped. Their log and journal lengths never decrease along it, so
+        # those cut back by a command are always at its end.
+        kept = []
+        for step, command in enumerate(commands):
+            if step % keyframe_interval == 0:
+                kept.append(len(self._keyframes))
+                self._keyframes.append((game.get_saved_state(), len(events), len(game.get_undo_journal())))
+            simulation.process_command(command)
+            log_length, journal_length = len(events), len(game.get_undo_journal())
+            while kept and (self._keyframes[kept[-1]][1] > log_length or self._keyframes[kept[-1]][2] > journal_length):
+                self._keyframes[kept.pop()] = None
+            del self.event_steps[log_length:]
+            self.event_steps.extend([step + 1] * (log_length - len(self.event_steps)))
+        if len(commands) % keyframe_interval == 0:
+            self._keyframes.append((game.get_saved_state(), len(events), len(game.get_undo_journal())))
+        self._events = events
+        self._undo_journal = game.get_undo_journal()
+
+    def __len__(self) -> int:
+        """Return the number of steps that can be sought, i.e. one more than the number of commands."""
+        return len(self.commands) + 1
+
+    def seek(self, step: int) -> AdventureGameSimulation:
+        """Return a new, silent simulation in the state after the first <step> commands of the log.
+        A negative step counts back from the end of the log, as in list indexing.
+        """
+        if step < 0:
+            step += len(self)
+        if not 0 <= step < len(self):
+            raise IndexError(f'step {step} is out of range for a log of {len(self.commands)} commands')
+
+        index = step // self.keyframe_interval
+        while index >= 0 and self._keyframes[index] is None:
+            index -= 1
+        if index < 0:
+            return AdventureGameSimulation(self.game_data_file, self.initial_location_id, self.commands[:step],
+                                           NullSink())
+
+        state, log_length, journal_length = self._keyframes[index]
+        game, events = AdventureGame.from_saved_state(state, NullSink(), self._events.copy(log_length),
+                                                      self._undo_journal[:journal_length])
+        simulation = AdventureGameSimulation.resume(game, events)
+        for command in self.commands[index * self.keyframe_interval:step]:
+            simulation.process_command(command)
+        return simulation
+
+    def seek_event(self, index: int) -> AdventureGameSimulation:
+        """Return a new, silent simulation in the state after the step that added the event at the given index of
+        the final event log. A step may add several events, so the log may go on past that event.
+        """
+        return self.seek(self.event_steps[index])
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
+    parser = argparse.ArgumentParser(description='Show the game state at given steps of a recorded playthrough.')
+    parser.add_argument('jobs', help='JSON lines file of jobs, as read by proj1_batch')
+    parser.add_argument('job_id', help='id of the job to replay')
+    parser.add_argument('steps', type=int, nargs='+', help='numbers of commands to replay')
+    parser.add_argument('--every', type=int, default=DEFAULT_KEYFRAME_INTERVAL,
+                        help='number of commands between two keyframes')
+    args = parser.parse_args()
+
+    job = next(job for job in read_jobs(args.jobs) if job.job_id == args.job_id)
+    replay = GameReplay(job.game_data_file, job.initial_location_id, job.commands, args.every)
+    for step_number in args.steps:
+        replayed_game = replay.seek(step_number).get_game()
+        print(json.dumps({'step': step_number, 'current_location_id': replayed_game.current_location_id,
+                          'score': replayed_game.score, 'current_time': replayed_game.current_time,
+                          'current_objective': replayed_game.current_objective,
+                          'ongoing': replayed_game.ongoing}))
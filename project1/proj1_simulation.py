@@ -21,8 +21,15 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2025 CSC111 Teaching Team
 """
 from __future__ import annotations
-from proj1_event_logger import Event, EventList
+from typing import Optional
+
+from proj1_event_logger import ArrayEventList, Event, EventList
 from adventure import AdventureGame
+from game_commands import MENU, MOVE, PICK_UP, USE, DROP, TELEPORT, parse_command
+from game_output import OutputSink
+
+# The verbs other than moving and menu commands that the simulator accepts.
+SIMULATED_GAME_VERBS = frozenset({PICK_UP, USE, DROP, TELEPORT})
 
 
 class AdventureGameSimulation:
@@ -30,40 +37,59 @@ class AdventureGameSimulation:
     _game: AdventureGame
     _events: EventList
 
-    def __init__(self, game_data_file: str, initial_location_id: int, commands: list[str]) -> None:
-        """Initialize a new game simulation with a list of commands."""
-        self._events = EventList()
-        self._game = AdventureGame(game_data_file, initial_location_id)
+    def __init__(self, game_data_file: str, initial_location_id: int, commands: list[str],
+                 output: Optional[OutputSink] = None) -> None:
+        """Initialize a new game simulation with a list of commands.
+        The game's output goes to the given sink (by default, standard output); pass a NullSink to run silently.
+        """
+        self._events = ArrayEventList()
+        self._game = AdventureGame(game_data_file, initial_location_id, output)
         initial_location = self._game.get_location()
 
-        # Add first event
+        # Add first event, with the starting state, so that undoing it keeps the game where it is.
         self._events.add_event(Event(
             id_num=initial_location.id_num,
-            description=initial_location.long_description,
+            description=str(initial_location.long_description),
             next_command='start',  # Change from None to 'start'
             next=None,
             prev=None,
-            state_snapshot={}
+            state_snapshot=self._game.create_new_event().state_snapshot
         ), command=None)
 
         self.generate_events(commands)
 
+    @classmethod
+    def resume(cls, game: AdventureGame, events: EventList) -> AdventureGameSimulation:
+        """Return a simulation continuing the given game, whose events so far are in the given log.
+        No first event is added, and no commands are run.
+        """
+        simulation = cls.__new__(cls)
+        simulation._game = game
+        simulation._events = events
+        return simulation
+
     def generate_events(self, commands: list[str]) -> None:
         """Generate all events based on the given list of commands."""
         for command in commands:
             if not self.process_command(command):
-                print(f"Invalid command: {command}")
+                self._game.output.print(f"Invalid command: {command}")
 
     def process_command(self, command: str) -> bool:
-        """Process a single command and generate the corresponding event."""
+        """Process a single command and generate the corresponding event.
+
+        The event holds the state from before the command, so "undo" reverts the last command run; like the
+        adventure.py main loop, "undo" itself adds no event.
+        """
         current_location = self._game.get_location()
+        # Unlike the adventure.py main loop, the simulator tries the location's own commands before any verb.
+        parsed = parse_command(command, current_location.available_commands, location_first=True)
+        new_event = self._game.create_new_event()
 
-        if command in current_location.available_commands:
+        if parsed.verb == MOVE:
             self._game.move(command)
-        elif (command.startswith("pick up ") or command.startswith("use ")
-              or command.startswith("drop ") or command.startswith("tp ")):
-            self._game.process_game_command(command, self._game, self._events)
-        elif command in ["look", "inventory", "score", "undo", "log", "quit", "time", "objective", "toggledebug"]:
+        elif parsed.verb in SIMULATED_GAME_VERBS:
+            self._game.process_game_command(command, self._game, self._events, parsed)
+        elif parsed.verb == MENU:
             self._game.process_menu_command(command, self._game, self._events)
         else:
             return False
@@ -71,16 +97,12 @@ class AdventureGameSimulation:
         self._game.check_trigger_conditions()
 
         self._game.handle_location_visit(self._events)
+        if parsed.verb == MENU and command == 'undo':
+            return True
 
         new_location = self._game.get_location()
-        new_event = Event(
-            id_num=new_location.id_num,
-            description=new_location.get_description(),
-            next_command=command,
-            next=None,
-            prev=None,
-            state_snapshot={}
-        )
+        new_event.id_num = new_location.id_num
+        new_event.description = self._game.describe(new_location)
         self._events.add_event(new_event, command)
         return True
 
@@ -88,12 +110,20 @@ class AdventureGameSimulation:
         """Return a list of all visited location IDs."""
         return self._events.get_id_log()
 
+    def get_events(self) -> EventList:
+        """Return the simulation's event log."""
+        return self._events
+
+    def get_game(self) -> AdventureGame:
+        """Return the simulated game, in its state after the last command."""
+        return self._game
+
     def run(self) -> None:
         """Run the game simulation and print location descriptions."""
         current_event = self._events.first
         while current_event:
             if current_event is not self._events.last:
-                print("You chose:", current_event.next_command)
+                self._game.output.print("You chose:", current_event.next_command)
             current_event = current_event.next
 
 
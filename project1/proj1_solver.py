@@ -0,0 +1,437 @@
+"""CSC111 Project 1: Text Adventure Game - Solver
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module searches for a fast winning walkthrough of a game: the commands, as given to
+AdventureGameSimulation, that reach the Victory story event before the 4:00 PM deadline. Every
+command is played by the real game engine, so story events, puzzles and item triggers behave
+exactly as in a simulation. From the project1 directory:
+
+    python proj1_solver.py [--data game_data.json] [--start 1] [--weight W] [--workers N]
+
+prints the walkthrough, then its length, finishing time and the search statistics. With
+--weight 0 the walkthrough is a fastest one, but the search can take very long.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import heapq
+import itertools
+import time
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+from adventure import AdventureGame
+from game_conditions import compile_condition
+from game_entities import Puzzle, StoryEvent
+from game_items import INVENTORY
+from game_output import NullSink
+from game_save import LOCKED, VISITED, SavedGame
+from game_routes import RouteGraph
+from game_world import GameWorld, load_world
+from proj1_event_logger import ArrayEventList
+from proj1_simulation import AdventureGameSimulation
+
+DEADLINE = 16 * 60
+VICTORY = "Victory"
+DEFAULT_WEIGHT = 3
+
+# Outcomes of playing a command.
+ONGOING = 0
+WON = 1
+LOST = 2
+
+
+@dataclass(frozen=True, slots=True)
+class SearchState:
+    """Everything about a game in progress that decides what later commands do, apart from the time.
+
+    The time is left out because it only matters for the deadline: reaching a state earlier is never worse, so
+    the solver keeps the earliest time it has found each state at. The score, objective and the flags of the
+    other locations are left out because no command depends on them.
+
+    Instance Attributes:
+        - location_id:
+            The ID of the current location.
+        - moved_items:
+            The (dense index, current position) of every item away from its starting position, in index order
+            (see ItemRegistry.moved).
+        - visited:
+            The dense indexes of the solver's tracked_locations whose visited flag differs from how the world
+            starts (see LocationFlags.snapshot).
+        - locked:
+            The dense indexes of the solver's tracked_locations whose is_locked flag differs from how the world
+            starts.
+    """
+    location_id: int
+    moved_items: tuple[tuple[int, int], ...]
+    visited: frozenset[int]
+    locked: frozenset[int]
+
+
+@dataclass
+class SolverResult:
+    """The outcome of a search.
+
+    Instance Attributes:
+        - commands:
+            The commands of the winning walkthrough found, or None if the game cannot be won before the deadline.
+        - current_time:
+            The in-game time the walkthrough wins at, or the deadline if there is none.
+        - expanded:
+            The number of times a state's commands were played.
+        - seen:
+            The number of distinct states reached.
+        - elapsed:
+            The search time, in seconds.
+    """
+    commands: Optional[list[str]]
+    current_time: int
+    expanded: int
+    seen: int
+    elapsed: float
+
+
+class GameSolver:
+    """A best-first (A*) search over the states of a game, from its starting state to its Victory story event.
+
+    Most commands only walk from one plain location (not a story event or puzzle) to another: when the location
+    walked into is unlocked and has no first-visit story event left to play, and no story event is waiting on a
+    trigger, the walk changes nothing but the location and the time, a minute per move. The search therefore
+    never stops between such moves. From each state, it finds the shortest walks to every location it can walk
+    to, and only plays the commands that may change more than that at the end of each walk: the location's
+    other commands, picking up each useful item there and using each held item where it can be used. From a
+    story event or puzzle, or while a trigger is waiting, every command is played on its own. Looking around,
+    dropping items, teleporting and the other menu commands never bring a win closer, so they are not tried;
+    nor are commands leading to a location missing from the game data, which would crash the game.
+
+    Each command is played by the game engine, on a game restored from the state at the end of the walk. The
+    state it leads to is looked up in a table of every state seen so far, which keeps the earliest time it was
+    reached and the commands that reached it. States are expanded in order of their time plus weight times the
+    number of milestones they have left (see milestones_left). With a weight of 0 this is a uniform-cost search,
+    and the walkthrough found is a fastest one; but the states of a game multiply with every milestone that can
+    be reached in either order, so this can take very long. A positive weight heads for states that have made
+    more progress, finding a winning walkthrough after expanding a small part of the states, with no guarantee
+    that it is the fastest.
+
+    Instance Attributes:
+        - game_data_file:
+            The game data file to solve.
+        - initial_location_id:
+            The location ID the game starts at.
+        - tracked_locations:
+            The IDs of the locations whose flags can change what later commands do: those with a first-visit
+            story event (which only plays while the location is unvisited) and those that start locked.
+        - useful_items:
+            The lowercased names of the items worth picking up: those with a use_location and those some trigger
+            or unlock condition mentions. Every other item changes nothing but the inventory listing.
+    """
+    # Private Instance Attributes:
+    #   - _digest: the SHA-256 of the game data file, for restoring games
+    #   - _start_positions: the start_position of every item, in game data order
+    #   - _tracked_nodes: the dense indexes of tracked_locations
+    #   - _useful_indexes: the dense indexes of the useful items
+    #   - _world: the game data's world
+    #   - _graph: the moves between the game's locations
+    #   - _walkable: for each node of _graph (numbered like the locations' dense indexes), 1 if it is a plain
+    #     location that is not tracked, 2 if it is a plain tracked location (walkable depending on its flags) and
+    #     0 otherwise
+
+    game_data_file: str
+    initial_location_id: int
+    tracked_locations: tuple[int, ...]
+    useful_items: frozenset[str]
+    _digest: str
+    _start_positions: array
+    _tracked_nodes: frozenset[int]
+    _useful_indexes: frozenset[int]
+    _world: GameWorld
+    _graph: RouteGraph
+    _walkable: bytearray
+
+    def __init__(self, game_data_file: str, initial_location_id: int) -> None:
+        """Initialize a solver for the given game data file and starting location."""
+        world = load_world(game_data_file)
+        self.game_data_file = game_data_file
+        self.initial_location_id = initial_location_id
+        self.tracked_locations = tuple(loc_id for loc_id, location in world.locations.items()
+                                       if location.first_time_event_id or location.is_locked)
+        all_names = {item.name.lower() for item in world.items}
+        mentioned = set()
+        for location in world.locations.values():
+            for condition in (getattr(location, 'trigger_condition', None), location.unlock_condition):
+                if condition:
+                    names = compile_condition(condition).items
+                    mentioned |= all_names if names is None else {name.lower() for name in names}
+        self.useful_items = frozenset(item.name.lower() for item in world.items
+                                      if item.use_location is not None or item.name.lower() in mentioned)
+        self._digest = world.digest
+        self._start_positions = array('q', (item.start_position for item in world.items))
+        self._tracked_nodes = frozenset(world.location_flags.index[loc_id] for loc_id in self.tracked_locations)
+        self._useful_indexes = frozenset(i for i, item in enumerate(world.items)
+                                         if item.name.lower() in self.useful_items)
+        self._world = world
+        self._graph = RouteGraph(world.graph)
+
+        self._walkable = bytearray(0 if isinstance(location, (StoryEvent, Puzzle))
+                                   else 2 if node in self._tracked_nodes else 1
+                                   for node, location in enumerate(world.locations.values()))
+
+    def initial_state(self) -> tuple[SearchState, int]:
+        """Return the state and time of a new simulation of the game."""
+        game = AdventureGameSimulation(self.game_data_file, self.initial_location_id, [], NullSink()).get_game()
+        return self._capture(game), game.current_time
+
+    def successors(self, state: SearchState, current_time: int) -> list[tuple[list[str], Optional[SearchState],
+                                                                                int, int]]:
+        """Return (commands, resulting state, resulting time, outcome) for each walk and command tried at the given
+        state and time. The resulting state is None if the commands lose the game.
+        """
+        results = []
+        for node, walk in self._walks(state, current_time).items():
+            here = state
+            if self._graph.ids[node] != state.location_id:
+                here = SearchState(self._graph.ids[node], state.moved_items, state.visited, state.locked)
+            for command in self._commands(here, walk is not None and bool(self._walkable[node])):
+                game = self._restore(here, current_time + len(walk or ()))
+                simulation = AdventureGameSimulation.resume(game, ArrayEventList())
+                if simulation.process_command(command):
+                    commands = [*(self._graph.edge_command[edge] for edge in walk or ()), command]
+                    if game.ongoing:
+                        results.append((commands, self._capture(game), game.current_time, ONGOING))
+                    elif game.get_location().name == VICTORY:
+                        results.append((commands, self._capture(game), game.current_time, WON))
+                    else:
+                        results.append((commands, None, game.current_time, LOST))
+        return results
+
+    def milestones_left(self, state: SearchState) -> int:
+        """Return the number of useful items still at their start positions and tracked locations still with their
+        starting flags in the given state.
+        """
+        return (len(self._useful_indexes) - sum(i in self._useful_indexes for i, _ in state.moved_items)
+                + len(self.tracked_locations) - len(state.visited | state.locked))
+
+    def solve(self, weight: float = DEFAULT_WEIGHT, workers: int = 0, chunksize: int = 16) -> SolverResult:
+        """Return a winning walkthrough, searching with the given heuristic weight and number of worker processes
+        (0 expands every state in this process). Workers are given the chunksize * workers best states at a time.
+        """
+        start = time.perf_counter()
+        root, initial_time = self.initial_state()
+        # The earliest time each state was reached at, the state and commands it was first reached from then, and
+        # the outcome of those commands.
+        seen = {root: (initial_time, None, ONGOING)}
+        order = itertools.count()
+        frontier = [(initial_time + weight * self.milestones_left(root), initial_time, next(order), root)]
+        expanded = 0
+        executor = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                       initargs=(self.game_data_file, self.initial_location_id)) if workers else None
+        batch_size = chunksize * workers if workers else 1
+        try:
+            while frontier:
+                batch = []
+                while frontier and len(batch) < batch_size:
+                    entry = heapq.heappop(frontier)
+                    state, current_time = entry[3], entry[1]
+                    if seen[state][0] != current_time:
+                        continue
+                    if seen[state][2] != WON:
+                        batch.append((state, current_time))
+                    elif batch:  # Expand the better states first: they may lead to an earlier win.
+                        heapq.heappush(frontier, entry)
+                        break
+                    else:
+                        return SolverResult(self._path(seen, state), current_time, expanded, len(seen),
+                                            time.perf_counter() - start)
+                expanded += len(batch)
+                for (state, _), results in zip(batch, self._expand_all(batch, executor, chunksize)):
+                    for commands, child, child_time, outcome in results:
+                        if child is None or child_time >= DEADLINE:
+                            continue
+                        best = seen.get(child)
+                        if best is None or child_time < best[0]:
+                            seen[child] = (child_time, (state, commands), outcome)
+                            heapq.heappush(frontier, (child_time + weight * self.milestones_left(child), child_time,
+                                                      next(order), child))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return SolverResult(None, DEADLINE, expanded, len(seen), time.perf_counter() - start)
+
+    def _expand_all(self, batch: list[tuple[SearchState, int]], executor: Optional[Executor],
+                    chunksize: int) -> list[list[tuple[list[str], Optional[SearchState], int, int]]]:
+        """Return the successors of every (state, time) in the given batch, in order, using the executor if there
+        is one.
+        """
+        if executor is None:
+            return [self.successors(state, current_time) for state, current_time in batch]
+        return list(executor.map(_expand_in_worker, *zip(*batch), chunksize=chunksize))
+
+    @staticmethod
+    def _path(seen: dict[SearchState, tuple], state: SearchState) -> list[str]:
+        """Return the commands that reach the given state from the root of the search."""
+        steps = []
+        parent = seen[state][1]
+        while parent is not None:
+            state, commands = parent
+            steps.append(commands)
+            parent = seen[state][1]
+        return [command for commands in reversed(steps) for command in commands]
+
+    def _walks(self, state: SearchState, current_time: int) -> dict[int, Optional[list[int]]]:
+        """Return the moves of a shortest walk from the given state's location to every node that can be walked to
+        before the deadline, including the location itself (an empty walk), by node. If the player cannot walk
+        from the state's location, only its node is returned, mapped to None.
+        """
+        graph = self._graph
+        source = graph.nodes[state.location_id]
+        if not self._walkable[source] or self._trigger_waiting(state):
+            return {source: None}
+
+        walks = {source: []}
+        queue = [source]
+        for node in queue:  # The queue grows while it is read, in order of distance.
+            walk = walks[node]
+            if current_time + len(walk) + 1 >= DEADLINE:
+                break
+            for edge in range(graph.edge_start[node], graph.edge_start[node + 1]):
+                target = graph.edge_target[edge]
+                if target not in walks and self._can_walk_into(target, state):
+                    walks[target] = [*walk, edge]
+                    queue.append(target)
+        return walks
+
+    def _can_walk_into(self, node: int, state: SearchState) -> bool:
+        """Return whether moving into the given node changes nothing but the location and time in the given state."""
+        walkable = self._walkable[node]
+        if walkable != 2:
+            return bool(walkable)
+        flags = self._world.location_flags
+        if flags.is_locked[node] != (node in state.locked):
+            return False
+        return bool(flags.visited[node] != (node in state.visited)
+                    or not self._world.locations[self._graph.ids[node]].first_time_event_id)
+
+    def _trigger_waiting(self, state: SearchState) -> bool:
+        """Return whether some story event's trigger_condition holds for the inventory of the given state."""
+        positions = self._positions(state)
+        held = 0
+        for i, position in enumerate(positions):
+            if position == INVENTORY:
+                held |= 1 << i
+        names = None
+        for event_id, condition in self._world.trigger_conditions.items():
+            masks = self._world.trigger_masks.get(event_id)
+            if masks is not None:
+                if held & masks[0] == masks[0] and not held & masks[1]:
+                    return True
+                continue
+            if names is None:
+                names = {item.name for item, position in zip(self._world.items, positions) if position == INVENTORY}
+            if condition(names):
+                return True
+        return False
+
+    def _positions(self, state: SearchState) -> array:
+        """Return the current_position of every item in the given state, in game data order."""
+        positions = array('q', self._start_positions)
+        for i, position in state.moved_items:
+            positions[i] = position
+        return positions
+
+    def _commands(self, state: SearchState, walking: bool) -> list[str]:
+        """Return the commands worth trying at the end of a walk to the given state. If walking, the moves into
+        locations that can be walked into are left out, as the walks already cover them.
+        """
+        location = self._world.locations[state.location_id]
+        graph = self._graph
+        skipped = set()
+        if walking:
+            node = graph.nodes[state.location_id]
+            skipped = {graph.edge_command[edge] for edge in range(graph.edge_start[node], graph.edge_start[node + 1])
+                       if self._can_walk_into(graph.edge_target[edge], state)}
+        commands = [command for command, target in location.available_commands.items()
+                    if target in graph.nodes and command not in skipped]
+        for item, position in zip(self._world.items, self._positions(state)):
+            name = item.name.lower()
+            if position == state.location_id and name in self.useful_items and not isinstance(location, StoryEvent):
+                commands.append(f"pick up {name}")
+            elif position == -1 and item.use_location == state.location_id:
+                commands.append(f"use {name}")
+        return commands
+
+    def _capture(self, game: AdventureGame) -> SearchState:
+        """Return the given game's state."""
+        location_id, moved_items, (visited, _, locked) = game.get_state_key()
+        return SearchState(location_id, moved_items, visited & self._tracked_nodes, locked & self._tracked_nodes)
+
+    def _restore(self, state: SearchState, current_time: int) -> AdventureGame:
+        """Return a silent game in the given state at the given time."""
+        start = self._world.location_flags
+        nodes = [self._graph.nodes[loc_id] for loc_id in self.tracked_locations]
+        flags = array('B', ((VISITED if start.visited[node] != (node in state.visited) else 0)
+                            | (LOCKED if start.is_locked[node] != (node in state.locked) else 0) for node in nodes))
+        saved = SavedGame(self.game_data_file, self._digest, 0, current_time, state.location_id, '', True, False,
+                          self._positions(state), self._start_positions, array('q', self.tracked_locations), flags,
+                          array('B'), array('q'), array('q'), [])
+        return AdventureGame.from_saved_state(saved, NullSink(), ArrayEventList())[0]
+
+
+# The solver of a worker process.
+_worker_solver: Optional[GameSolver] = None
+
+
+def _init_worker(game_data_file: str, initial_location_id: int) -> None:
+    """Create the solver of a worker process."""
+    global _worker_solver
+    _worker_solver = GameSolver(game_data_file, initial_location_id)
+
+
+def _expand_in_worker(state: SearchState, current_time: int) -> list[tuple[list[str], Optional[SearchState], int,
+                                                                            int]]:
+    """Return the successors of the given state, in a worker process."""
+    return _worker_solver.successors(state, current_time)
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
+    import resource
+
+    parser = argparse.ArgumentParser(description='Find the fastest winning walkthrough of a game.')
+    parser.add_argument('--data', default='game_data.json', help='game data file')
+    parser.add_argument('--start', type=int, default=1, help='starting location ID')
+    parser.add_argument('--weight', type=float, default=DEFAULT_WEIGHT,
+                        help='heuristic weight (0 finds a fastest walkthrough, but can take very long)')
+    parser.add_argument('--workers', type=int, default=0, help='number of worker processes (0 searches in this one)')
+    args = parser.parse_args()
+
+    result = GameSolver(args.data, args.start).solve(args.weight, args.workers)
+    if result.commands is None:
+        print('The game cannot be won before the deadline.')
+    else:
+        for solution_command in result.commands:
+            print(solution_command)
+        print(f'{len(result.commands)} commands, winning at {result.current_time // 60}:{result.current_time % 60:02}')
+    print(f'{result.expanded} states expanded, {result.seen} seen in {result.elapsed:.2f} s '
+          f'({result.expanded / result.elapsed:.0f} states/s), '
+          f'peak memory {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB')
@@ -0,0 +1,406 @@
+"""CSC111 Project 1: Text Adventure Game - World Generator
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module writes synthetic game data files in the format of game_data.json, for testing
+how the engine scales with the size of the world. A world has a given number of locations, story
+events with trigger conditions, locked locations with unlock conditions, puzzles and items, and
+comes with a walkthrough that wins it. The same counts and seed always give the same file and
+walkthrough. From the project1 directory:
+
+    python proj1_worldgen.py OUTPUT [--locations N] [--events N] [--locked N] [--puzzles N] [--items N]
+                             [--description-words N] [--seed S] [--walkthrough FILE] [--check]
+
+writes the world to OUTPUT and its walkthrough (one command per line) to FILE or standard output.
+With --check, the walkthrough is also played on the new world to make sure it wins.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2025 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import math
+import random
+import sys
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, TextIO
+
+from adventure import AdventureGame
+from game_output import NullSink, OutputSink
+from proj1_event_logger import EventList
+
+# The locations form a grid, numbered row by row from the top left corner. The walkthrough stays in the top left
+# QUEST_SPAN x QUEST_SPAN corner, apart from the vault just east of it, and the other locked locations, puzzle
+# entrances and items are only placed below the corner's rows, so that the walkthrough never meets them.
+QUEST_SPAN = 4
+MIN_LOCATIONS = (QUEST_SPAN + 1) ** 2
+
+# The location ID of grid cell i is i + 1; the walkthrough starts in cell 0.
+START_ID = 1
+
+# The names of the items of the walkthrough's quest. Holding every relic triggers the quest's story event.
+VAULT_KEY = 'vault key'
+RELICS = ('relic 1', 'relic 2', 'relic 3')
+QUEST_TOKEN = 'quest token'
+
+# The ways out of a grid cell: (command, column step, row step).
+DIRECTIONS = (('go north', 0, -1), ('go south', 0, 1), ('go east', 1, 0), ('go west', -1, 0))
+
+# The number of entries encoded to JSON at a time.
+WRITE_BATCH = 4096
+
+# Words the puzzle answers and description padding are made of.
+ANSWER_WORDS = ('turkey', 'robarts', 'bahen', 'sedra', 'markus', 'reveille', 'pamphlet', 'charger')
+
+
+@dataclass
+class WorldSpec:
+    """How many of each kind of entity a generated world has, besides the few the walkthrough's quest adds
+    (the vault, its key, the relics, the quest's story event and puzzle, and the Victory event).
+
+    Instance Attributes:
+        - locations:
+            The number of plain locations, laid out as a grid.
+        - events:
+            The number of story events with a trigger condition on the items.
+        - locked:
+            The number of locked locations with an unlock condition on the items.
+        - puzzles:
+            The number of puzzles, each entered from a location and left by its password.
+        - items:
+            The number of items, placed at random locations.
+        - description_words:
+            The number of extra words padding the long description of each location.
+        - seed:
+            The seed of the random choices.
+
+    Representation Invariants:
+        - self.locations >= MIN_LOCATIONS
+        - self.events >= 0 and self.locked >= 0 and self.puzzles >= 0 and self.items >= 0
+        - self.description_words >= 0
+    """
+    locations: int
+    events: int = 0
+    locked: int = 0
+    puzzles: int = 0
+    items: int = 0
+    description_words: int = 0
+    seed: int = 111
+
+    @classmethod
+    def scaled(cls, locations: int, seed: int = 111) -> WorldSpec:
+        """Return the spec of a world with the given number of locations and about as many story events, puzzles,
+        items and locked locations per location as game_data.json.
+        """
+        return cls(locations, events=locations, locked=max(1, locations // 20), puzzles=max(1, locations // 10),
+                   items=max(3, locations // 2), seed=seed)
+
+
+class _Grid:
+    """The grid of plain locations of a generated world.
+
+    Instance Attributes:
+        - size:
+            The number of cells.
+        - width:
+            The number of cells in a row (the last row may be shorter).
+        - open_start:
+            The first cell below the quest's rows; every cell from it on is free for the world's own entities.
+    """
+    size: int
+    width: int
+    open_start: int
+
+    def __init__(self, size: int) -> None:
+        """Initialize a grid of the given number of cells, as close to square as possible."""
+        self.size = size
+        self.width = math.isqrt(size - 1) + 1
+        self.open_start = QUEST_SPAN * self.width
+
+    def cell(self, column: int, row: int) -> int:
+        """Return the cell at the given column and row."""
+        return row * self.width + column
+
+    def neighbours(self, cell: int) -> Iterable[tuple[str, int]]:
+        """Yield the command to and the cell of each neighbour of the given cell."""
+        row, column = divmod(cell, self.width)
+        for command, column_step, row_step in DIRECTIONS:
+            new_column, new_row = column + column_step, row + row_step
+            if 0 <= new_column < self.width and new_row >= 0:
+                neighbour = self.cell(new_column, new_row)
+                if neighbour < self.size:
+                    yield command, neighbour
+
+    def path(self, source: int, target: int) -> list[str]:
+        """Return the moves from source to target: first along source's column, then along target's row."""
+        source_row, source_column = divmod(source, self.width)
+        target_row, target_column = divmod(target, self.width)
+        vertical = 'go south' if target_row > source_row else 'go north'
+        horizontal = 'go east' if target_column > source_column else 'go west'
+        return [vertical] * abs(target_row - source_row) + [horizontal] * abs(target_column - source_column)
+
+
+def generate_world(path: str, spec: WorldSpec) -> list[str]:
+    """Write the game data file of a world with the given spec to path and return a winning walkthrough of it,
+    starting at START_ID: the commands as the adventure.py main loop reads them, with each password answer right
+    after its "password" command (as in the game log).
+
+    Raise ValueError if the spec has fewer than MIN_LOCATIONS locations, more locked locations than fit outside
+    the quest's corner, or too few items for the conditions of its story events or locked locations.
+    """
+    if spec.locations < MIN_LOCATIONS:
+        raise ValueError(f'A world needs at least {MIN_LOCATIONS} locations')
+    grid = _Grid(spec.locations)
+    if spec.locked > spec.locations - grid.open_start:
+        raise ValueError(f'At most {spec.locations - grid.open_start} of these locations can be locked')
+    if spec.events and spec.items < 3:
+        raise ValueError('Story events need at least 3 items for their trigger conditions')
+    if spec.locked and not spec.items:
+        raise ValueError('Locked locations need at least 1 item for their unlock conditions')
+
+    rng = random.Random(spec.seed)
+    item_names = [f'item {i}' for i in range(spec.items)]
+    ids = _IdAllocator(spec.locations)
+
+    # The walkthrough's quest: the key and two relics in the corner, the third relic in the vault.
+    quest_cells = rng.sample([grid.cell(column, row) for row in range(QUEST_SPAN) for column in range(QUEST_SPAN)],
+                             3)
+    vault = grid.cell(QUEST_SPAN, 0)
+    quest_event_id, quest_puzzle_id, victory_id = ids.next(), ids.next(), ids.next()
+    answer = rng.choice(ANSWER_WORDS) + str(rng.randrange(100))
+    padding = ''.join(f' {ANSWER_WORDS[i % len(ANSWER_WORDS)]}' for i in range(spec.description_words))
+
+    # The world's own entities.
+    locked = {cell: rng.choice(item_names) for cell in rng.sample(range(grid.open_start, spec.locations), spec.locked)}
+    locked[vault] = VAULT_KEY
+    items_at = {}
+    item_positions = []
+    for name in item_names:
+        cell = rng.randrange(grid.open_start, spec.locations)
+        items_at.setdefault(cell, []).append(name)
+        item_positions.append(cell + 1)
+    quest_items = [VAULT_KEY, RELICS[0], RELICS[1]]
+    rng.shuffle(quest_items)
+    quest = list(zip(quest_items + [RELICS[2]], quest_cells + [vault]))
+    for name, cell in quest:
+        items_at.setdefault(cell, []).append(name)
+    puzzle_ids = [ids.next() for _ in range(spec.puzzles)]
+    entrances = {}
+    for puzzle_id in puzzle_ids:
+        entrances.setdefault(rng.randrange(grid.open_start, spec.locations), []).append(puzzle_id)
+    event_ids = [ids.next() for _ in range(spec.events)]
+
+    def random_open_id() -> int:
+        """Return the ID of a random location below the quest's rows."""
+        return rng.randrange(grid.open_start, spec.locations) + 1
+
+    def locations() -> Iterable[dict[str, Any]]:
+        """Yield the JSON object of every location, one grid cell at a time."""
+        for cell in range(spec.locations):
+            commands = dict(grid.neighbours(cell))
+            location = {
+                'id': cell + 1,
+                'name': f'Room {cell + 1}',
+                'brief_description': f'Room {cell + 1}.',
+                'long_description': f'You are in room {cell + 1}, on row {cell // grid.width} of the grid.{padding}',
+                'available_commands': {command: neighbour + 1 for command, neighbour in commands.items()},
+                'items': items_at.get(cell, [])
+            }
+            for puzzle_id in entrances.get(cell, []):
+                location['available_commands'][f'enter puzzle {puzzle_id}'] = puzzle_id
+            if cell in locked:
+                location['locked_description'] = f'Room {cell + 1} is locked.'
+                location['unlocked_description'] = location['long_description']
+                location['is_locked'] = True
+                location['unlock_condition'] = f"'{locked[cell]}' in inventory"
+            yield location
+
+    def story_events() -> Iterable[dict[str, Any]]:
+        """Yield the JSON object of every story event."""
+        for event_id in event_ids:
+            # Each event grants the item its condition forbids, so that it is only triggered once.
+            first, second, granted = rng.sample(item_names, 3)
+            yield {
+                'id': event_id,
+                'name': f'Event {event_id}',
+                'available_commands': {'continue': random_open_id()},
+                'story_text': f'Event {event_id} happens.',
+                'choices': ['continue'],
+                'items': [granted],
+                'trigger_condition': f"'{first}' in inventory and '{second}' in inventory and "
+                                     f"'{granted}' not in inventory"
+            }
+        yield {
+            'id': quest_event_id,
+            'name': 'Relics Assembled',
+            'available_commands': {'continue': quest_puzzle_id},
+            'story_text': 'The relics hum together, and a door appears.',
+            'choices': ['continue'],
+            'items': [QUEST_TOKEN],
+            'new_objective': 'Open the door.',
+            'trigger_condition': ' and '.join(f"'{relic}' in inventory" for relic in RELICS)
+                                 + f" and '{QUEST_TOKEN}' not in inventory"
+        }
+        yield {
+            'id': victory_id,
+            'name': 'Victory',
+            'available_commands': {},
+            'story_text': 'The door swings open. You win!'
+        }
+
+    def puzzles() -> Iterable[dict[str, Any]]:
+        """Yield the JSON object of every puzzle."""
+        for puzzle_id in puzzle_ids:
+            yield {
+                'id': puzzle_id,
+                'name': f'Puzzle {puzzle_id}',
+                'available_commands': {'password': random_open_id(), 'leave': random_open_id()},
+                'puzzle_text': [f'Puzzle {puzzle_id}.', 'Enter password to proceed.'],
+                'answers': [rng.choice(ANSWER_WORDS) + str(rng.randrange(100))]
+            }
+        yield {
+            'id': quest_puzzle_id,
+            'name': 'The Door',
+            'available_commands': {'password': victory_id},
+            'puzzle_text': ['A door with a keypad.', f'The relics spell out "{answer}".'],
+            'answers': [answer]
+        }
+
+    def items() -> Iterable[dict[str, Any]]:
+        """Yield the JSON object of every item."""
+        for name, position in zip(item_names, item_positions):
+            yield {'name': name, 'description': f'This is {name}.', 'start_position': position,
+                   'current_position': position}
+        for name, cell in quest:
+            yield {'name': name, 'description': f'This is the {name}.', 'start_position': cell + 1,
+                   'current_position': cell + 1}
+        yield {'name': QUEST_TOKEN, 'description': 'Proof of your quest.', 'start_position': quest_event_id,
+               'current_position': quest_event_id}
+
+    # The sections are generated while they are written, so only the placements above are kept in memory.
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for i, (key, entries) in enumerate((('locations', locations()), ('story_events', story_events()),
+                                            ('puzzle', puzzles()), ('items', items()))):
+            f.write(f'{", " if i else ""}"{key}": ')
+            _write_list(f, entries)
+        f.write('}\n')
+
+    walkthrough = []
+    cell = 0
+    for name, target in quest:
+        walkthrough.extend(grid.path(cell, target))
+        walkthrough.append(f'pick up {name}')
+        cell = target
+    # Picking up the last relic triggers the quest's event, which leads to the door.
+    walkthrough.extend(['continue', 'password', answer])
+    return walkthrough
+
+
+class _IdAllocator:
+    """Hands out the location IDs after those of the grid's cells.
+
+    Instance Attributes:
+        - last:
+            The last ID handed out.
+    """
+    last: int
+
+    def __init__(self, num_cells: int) -> None:
+        """Initialize an allocator of the IDs after those of num_cells grid cells."""
+        self.last = num_cells
+
+    def next(self) -> int:
+        """Return a new ID."""
+        self.last += 1
+        return self.last
+
+
+def _write_list(f: TextIO, entries: Iterable[dict[str, Any]]) -> None:
+    """Write the given entries to f as a JSON list, encoding WRITE_BATCH of them at a time."""
+    f.write('[')
+    entries = iter(entries)
+    batch = list(itertools.islice(entries, WRITE_BATCH))
+    separator = ''
+    while batch:
+        f.write(separator + json.dumps(batch)[1:-1])
+        separator = ', '
+        batch = list(itertools.islice(entries, WRITE_BATCH))
+    f.write(']')
+
+
+def play_walkthrough(game_data_file: str, walkthrough: list[str],
+                     output: Optional[OutputSink] = None) -> tuple[AdventureGame, EventList]:
+    """Play the given walkthrough from START_ID as the adventure.py main loop would, answering each password prompt
+    with the command after "password", and return the game and its log.
+
+    Raise ValueError if a command is not accepted at the prompt or the game ends before the walkthrough does.
+    """
+    game = AdventureGame(game_data_file, START_ID, output if output is not None else NullSink())
+    game_log = EventList()
+    commands = iter(walkthrough)
+    game.read_input = lambda prompt: next(commands)
+    for command in commands:
+        if not game.ongoing:
+            raise ValueError(f'The game is over before {command!r}')
+        if not game.is_valid_command(command):
+            raise ValueError(f'{command!r} is not accepted at location {game.current_location_id}')
+        game.play_turn(command, game_log)
+    return game, game_log
+
+
+if __name__ == "__main__":
+    # When you are ready to check your work with python_ta, uncomment the following lines.
+    # (Delete the "#" and space before each line.)
+    # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999']
+    })
+    parser = argparse.ArgumentParser(description='Write a synthetic game data file and a walkthrough that wins it.')
+    parser.add_argument('output', help='game data file to write')
+    parser.add_argument('--locations', type=int, default=100, help='number of locations')
+    parser.add_argument('--events', type=int, help='number of triggered story events (default: one per location)')
+    parser.add_argument('--locked', type=int, help='number of locked locations (default: one per 20 locations)')
+    parser.add_argument('--puzzles', type=int, help='number of puzzles (default: one per 10 locations)')
+    parser.add_argument('--items', type=int, help='number of items (default: one per 2 locations)')
+    parser.add_argument('--description-words', type=int, default=0,
+                        help='number of extra words in each long description')
+    parser.add_argument('--seed', type=int, default=111, help='random seed')
+    parser.add_argument('--walkthrough', metavar='FILE', help='file to write the walkthrough to (default: stdout)')
+    parser.add_argument('--check', action='store_true', help='play the walkthrough to make sure it wins')
+    args = parser.parse_args()
+
+    world_spec = WorldSpec.scaled(args.locations, args.seed)
+    for field in ('events', 'locked', 'puzzles', 'items'):
+        if getattr(args, field) is not None:
+            setattr(world_spec, field, getattr(args, field))
+    world_spec.description_words = args.description_words
+    try:
+        world_walkthrough = generate_world(args.output, world_spec)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.walkthrough:
+        with open(args.walkthrough, 'w', encoding='utf-8') as walkthrough_file:
+            walkthrough_file.write('\n'.join(world_walkthrough) + '\n')
+    else:
+        print('\n'.join(world_walkthrough))
+    if args.check:
+        final_game, _ = play_walkthrough(args.output, world_walkthrough)
+        if final_game.ongoing or final_game.get_location().name != 'Victory':
+            print('The walkthrough does not win the game.', file=sys.stderr)
+            sys.exit(1)
+        print(f'The walkthrough wins with a score of {final_game.score} at {final_game.current_time // 60}:'
+              f'{final_game.current_time % 60:02}.', file=sys.stderr)